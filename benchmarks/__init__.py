@@ -0,0 +1,10 @@
+"""
+Performance benchmarks for daide2eng.
+
+Run every scenario and print the results as JSON with::
+
+    python -m benchmarks
+
+See ``python -m benchmarks --help`` for selecting scenarios and writing the
+results to a file so runs of different releases can be compared.
+"""
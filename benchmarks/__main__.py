@@ -0,0 +1,58 @@
+import argparse
+import json
+import sys
+
+import benchmarks.scenarios  # noqa: F401  (registers the scenarios)
+from benchmarks.harness import SCENARIOS, Options, run
+from daide2eng.utils import PARSERS
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run the daide2eng benchmarks."
+    )
+    arg_parser.add_argument(
+        "scenarios",
+        nargs="*",
+        metavar="scenario",
+        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})",
+    )
+    arg_parser.add_argument(
+        "-o", "--output", help="write the JSON results to this file instead of stdout"
+    )
+    arg_parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="timed repetitions per measurement"
+    )
+    arg_parser.add_argument(
+        "--parser",
+        action="append",
+        choices=PARSERS,
+        help="parser engine to benchmark, may be repeated (default: all)",
+    )
+    arg_parser.add_argument(
+        "--quick", action="store_true", help="use smaller parameter sweeps"
+    )
+    args = arg_parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        arg_parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    if args.repeat < 1:
+        arg_parser.error("--repeat must be at least 1")
+
+    options = Options(
+        repeat=args.repeat, parsers=args.parser or list(PARSERS), quick=args.quick
+    )
+    report = run(args.scenarios or None, options)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
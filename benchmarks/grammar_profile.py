@@ -0,0 +1,46 @@
+"""
+Rank the rules of the DAIDE grammar by cost over the repository corpora.
+
+    python -m benchmarks.grammar_profile --sort failures --limit 20
+"""
+
+import argparse
+import sys
+
+from benchmarks.harness import load_error_corpus, load_translation_corpus
+from daide2eng.grammar import create_daide_grammar
+from daide2eng.grammar.grammar_profile import SORT_KEYS
+from daide2eng.utils import GRAMMAR_LEVEL, pre_process
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.grammar_profile",
+        description="Profile grammar rules over translation.json and "
+        "daide2eng_moves_error.json.",
+    )
+    arg_parser.add_argument("--level", type=int, default=GRAMMAR_LEVEL)
+    arg_parser.add_argument("--sort", choices=SORT_KEYS, default="tottime")
+    arg_parser.add_argument("--limit", type=int, default=None)
+    arg_parser.add_argument(
+        "--valid-only",
+        action="store_true",
+        help="skip daide2eng_moves_error.json",
+    )
+    args = arg_parser.parse_args()
+
+    messages = load_translation_corpus()
+    if not args.valid_only:
+        messages += load_error_corpus()
+    with create_daide_grammar(level=args.level).profile() as profile:
+        for message in messages:
+            try:
+                profile.grammar.parse(pre_process(message))
+            except Exception:  # failing parses are part of the profile
+                pass
+    print(profile.report(args.sort, args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
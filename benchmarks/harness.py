@@ -0,0 +1,142 @@
+"""Scenario registry, timing helpers and corpus loaders shared by the benchmarks."""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSLATION_CORPUS = os.path.join(REPO_ROOT, "translation.json")
+ERROR_CORPUS = os.path.join(REPO_ROOT, "daide2eng_moves_error.json")
+
+
+@dataclass
+class Result:
+    """Timings of one scenario run with one set of parameters.
+
+    Args:
+        scenario (str): scenario name
+        params (Dict[str, Any]): parameters of this run, e.g. level or depth
+        items (int): number of items (messages, grammars, ...) handled per timing
+        times (List[float]): seconds taken by each repetition
+        extra (Dict[str, Any]): scenario-specific values worth recording
+    """
+
+    scenario: str
+    params: Dict[str, Any]
+    items: int
+    times: List[float]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> Dict[str, Any]:
+        best = min(self.times)
+        return {
+            "scenario": self.scenario,
+            "params": self.params,
+            "items": self.items,
+            "repeat": len(self.times),
+            "best_s": best,
+            "median_s": statistics.median(self.times),
+            "mean_s": statistics.mean(self.times),
+            "per_item_us": best / self.items * 1e6 if self.items else None,
+            "items_per_s": self.items / best if best > 0 else None,
+            **self.extra,
+        }
+
+
+@dataclass
+class Options:
+    """Settings shared by all scenarios.
+
+    Args:
+        repeat (int): number of timed repetitions per measurement
+        parsers (List[str]): parser engines to benchmark
+        quick (bool): use smaller parameter sweeps
+    """
+
+    repeat: int
+    parsers: List[str]
+    quick: bool = False
+
+
+Scenario = Callable[[Options], Iterator[Result]]
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str) -> Callable[[Scenario], Scenario]:
+    """Register a benchmark scenario under `name`."""
+
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+
+    return register
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> List[float]:
+    """Time `repeat` calls of `func` after one untimed warm-up call.
+
+    The garbage collector is disabled while timing, like `timeit` does.
+    """
+    func()
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return times
+
+
+def load_translation_corpus() -> List[str]:
+    with open(TRANSLATION_CORPUS) as corpus_file:
+        return [entry["daide"] for entry in json.load(corpus_file)]
+
+
+def load_error_corpus() -> List[str]:
+    with open(ERROR_CORPUS) as corpus_file:
+        return json.load(corpus_file)
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the interpreter and package versions the results were taken with."""
+    try:
+        from importlib.metadata import version
+    except ImportError:
+        from importlib_metadata import version
+
+    return {
+        "daide2eng": version("daide2eng"),
+        "parsimonious": version("parsimonious"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run(names: Optional[List[str]], options: Options) -> Dict[str, Any]:
+    """Run the selected scenarios (all if `names` is None) and collect their results."""
+    results = []
+    for name, func in SCENARIOS.items():
+        if names is not None and name not in names:
+            continue
+        for result in func(options):
+            results.append(result.to_json())
+            print(
+                f"{result.scenario} {result.params}: "
+                f"{min(result.times) * 1000:.3f} ms",
+                file=sys.stderr,
+            )
+    return {"environment": environment(), "results": results}
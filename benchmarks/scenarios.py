@@ -0,0 +1,277 @@
+"""
+Benchmark scenarios.
+
+Every scenario is a generator of `Result`s registered with `@scenario`. Apart
+from `import_time`, scenarios run in-process with the parse and render caches
+disabled so each timing covers a full translation.
+"""
+
+import gc
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+
+from benchmarks.harness import (
+    Options,
+    Result,
+    load_error_corpus,
+    load_translation_corpus,
+    scenario,
+    time_call,
+)
+from daide2eng import daide_parser, daide_visitor
+from daide2eng.grammar import create_daide_grammar, get_daide_grammar
+from daide2eng.grammar.grammar import LEVELS
+from daide2eng.grammar.grammar_cache import CACHE_DIR_ENV
+from daide2eng.keywords import disable_hash_consing, enable_hash_consing
+from daide2eng.utils import GRAMMAR_LEVEL, gen_English, parse_daide, pre_process
+
+GRAMMAR_LEVELS = [10 * i for i in range(len(LEVELS))]
+
+BASE_MESSAGE = "PRP (PCE (ENG TUR))"
+
+# wrappers for the nesting-depth scenario, each wraps one message in another
+WRAPPERS: Dict[str, Callable[[str], str]] = {
+    "IFF": lambda message: f"IFF (PCE (ENG TUR)) THN ({message})",
+    "FRM": lambda message: f"FRM (ENG) (TUR) ({message})",
+    "CCL": lambda message: f"CCL ({message})",
+}
+
+# distinct (unit location, destination) pairs for the AND-width scenario
+MOVES = [
+    ("LON", "WAL"), ("EDI", "YOR"), ("LVP", "CLY"), ("BRE", "PIC"),
+    ("PAR", "BUR"), ("MAR", "SPA"), ("MUN", "RUH"), ("BER", "KIE"),
+    ("WAR", "SIL"), ("MOS", "UKR"), ("VIE", "TYR"), ("BUD", "GAL"),
+    ("TRI", "ADR"), ("ROM", "TUS"), ("NAP", "APU"), ("VEN", "PIE"),
+    ("CON", "BUL"), ("ANK", "ARM"), ("SMY", "SYR"), ("SEV", "RUM"),
+    ("STP", "FIN"), ("KIE", "DEN"), ("HOL", "BEL"), ("BEL", "PIC"),
+    ("SPA", "POR"), ("POR", "MAO"), ("TUN", "NAF"), ("GRE", "ALB"),
+    ("SER", "BUL"), ("RUM", "UKR"), ("LVN", "PRU"), ("PRU", "SIL"),
+]
+
+
+def nested_message(wrapper: str, depth: int) -> str:
+    """Wrap `BASE_MESSAGE` in `depth` levels of `wrapper`."""
+    message = BASE_MESSAGE
+    for _ in range(depth):
+        message = WRAPPERS[wrapper](message)
+    return message
+
+
+def and_message(width: int) -> str:
+    """Propose an AND of `width` distinct XDO move orders."""
+    orders = " ".join(
+        f"(XDO ((ENG AMY {location}) MTO {destination}))"
+        for location, destination in MOVES[:width]
+    )
+    return f"PRP (AND {orders})"
+
+
+def _translate_all(messages, parser):
+    def translate():
+        for message in messages:
+            gen_English(message, parser=parser)
+
+    return translate
+
+
+@scenario("import_time")
+def import_time(options: Options) -> Iterator[Result]:
+    """Time importing the package in a fresh interpreter."""
+    for module in ("daide2eng", "daide2eng.utils"):
+        code = (
+            "import time; start = time.perf_counter(); "
+            f"import {module}; print(time.perf_counter() - start)"
+        )
+        times = []
+        for _ in range(options.repeat):
+            output = subprocess.run(
+                [sys.executable, "-c", code],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            times.append(float(output))
+        yield Result("import_time", {"module": module}, 1, times)
+
+
+@scenario("grammar_build")
+def grammar_build(options: Options) -> Iterator[Result]:
+    """Time compiling the grammar of each level, and loading it from the disk cache."""
+    levels = [0, 30, 80, 160] if options.quick else GRAMMAR_LEVELS
+    previous = os.environ.get(CACHE_DIR_ENV)
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for cache, directory in (("none", ""), ("disk", cache_dir)):
+                os.environ[CACHE_DIR_ENV] = directory
+                for level in levels:
+                    times = time_call(
+                        lambda: create_daide_grammar(level), options.repeat
+                    )
+                    yield Result(
+                        "grammar_build", {"level": level, "cache": cache}, 1, times
+                    )
+    finally:
+        if previous is None:
+            del os.environ[CACHE_DIR_ENV]
+        else:
+            os.environ[CACHE_DIR_ENV] = previous
+
+
+@scenario("throughput")
+def throughput(options: Options) -> Iterator[Result]:
+    """Time gen_English over the messages of translation.json that it translates."""
+    corpus = load_translation_corpus()
+    for parser in options.parsers:
+        messages = [
+            message
+            for message in corpus
+            if not gen_English(message, parser=parser).startswith("ERROR")
+        ]
+        times = time_call(_translate_all(messages, parser), options.repeat)
+        yield Result("throughput", {"parser": parser}, len(messages), times)
+
+
+@scenario("rejection")
+def rejection(options: Options) -> Iterator[Result]:
+    """Time gen_English over the messages of daide2eng_moves_error.json that it rejects."""
+    corpus = load_error_corpus()
+    for parser in options.parsers:
+        messages = [
+            message
+            for message in corpus
+            if gen_English(message, parser=parser).startswith("ERROR")
+        ]
+        times = time_call(_translate_all(messages, parser), options.repeat)
+        yield Result(
+            "rejection",
+            {"parser": parser},
+            len(messages),
+            times,
+            {"corpus_size": len(corpus)},
+        )
+
+
+@scenario("nesting_depth")
+def nesting_depth(options: Options) -> Iterator[Result]:
+    """Time one message wrapped in increasing depths of IFF, FRM or CCL."""
+    depths = [1, 4, 16] if options.quick else [1, 2, 4, 8, 16, 32]
+    for parser in options.parsers:
+        for wrapper in WRAPPERS:
+            for depth in depths:
+                message = nested_message(wrapper, depth)
+                times = time_call(_translate_all([message], parser), options.repeat)
+                yield Result(
+                    "nesting_depth",
+                    {"parser": parser, "wrapper": wrapper, "depth": depth},
+                    1,
+                    times,
+                )
+
+
+@scenario("and_width")
+def and_width(options: Options) -> Iterator[Result]:
+    """Time an AND of an increasing number of XDO orders."""
+    widths = [2, 8, 32] if options.quick else [2, 4, 8, 16, 32]
+    for parser in options.parsers:
+        for width in widths:
+            message = and_message(width)
+            times = time_call(_translate_all([message], parser), options.repeat)
+            yield Result(
+                "and_width",
+                {"parser": parser, "width": width},
+                1,
+                times,
+                {"median_per_order_us": statistics.median(times) / width * 1e6},
+            )
+
+
+@scenario("construction")
+def construction(options: Options) -> Iterator[Result]:
+    """Time building the keyword objects of translation.json.
+
+    For parsimonious this is the visit phase alone, on parse trees built
+    beforehand. The native parser builds objects while it parses, so its
+    timing is the whole parse.
+    """
+    corpus = [pre_process(message) for message in load_translation_corpus()]
+    grammar = get_daide_grammar(level=GRAMMAR_LEVEL)
+    trees = []
+    messages = []
+    for message in corpus:
+        try:
+            tree = grammar.parse(message)
+            daide_visitor.visit(tree)
+        except Exception:
+            continue
+        trees.append(tree)
+        messages.append(message)
+
+    def visit_all():
+        for tree in trees:
+            daide_visitor.visit(tree)
+
+    def parse_all():
+        for message in messages:
+            daide_parser.parse(message)
+
+    for parser in options.parsers:
+        run = visit_all if parser == "parsimonious" else parse_all
+        times = time_call(run, options.repeat)
+        yield Result("construction", {"parser": parser}, len(trees), times)
+
+
+def _parse_all(messages: List[str], parser: str) -> List[Any]:
+    return [parse_daide(message, parser=parser) for message in messages]
+
+
+@scenario("memory")
+def memory(options: Options) -> Iterator[Result]:
+    """Measure the memory held by parsed keyword trees of translation.json, and time parsing them.
+
+    The corpus is parsed `copies` times, like a history holding repeated
+    messages, with and without hash-consing of keyword objects.
+    """
+    copies = 1 if options.quick else 4
+    corpus = [pre_process(message) for message in load_translation_corpus()]
+    for parser in options.parsers:
+        messages = []
+        for message in corpus:
+            try:
+                parse_daide(message, parser=parser)
+            except Exception:
+                continue
+            messages.append(message)
+        messages *= copies
+
+        for hash_consing in (False, True):
+            if hash_consing:
+                enable_hash_consing()
+            try:
+                # shared locations and units are already allocated by the parses
+                # above, so what is measured is the memory the trees add
+                tracemalloc.start()
+                try:
+                    gc.collect()
+                    before = tracemalloc.get_traced_memory()[0]
+                    trees = _parse_all(messages, parser)
+                    gc.collect()
+                    held = tracemalloc.get_traced_memory()[0] - before
+                finally:
+                    tracemalloc.stop()
+                del trees
+
+                times = time_call(lambda: _parse_all(messages, parser), options.repeat)
+            finally:
+                disable_hash_consing()
+            yield Result(
+                "memory",
+                {"parser": parser, "hash_consing": hash_consing, "copies": copies},
+                len(messages),
+                times,
+                {"bytes": held, "bytes_per_message": held / len(messages)},
+            )
@@ -2,9 +2,11 @@ from daide2eng.grammar import (
     DAIDEGrammar,
     create_daide_grammar,
     create_grammar_from_press_keywords,
+    get_daide_grammar,
 )
 from daide2eng.keywords import *
 from daide2eng.visitor import DAIDEVisitor, daide_visitor
+from daide2eng.parser import DAIDEParseError, DAIDEParser, daide_parser
 
 try:
     from importlib.metadata import version
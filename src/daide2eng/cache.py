@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, NamedTuple, TypeVar
+
+__all__ = ["CacheInfo", "LRUCache"]
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe, size-bounded least-recently-used cache with counters.
+
+    Args:
+        maxsize (int): maximum number of entries kept. Adding an entry to a
+            full cache evicts the least recently used one.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("An LRUCache must hold at least 1 entry.")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for `key` and mark it as recently used, or `default`."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Store `value` under `key`, evicting the oldest entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit, miss and eviction counts and the current size."""
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._evictions, len(self._data), self.maxsize
+            )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
@@ -0,0 +1,259 @@
+"""
+`daide2eng` command-line translator.
+
+Reads DAIDE records from a file or stdin and streams English translations to
+stdout, one output line per non-empty input line. A record is either a plain
+DAIDE line or a JSON object with a `daide` field and optional `sender` and
+`recipient` fields; JSON records are written back as JSON with an added
+`english` field.
+
+Input is read and translated in fixed-size chunks with a bounded number of
+chunks in flight, so memory use does not depend on the size of the input.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import IO, Deque, Iterator, List, Optional, Sequence, Set, Tuple
+
+from daide2eng.utils import PARSERS, chunked, gen_English_record, load_grammar
+from daide2eng.validator import daide_validator
+
+__all__ = ["main"]
+
+# (daide, sender, recipient) record, or None if the input line could not be read
+_Record = Optional[Tuple[str, str, str]]
+# (record, JSON object to echo back or None for plain lines, read error)
+_Item = Tuple[_Record, Optional[dict], Optional[str]]
+_ChunkResult = Tuple[List[str], List[float]]
+
+
+def _translate_chunk(
+    records: Sequence[_Record],
+    make_natural: bool,
+    parser: str,
+    max_depth: Optional[int],
+) -> _ChunkResult:
+    results = []
+    latencies = []
+    for record in records:
+        if record is None:
+            results.append("")
+            latencies.append(0.0)
+            continue
+        start = time.perf_counter()
+        results.append(gen_English_record(record, make_natural, parser, max_depth))
+        latencies.append(time.perf_counter() - start)
+    return results, latencies
+
+
+def _read_items(
+    lines: IO[str], input_format: str, sender: str, recipient: str
+) -> Iterator[_Item]:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if input_format == "jsonl" or (
+            input_format == "auto" and line.startswith("{")
+        ):
+            try:
+                obj = json.loads(line)
+                record = (
+                    obj["daide"],
+                    obj.get("sender", sender),
+                    obj.get("recipient", recipient),
+                )
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                yield None, {"input": line}, f"ERROR invalid record: {e!r}"
+                continue
+            yield record, obj, None
+        else:
+            yield (line, sender, recipient), None, None
+
+
+class _Summary:
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.records = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def add(self, results: List[str], latencies: List[float]) -> None:
+        self.records += len(results)
+        self.errors += sum(result.startswith("ERROR") for result in results)
+        self.total_latency += sum(latencies)
+        self.max_latency = max([self.max_latency, *latencies])
+
+    def format(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        rate = self.records / elapsed if elapsed > 0 else 0.0
+        mean = self.total_latency / self.records if self.records else 0.0
+        return (
+            f"daide2eng: {self.records} records ({self.errors} errors) in "
+            f"{elapsed:.3f} s, {rate:.1f} records/s, latency mean "
+            f"{mean * 1000:.3f} ms, max {self.max_latency * 1000:.3f} ms"
+        )
+
+
+def _write(out: IO[str], items: Sequence[_Item], results: List[str]) -> None:
+    for (_, obj, _), english in zip(items, results):
+        if obj is None:
+            out.write(english + "\n")
+        else:
+            out.write(json.dumps({**obj, "english": english}) + "\n")
+    out.flush()
+
+
+def _run(
+    items: Iterator[_Item],
+    out: IO[str],
+    summary: _Summary,
+    jobs: int,
+    chunksize: int,
+    ordered: bool,
+    make_natural: bool,
+    parser: str,
+) -> None:
+    def _emit(chunk: List[_Item], result: _ChunkResult) -> None:
+        results, latencies = result
+        results = [
+            english if error is None else error
+            for (_, _, error), english in zip(chunk, results)
+        ]
+        summary.add(results, latencies)
+        _write(out, chunk, results)
+
+    # passed with every chunk, since workers don't share this process's settings
+    max_depth = daide_validator.max_depth
+    chunks = chunked(items, chunksize)
+    if jobs <= 1:
+        for chunk in chunks:
+            records = [r for r, _, _ in chunk]
+            _emit(chunk, _translate_chunk(records, make_natural, parser, max_depth))
+        return
+
+    # bounds memory: at most this many chunks are read ahead of the output
+    max_in_flight = 2 * jobs
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=load_grammar, initargs=(parser,)
+    ) as executor:
+        queue: Deque[Tuple["Future[_ChunkResult]", List[_Item]]] = deque()
+        running: Set["Future[_ChunkResult]"] = set()
+        submitted = {}
+        for chunk in chunks:
+            future = executor.submit(
+                _translate_chunk,
+                [r for r, _, _ in chunk],
+                make_natural,
+                parser,
+                max_depth,
+            )
+            if ordered:
+                queue.append((future, chunk))
+                if len(queue) >= max_in_flight:
+                    done_future, done_chunk = queue.popleft()
+                    _emit(done_chunk, done_future.result())
+            else:
+                running.add(future)
+                submitted[future] = chunk
+                if len(running) >= max_in_flight:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for done_future in done:
+                        _emit(submitted.pop(done_future), done_future.result())
+        while queue:
+            done_future, done_chunk = queue.popleft()
+            _emit(done_chunk, done_future.result())
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for done_future in done:
+                _emit(submitted.pop(done_future), done_future.result())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the `daide2eng` command.
+
+    Args:
+        argv (Optional[Sequence[str]]): command-line arguments, defaults to `sys.argv[1:]`
+
+    Returns:
+        int: exit status
+    """
+    arg_parser = argparse.ArgumentParser(
+        prog="daide2eng", description="Translate DAIDE messages to English."
+    )
+    arg_parser.add_argument(
+        "input", nargs="?", default="-", help="input file, '-' for stdin (default)"
+    )
+    arg_parser.add_argument(
+        "--format",
+        choices=("auto", "lines", "jsonl"),
+        default="auto",
+        help="input format; 'auto' treats lines starting with '{' as JSON",
+    )
+    arg_parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes")
+    arg_parser.add_argument(
+        "--chunksize", type=int, default=64, help="records sent to a worker at a time"
+    )
+    arg_parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="write results as soon as they are ready instead of in input order",
+    )
+    arg_parser.add_argument("--sender", default="I", help="default sender")
+    arg_parser.add_argument("--recipient", default="You", help="default recipient")
+    arg_parser.add_argument(
+        "--parser", choices=PARSERS, default="parsimonious", help="parser engine"
+    )
+    arg_parser.add_argument(
+        "--no-natural",
+        dest="make_natural",
+        action="store_false",
+        help="do not rewrite the sentence into more natural English",
+    )
+    arg_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not print the summary to stderr"
+    )
+    args = arg_parser.parse_args(argv)
+    if args.jobs < 1:
+        arg_parser.error("--jobs must be at least 1")
+    if args.chunksize < 1:
+        arg_parser.error("--chunksize must be at least 1")
+
+    summary = _Summary()
+    lines = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        items = _read_items(lines, args.format, args.sender, args.recipient)
+        _run(
+            items,
+            sys.stdout,
+            summary,
+            args.jobs,
+            args.chunksize,
+            not args.unordered,
+            args.make_natural,
+            args.parser,
+        )
+    except BrokenPipeError:
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+        if not args.quiet:
+            print(summary.format(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
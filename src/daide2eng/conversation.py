@@ -0,0 +1,177 @@
+"""
+Conversation-scoped parsing that reuses quoted messages.
+
+Replies quote earlier messages verbatim: after `PRP (AND (XDO ...) (DMZ ...))`
+comes `YES (PRP (AND (XDO ...) (DMZ ...)))`, and `FRM (ENG) (TUR) (...)`
+forwards a whole message. A `ParseContext` remembers the trees of the messages
+it parsed recently, keyed by their text. Messages wrapped in `YES`, `REJ`,
+`BWX`, `HUH`, `CCL` or `FRM` are taken apart at the wrapper, and a quoted
+message seen before is reused instead of parsed again, so replying costs
+little more than checking the wrapper tokens::
+
+    context = ParseContext()
+    proposal = context.parse("PRP (PCE (ENG TUR))")
+    reply = context.parse("YES (PRP (PCE (ENG TUR)))")
+    assert reply.press_message is proposal
+
+Quoted messages that were not seen before are parsed on their own and
+remembered too. Results are the same as `utils.parse_daide`'s, including the
+errors raised for invalid strings: whenever taking a message apart fails, the
+whole string is parsed as usual.
+"""
+
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from daide2eng.cache import CacheInfo, LRUCache
+from daide2eng.grammar.grammar_utils import _create_daide_grammar_dict
+from daide2eng.keywords.press_keywords import BWX, CCL, FRM, HUH, REJ, YES
+from daide2eng.utils import GRAMMAR_LEVEL, _normalize_whitespace, parse_daide
+from daide2eng.validator import _OWN_LIMIT, DAIDENestingError, daide_validator
+
+__all__ = ["ParseContext"]
+
+_TOKEN_RE = re.compile(r"[()]|[^\s()]+")
+_FIRST_LITERAL_RE = re.compile(r'"([^"]+)"')
+
+_grammar_dict = _create_daide_grammar_dict(GRAMMAR_LEVEL)
+_POWERS = frozenset(_FIRST_LITERAL_RE.findall(_grammar_dict["power"]))
+# keywords a press message (as opposed to a reply) can start with
+_PRESS_KEYWORDS = frozenset(
+    _FIRST_LITERAL_RE.search(_grammar_dict[rule]).group(1)
+    for rule in re.findall(r"\w+", _grammar_dict["press_message"])
+)
+# wrappers of a single press message
+_WRAPPERS: Dict[str, Callable[[Any], Any]] = {
+    "YES": YES._trusted,
+    "REJ": REJ._trusted,
+    "BWX": BWX._trusted,
+    "HUH": HUH._trusted,
+    "CCL": CCL._trusted,
+}
+
+
+class ParseContext:
+    """Parse the messages of one conversation, reusing the trees of quoted messages.
+
+    Args:
+        maxsize (int): number of recently parsed messages, including quoted
+            ones, to remember
+        parser (Optional[str]): parser engine, one of `utils.PARSERS`. Defaults
+            to the engine chosen with `utils.set_default_parser`.
+    """
+
+    def __init__(self, maxsize: int = 256, parser: Optional[str] = None) -> None:
+        self.parser = parser
+        self._trees: LRUCache = LRUCache(maxsize)
+
+    def parse(self, daide: str, max_depth: Optional[int] = _OWN_LIMIT) -> Any:
+        """Parse a pre-processed DAIDE message.
+
+        Args:
+            daide (str): DAIDE string, e.g. 'YES (PRP (PCE (ENG TUR)))'
+            max_depth (Optional[int]): nesting limit for this message. Defaults
+                to the limit set with `utils.set_max_depth`.
+
+        Returns:
+            Any: the keyword tree, as `utils.parse_daide` returns it
+        """
+        # quoted messages nest less deeply than the whole, so check the whole
+        # and parse its parts without a limit
+        try:
+            daide_validator.check_depth(daide, max_depth)
+        except DAIDENestingError:
+            # raise what parse_daide raises for it
+            return parse_daide(daide, self.parser, max_depth)
+        return self._parse(daide)
+
+    def clear(self) -> None:
+        """Forget all remembered messages."""
+        self._trees.clear()
+
+    def info(self) -> CacheInfo:
+        """Return hits, misses, evictions and size of the remembered messages."""
+        return self._trees.info()
+
+    def _parse(self, daide: str) -> Any:
+        key = _normalize_whitespace(daide)
+        tree = self._trees.get(key)
+        if tree is None:
+            try:
+                tree = self._parse_quoted(daide)
+            except Exception:
+                # invalid quoted message or arguments; parsing the whole
+                # string raises the error parse_daide raises for it
+                tree = None
+            if tree is None:
+                tree = parse_daide(daide, self.parser, max_depth=None)
+            self._trees.put(key, tree)
+        return tree
+
+    def _parse_quoted(self, daide: str) -> Any:
+        """Parse a wrapper around quoted messages from its parts, or return None."""
+        matches = list(_TOKEN_RE.finditer(daide))
+        if len(matches) < 4 or matches[0].start() != 0:
+            return None
+        tokens = [match.group() for match in matches]
+        closing = _closing_parens(tokens)
+        if closing is None:
+            return None
+
+        def quoted(open_index: int, press_only: bool) -> Any:
+            close_index = closing[open_index]
+            if close_index == open_index + 1:
+                return None
+            if press_only and tokens[open_index + 1] not in _PRESS_KEYWORDS:
+                return None
+            start = matches[open_index].end()
+            end = matches[close_index].start()
+            return self._parse(daide[start:end].strip())
+
+        keyword = tokens[0]
+        wrapper = _WRAPPERS.get(keyword)
+        if wrapper is not None:
+            # KEYWORD ( press_message )
+            if tokens[1] != "(" or closing[1] != len(tokens) - 1:
+                return None
+            message = quoted(1, press_only=True)
+            return None if message is None else wrapper(message)
+
+        if keyword == "FRM":
+            # FRM ( power ) ( power (ws power)* ) ( message )
+            if len(tokens) < 10 or tokens[1] != "(" or tokens[3] != ")":
+                return None
+            if tokens[2] not in _POWERS or tokens[4] != "(":
+                return None
+            recv_end = closing[4]
+            recv_powers = tokens[5:recv_end]
+            if not recv_powers or not _POWERS.issuperset(recv_powers):
+                return None
+            message_start = recv_end + 1
+            if (
+                message_start >= len(tokens)
+                or tokens[message_start] != "("
+                or closing[message_start] != len(tokens) - 1
+            ):
+                return None
+            message = quoted(message_start, press_only=False)
+            if message is None:
+                return None
+            recv_powers = [sys.intern(power) for power in recv_powers]
+            return FRM._from_parsed(sys.intern(tokens[2]), recv_powers, message)
+        return None
+
+
+def _closing_parens(tokens: List[str]) -> Optional[Dict[int, int]]:
+    """Map the index of each '(' in `tokens` to the index of its ')'."""
+    closing: Dict[int, int] = {}
+    stack: List[int] = []
+    for index, token in enumerate(tokens):
+        if token == "(":
+            stack.append(index)
+        elif token == ")":
+            if not stack:
+                return None
+            closing[stack.pop()] = index
+    return None if stack else closing
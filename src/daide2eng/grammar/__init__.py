@@ -2,4 +2,7 @@ from daide2eng.grammar.grammar_utils import (
     DAIDEGrammar,
     create_daide_grammar,
     create_grammar_from_press_keywords,
+    get_daide_grammar,
 )
+from daide2eng.grammar.grammar_cache import clear_grammar_cache, grammar_cache_dir
+from daide2eng.grammar.grammar_profile import GrammarProfile, RuleStats
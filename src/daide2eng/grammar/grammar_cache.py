@@ -0,0 +1,167 @@
+"""
+On-disk cache of compiled DAIDE grammars.
+
+Compiling a PEG with parsimonious is by far the slowest part of building a
+DAIDEGrammar, while unpickling the resulting expression graph takes well under
+a millisecond. Compiled grammars are therefore stored in a per-user cache
+directory under a hash of the grammar text, the package version and the
+parsimonious version. Any change to the level dicts in `grammar.py` changes the
+generated grammar text, and the key also covers the source of `grammar_utils`,
+which defines the expression classes the pickles refer to, so stale entries are
+never picked up.
+
+Unpickling runs code, so cached grammars are only loaded from, and written to,
+a directory owned by the current user that nobody else can write to. Entries
+are checked the same way.
+
+The cache directory defaults to `$XDG_CACHE_HOME/daide2eng` (or
+`~/.cache/daide2eng`). It can be moved with the `DAIDE2ENG_CACHE_DIR`
+environment variable, and setting that variable to an empty string disables
+the cache entirely.
+"""
+
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+from functools import lru_cache
+from typing import Callable, Optional, TypeVar
+
+import parsimonious
+
+try:
+    from importlib.metadata import PackageNotFoundError, version
+except ImportError:
+    from importlib_metadata import PackageNotFoundError, version
+
+__all__ = ["cached_grammar", "clear_grammar_cache", "grammar_cache_dir"]
+
+CACHE_DIR_ENV = "DAIDE2ENG_CACHE_DIR"
+
+_CACHE_FORMAT = 3
+
+T = TypeVar("T")
+
+
+def grammar_cache_dir() -> Optional[str]:
+    """Return the directory compiled grammars are cached in.
+
+    Returns:
+        Optional[str]: path of the cache directory, or None if the cache is disabled
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is not None:
+        return cache_dir or None
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "daide2eng")
+
+
+def _package_version() -> str:
+    try:
+        return version("daide2eng")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@lru_cache(maxsize=None)
+def _grammar_utils_digest() -> str:
+    """Hash the source of the module that defines the pickled expression classes."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grammar_utils.py")
+    try:
+        with open(path, "rb") as source:
+            return hashlib.sha256(source.read()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _is_private(path: str) -> bool:
+    """Whether `path` is owned by the current user and not writable by anyone else."""
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:
+        # no POSIX ownership to check, e.g. on Windows
+        return True
+    try:
+        status = os.stat(path)
+    except OSError:
+        return False
+    return status.st_uid == getuid() and not status.st_mode & (
+        stat.S_IWGRP | stat.S_IWOTH
+    )
+
+
+def _cache_path(cache_dir: str, grammar_str: str) -> str:
+    key = "\n".join(
+        [
+            str(_CACHE_FORMAT),
+            _grammar_utils_digest(),
+            _package_version(),
+            getattr(parsimonious, "__version__", ""),
+            str(pickle.HIGHEST_PROTOCOL),
+            grammar_str,
+        ]
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"grammar-{digest}.pickle")
+
+
+def cached_grammar(grammar_str: str, build: Callable[[str], T]) -> T:
+    """Load a compiled grammar from the cache, building and storing it on a miss.
+
+    Unreadable or corrupt cache entries are treated as misses, and failing to
+    write the cache never fails the build. A cache directory or entry that is
+    not owned by the current user, or that others can write to, is neither
+    read nor written.
+
+    Args:
+        grammar_str (str): PEG grammar text
+        build (Callable[[str], T]): compiles `grammar_str` into a grammar object
+
+    Returns:
+        T: the compiled grammar
+    """
+    cache_dir = grammar_cache_dir()
+    if cache_dir is None:
+        return build(grammar_str)
+
+    path = _cache_path(cache_dir, grammar_str)
+    if _is_private(cache_dir) and _is_private(path):
+        try:
+            with open(path, "rb") as cache_file:
+                return pickle.load(cache_file)
+        except Exception:  # missing, corrupt or incompatible entry, rebuild it
+            pass
+
+    grammar = build(grammar_str)
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        if not _is_private(cache_dir):
+            return grammar
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                pickle.dump(grammar, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, pickle.PicklingError):
+        pass
+    return grammar
+
+
+def clear_grammar_cache() -> None:
+    """Remove every cached grammar from the cache directory."""
+    cache_dir = grammar_cache_dir()
+    if cache_dir is None or not os.path.isdir(cache_dir):
+        return
+
+    for name in os.listdir(cache_dir):
+        if name.startswith("grammar-") and name.endswith(".pickle"):
+            try:
+                os.unlink(os.path.join(cache_dir, name))
+            except OSError:
+                pass
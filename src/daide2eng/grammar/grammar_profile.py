@@ -0,0 +1,220 @@
+"""
+Per-rule match profiling of DAIDE grammars.
+
+While a `GrammarProfile` is running, every named rule of its grammar counts how
+often it is tried at some position, how often that succeeds, how often the
+packrat cache answered instead of a real match, and how much time was spent in
+it. A profile works on its own copy of the grammar, `GrammarProfile.grammar`,
+so other users of the original grammar, like `gen_English` in other threads,
+are neither profiled nor slowed down. The class of each rule expression of the
+copy is temporarily swapped for a profiling subclass, so the copy, its parse
+trees and its packrat cache behave exactly as without profiling, only slower::
+
+    with get_daide_grammar(160).profile() as profile:
+        for message in corpus:
+            profile.grammar.parse(message)
+    print(profile.report())
+
+A profile is meant for offline tuning and is not thread-safe: parse with its
+grammar from one thread while it is running.
+"""
+
+import copy
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from parsimonious.expressions import Compound, Expression
+from parsimonious.grammar import Grammar
+
+__all__ = ["GrammarProfile", "RuleStats"]
+
+SORT_KEYS = ("tottime", "cumtime", "attempts", "failures", "cache_hits")
+
+# id of a profiled expression -> (profile, stats of its rule)
+_probes: Dict[int, Tuple["GrammarProfile", "RuleStats"]] = {}
+_profiled_classes: Dict[type, type] = {}
+
+
+@dataclass
+class RuleStats:
+    """Match statistics of one grammar rule.
+
+    Args:
+        name (str): rule name
+        attempts (int): times the rule was tried at some position, including
+            attempts answered by the packrat cache
+        successes (int): attempts that matched
+        cache_hits (int): attempts answered by the packrat cache
+        tottime (float): seconds spent in the rule itself, excluding other named rules
+        cumtime (float): seconds spent in the rule including the rules it tried
+    """
+
+    name: str
+    attempts: int = 0
+    successes: int = 0
+    cache_hits: int = 0
+    tottime: float = 0.0
+    cumtime: float = 0.0
+
+    @property
+    def failures(self) -> int:
+        """Attempts that did not match, i.e. where the parser backtracked."""
+        return self.attempts - self.successes
+
+
+def _profiled_class(cls: type) -> type:
+    """Subclass of `cls` whose match_core reports to the expression's profile.
+
+    The subclass adds no slots, so existing instances of `cls` can be switched
+    to it and back by assigning `__class__`.
+    """
+    profiled = _profiled_classes.get(cls)
+    if profiled is None:
+        match_core = cls.match_core
+
+        def profiled_match_core(self, text, pos, cache, error):
+            profile, stats = _probes[id(self)]
+            return profile._match(
+                match_core, self, stats, text, pos, cache, error
+            )
+
+        profiled = type(
+            f"Profiled{cls.__name__}",
+            (cls,),
+            {"__slots__": (), "match_core": profiled_match_core},
+        )
+        _profiled_classes[cls] = profiled
+    return profiled
+
+
+def _named_rules(grammar: Grammar) -> List[Expression]:
+    rules: Dict[int, Expression] = {}
+    seen = set()
+    stack = list(grammar.values())
+    while stack:
+        expr = stack.pop()
+        if id(expr) in seen:
+            continue
+        seen.add(id(expr))
+        if expr.name:
+            rules[id(expr)] = expr
+        if isinstance(expr, Compound):
+            stack.extend(expr.members)
+    return list(rules.values())
+
+
+class GrammarProfile:
+    """Counts attempts, successes and time per named rule of a grammar.
+
+    Args:
+        grammar (Grammar): grammar to profile. The profile copies it; parse
+            with the copy in `self.grammar` while the profile runs. Use the
+            profile as a context manager, or call `start` and `stop`;
+            statistics add up over several runs until `reset` is called.
+    """
+
+    def __init__(self, grammar: Grammar) -> None:
+        # a private copy, so shared grammars are never swapped to profiling classes
+        self.grammar: Grammar = copy.deepcopy(grammar)
+        self._rules = _named_rules(self.grammar)
+        self.stats: Dict[str, RuleStats] = {}
+        self.running = False
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all statistics."""
+        self.stats = {expr.name: RuleStats(expr.name) for expr in self._rules}
+        # time spent in named rules tried by each rule currently matching
+        self._child_time: List[float] = []
+        self._depth: Dict[str, int] = {}
+
+    def start(self) -> None:
+        """Start profiling `self.grammar`."""
+        if self.running:
+            return
+        for expr in self._rules:
+            if id(expr) in _probes:
+                raise RuntimeError(f"rule {expr.name!r} is already being profiled")
+        for expr in self._rules:
+            _probes[id(expr)] = (self, self.stats[expr.name])
+            expr.__class__ = _profiled_class(type(expr))
+        self.running = True
+
+    def stop(self) -> None:
+        """Stop profiling and restore `self.grammar`."""
+        if not self.running:
+            return
+        for expr in self._rules:
+            expr.__class__ = type(expr).__mro__[1]
+            del _probes[id(expr)]
+        self.running = False
+
+    def __enter__(self) -> "GrammarProfile":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _match(self, match_core, expr, stats, text, pos, cache, error):
+        stats.attempts += 1
+        if (id(expr), pos) in cache:
+            stats.cache_hits += 1
+        name = stats.name
+        depth = self._depth.get(name, 0)
+        self._depth[name] = depth + 1
+        self._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            node = match_core(expr, text, pos, cache, error)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.tottime += elapsed - self._child_time.pop()
+            if self._child_time:
+                self._child_time[-1] += elapsed
+            self._depth[name] = depth
+            if depth == 0:  # don't count recursive attempts twice
+                stats.cumtime += elapsed
+        if node is not None:
+            stats.successes += 1
+        return node
+
+    def ranked(self, sort: str = "tottime") -> List[RuleStats]:
+        """Return the statistics of the rules that were tried, most costly first.
+
+        Args:
+            sort (str): one of "tottime", "cumtime", "attempts", "failures" or "cache_hits"
+
+        Returns:
+            List[RuleStats]: statistics sorted by `sort`, descending
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"unknown sort key {sort!r}, expected one of {SORT_KEYS}")
+        tried = [stats for stats in self.stats.values() if stats.attempts]
+        return sorted(tried, key=lambda stats: getattr(stats, sort), reverse=True)
+
+    def report(self, sort: str = "tottime", limit: Optional[int] = None) -> str:
+        """Format the ranked statistics as a table.
+
+        Args:
+            sort (str): sort key, see `ranked`
+            limit (Optional[int]): only show this many rules
+
+        Returns:
+            str: the table
+        """
+        rows = self.ranked(sort)[:limit]
+        width = max([len("rule")] + [len(stats.name) for stats in rows])
+        lines = [
+            f"{'rule':<{width}} {'attempts':>9} {'success':>9} {'fail':>9} "
+            f"{'fail%':>6} {'cached':>9} {'tottime ms':>11} {'cumtime ms':>11}"
+        ]
+        for stats in rows:
+            lines.append(
+                f"{stats.name:<{width}} {stats.attempts:>9} {stats.successes:>9} "
+                f"{stats.failures:>9} {100 * stats.failures / stats.attempts:>6.1f} "
+                f"{stats.cache_hits:>9} {stats.tottime * 1000:>11.3f} "
+                f"{stats.cumtime * 1000:>11.3f}"
+            )
+        return "\n".join(lines)
@@ -1,8 +1,18 @@
+import threading
 import warnings
 from collections import OrderedDict, defaultdict
-from typing import Dict, List, Optional, Set, Tuple, Union
-
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+from parsimonious.expressions import (
+    Compound,
+    Expression,
+    OneOf,
+    OneOrMore,
+    Sequence,
+)
+from parsimonious.expressions import Literal as LiteralExpression
 from parsimonious.grammar import Grammar
+from parsimonious.nodes import Node
 from typing_extensions import Literal
 
 from daide2eng.constants import PressKeywords
@@ -13,15 +23,184 @@ from daide2eng.grammar.grammar import (
     DAIDELevel,
     GrammarDict,
 )
+from daide2eng.grammar.grammar_cache import cached_grammar
+from daide2eng.grammar.grammar_profile import GrammarProfile
+
+__all__ = [
+    "DAIDEGrammar",
+    "create_daide_grammar",
+    "create_grammar_from_press_keywords",
+    "get_daide_grammar",
+]
+
+GrammarKey = Tuple[Union[DAIDELevel, Tuple[DAIDELevel, ...]], str]
+
+_grammar_registry: Dict[GrammarKey, "DAIDEGrammar"] = {}
+_grammar_registry_lock = threading.Lock()
+
 
-__all__ = ["DAIDEGrammar", "create_daide_grammar", "create_grammar_from_press_keywords"]
+def _is_prefix_free(literals: Iterable[str]) -> bool:
+    """Whether no literal is a prefix of another, so at most one can match."""
+    ordered = sorted(set(literals))
+    return all(not b.startswith(a) for a, b in zip(ordered, ordered[1:]))
+
+
+class LiteralOneOf(OneOf):
+    """An ordered choice of literals matched with one lookup per literal length.
+
+    Token classes like `power`, `prov_land_sea` or `try_tokens` list dozens of
+    literals, which a plain OneOf tries one at a time. Since none of them is a
+    prefix of another, at most one can match, so the text at `pos` is sliced
+    once per distinct literal length and looked up in a dict instead. The
+    resulting parse tree is the same as for a plain OneOf.
+    """
+
+    def __init__(self, members: Tuple[LiteralExpression, ...], name: str = "") -> None:
+        super().__init__(*members, name=name)
+        self.literals: Dict[str, LiteralExpression] = {}
+        for member in members:
+            self.literals.setdefault(member.literal, member)
+        self.key_lengths = tuple(sorted({len(literal) for literal in self.literals}))
+
+    def _uncached_match(self, text, pos, cache, error):
+        for length in self.key_lengths:
+            member = self.literals.get(text[pos : pos + length])
+            if member is not None:
+                end = pos + length
+                return Node(self, text, pos, end, children=[Node(member, text, pos, end)])
+
+
+class KeywordOneOf(OneOf):
+    """An ordered choice that only tries alternatives able to start at `pos`.
+
+    Every alternative of rules like `press_message` or `arrangement` starts with
+    its own DAIDE keyword. Instead of trying them one by one, the alternatives
+    are indexed by their possible leading literals, so a match looks up the
+    keyword at `pos` and only tries those alternatives (plus any whose leading
+    token is unknown), in their original order. The resulting parse tree is the
+    same as for a plain OneOf.
+    """
+
+    def __init__(
+        self,
+        members: Tuple[Expression, ...],
+        first_literals: List[Optional[FrozenSet[str]]],
+        name: str = "",
+    ) -> None:
+        super().__init__(*members, name=name)
+        self.fallback = tuple(
+            member for member, first in zip(members, first_literals) if first is None
+        )
+        keys = set().union(*(first for first in first_literals if first is not None))
+        self.key_lengths = tuple(sorted({len(key) for key in keys}))
+        self.dispatch = {
+            key: tuple(
+                member
+                for member, first in zip(members, first_literals)
+                if first is None or key in first
+            )
+            for key in keys
+        }
+
+    def _uncached_match(self, text, pos, cache, error):
+        candidates = self.fallback
+        for length in self.key_lengths:
+            keyed = self.dispatch.get(text[pos : pos + length])
+            if keyed is not None:
+                candidates = keyed
+                break
+        for m in candidates:
+            node = m.match_core(text, pos, cache, error)
+            if node is not None:
+                return Node(self, text, pos, node.end, children=[node])
+
+
+def _first_literals(
+    expr: Expression, memo: Dict[int, Optional[FrozenSet[str]]]
+) -> Optional[FrozenSet[str]]:
+    """Literals that any match of `expr` must start with, or None if unknown."""
+    if id(expr) in memo:
+        return memo[id(expr)]
+    memo[id(expr)] = None  # guards against recursive rules
+
+    first: Optional[FrozenSet[str]] = None
+    if isinstance(expr, LiteralExpression):
+        first = frozenset([expr.literal]) if expr.literal else None
+    elif isinstance(expr, (Sequence, OneOrMore)):
+        first = _first_literals(expr.members[0], memo)
+    elif isinstance(expr, OneOf):
+        member_firsts = [_first_literals(member, memo) for member in expr.members]
+        if all(member_first is not None for member_first in member_firsts):
+            first = frozenset().union(*member_firsts)
+    memo[id(expr)] = first
+    return first
+
+
+def _index_choices(grammar: Grammar) -> None:
+    """Replace ordered choices in `grammar` with indexed equivalents.
+
+    Choices between plain literals become LiteralOneOf, and choices whose
+    alternatives start with known literals become KeywordOneOf. Choices where
+    one leading literal is a prefix of another are left alone, since their
+    order then matters.
+    """
+    exprs: Dict[int, Expression] = {}
+    stack = list(grammar.values())
+    while stack:
+        expr = stack.pop()
+        if id(expr) not in exprs:
+            exprs[id(expr)] = expr
+            if isinstance(expr, Compound):
+                stack.extend(expr.members)
+
+    memo: Dict[int, Optional[FrozenSet[str]]] = {}
+    replacements: Dict[int, Expression] = {}
+    for expr in exprs.values():
+        if type(expr) is not OneOf:
+            continue
+        if all(isinstance(member, LiteralExpression) for member in expr.members):
+            if _is_prefix_free(member.literal for member in expr.members):
+                replacements[id(expr)] = LiteralOneOf(expr.members, name=expr.name)
+            continue
+
+        first_literals = [_first_literals(member, memo) for member in expr.members]
+        keys = set().union(*(first for first in first_literals if first is not None))
+        if keys and _is_prefix_free(keys):
+            replacements[id(expr)] = KeywordOneOf(
+                expr.members, first_literals, name=expr.name
+            )
+
+    for expr in list(exprs.values()) + list(replacements.values()):
+        if isinstance(expr, Compound):
+            expr.members = tuple(
+                replacements.get(id(member), member) for member in expr.members
+            )
+    for key, expr in grammar.items():
+        grammar[key] = replacements.get(id(expr), expr)
+    if grammar.default_rule is not None:
+        grammar.default_rule = replacements.get(
+            id(grammar.default_rule), grammar.default_rule
+        )
 
 
 class DAIDEGrammar(Grammar):
     def __init__(self, rules: str = "", **more_rules) -> None:
         super().__init__(rules, **more_rules)
+        _index_choices(self)
         self._set_try_tokens()
 
+    def profile(self) -> GrammarProfile:
+        """Return a profile counting attempts, successes and time per rule of this grammar.
+
+        The profile works on a copy of this grammar. Use it as a context manager
+        around parses with `GrammarProfile.grammar`, then rank the rules with
+        `GrammarProfile.report`.
+
+        Returns:
+            GrammarProfile: a profile that is not running yet
+        """
+        return GrammarProfile(self)
+
     def _set_try_tokens(self):
         try_tokens = self.get("try_tokens")
 
@@ -73,7 +252,48 @@ def create_daide_grammar(
         string_type = "arrangement"
 
     grammar_str = _create_daide_grammar_str(level, string_type)
-    grammar = DAIDEGrammar(grammar_str)
+    grammar = cached_grammar(grammar_str, DAIDEGrammar)
+    return grammar
+
+
+def get_daide_grammar(
+    level: Union[DAIDELevel, List[DAIDELevel]] = 30,
+    allow_just_arrangement: bool = False,
+    string_type: Literal["message", "arrangement", "all"] = "message",
+) -> DAIDEGrammar:
+    """Return a shared DAIDEGrammar for a level, compiling it on first use.
+
+    Takes the same arguments as `create_daide_grammar`. Grammars are kept in a
+    registry keyed by (level, string_type), so every later call with the same
+    arguments returns the same instance instead of recompiling the PEG.
+
+    Args:
+        level (Union[DAIDELevel,List[DAIDELevel]], optional):
+            The level of DAIDE to make grammar for. Defaults to 30. If it's a list,
+            only include levels in list rather than all levels up to given value.
+        allow_just_arrangement (bool, optional):
+            if set to True, the parser accepts strings that are only arrangements.
+            Left for backwards compatibility.
+        string_type (Literal["message", "arrangement", "all"], optional):
+            Which DAIDE patterns the grammar recognizes, see `create_daide_grammar`.
+
+    Returns:
+        DAIDEGrammar: Grammar object shared by all callers
+    """
+    if allow_just_arrangement and string_type == "message":
+        string_type = "arrangement"
+
+    key: GrammarKey = (
+        tuple(level) if isinstance(level, list) else level,
+        string_type,
+    )
+    grammar = _grammar_registry.get(key)
+    if grammar is None:
+        with _grammar_registry_lock:
+            grammar = _grammar_registry.get(key)
+            if grammar is None:
+                grammar = create_daide_grammar(level, string_type=string_type)
+                _grammar_registry[key] = grammar
     return grammar
 
 
@@ -246,7 +466,7 @@ def create_grammar_from_press_keywords(
     if allow_just_arrangement and string_type == "message":
         string_type = "arrangement"
 
-    full_grammar = create_daide_grammar(
+    full_grammar = get_daide_grammar(
         level=DAIDELevel.__args__[-1],
         string_type=string_type,
     )
@@ -329,7 +549,7 @@ def create_grammar_from_press_keywords(
         new_grammar_dict.move_to_end("message", last=False)
 
     new_grammar_str = _create_grammar_str_from_dict(new_grammar_dict, string_type)
-    new_grammar = DAIDEGrammar(new_grammar_str)
+    new_grammar = cached_grammar(new_grammar_str, DAIDEGrammar)
     return new_grammar
 
 
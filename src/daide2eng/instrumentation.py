@@ -0,0 +1,155 @@
+"""
+Per-stage timings of `utils.gen_English`.
+
+Instrumentation is off by default. `utils.set_timing_hook(callback)` makes
+every `gen_English` call pass a `TranslationTiming` to `callback`;
+`TimingHistogram` is a ready-made callback that aggregates the timings in
+memory so they can be dumped later::
+
+    histogram = TimingHistogram()
+    utils.set_timing_hook(histogram)
+    ...
+    print(histogram.dump())
+"""
+
+import json
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+__all__ = ["STAGES", "TimingHistogram", "TranslationTiming"]
+
+# stages of gen_English, in pipeline order. The native parser builds keyword
+# objects while parsing, so its time is reported under "parse" only.
+STAGES = ("pre_process", "validate", "parse", "visit", "render", "post_process")
+
+
+@dataclass(frozen=True)
+class TranslationTiming:
+    """Timings of one gen_English call.
+
+    Args:
+        size (int): length of the DAIDE string in characters
+        parser (str): parser engine used
+        stages (Dict[str, float]): seconds spent in each stage that ran, keyed
+            by a name from STAGES. Stages skipped because of a cache hit or an
+            earlier error are missing.
+        total (float): seconds spent in gen_English, including cache lookups
+        ok (bool): False if the translation ended in an error
+        cache (Optional[str]): "render" or "parse" if the sentence or the
+            keyword tree came from that cache, else None
+    """
+
+    size: int
+    parser: str
+    stages: Dict[str, float]
+    total: float
+    ok: bool
+    cache: Optional[str] = None
+
+
+class _Histogram:
+    """Log-scale histogram with `resolution` buckets per doubling of the value."""
+
+    def __init__(self, unit: float, resolution: int = 4) -> None:
+        self.unit = unit
+        self.resolution = resolution
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        if value > self.unit:
+            bucket = math.ceil(math.log2(value / self.unit) * self.resolution)
+        else:
+            bucket = 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile, capped at the maximum."""
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.unit * 2 ** (bucket / self.resolution), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class TimingHistogram:
+    """Thread-safe in-process aggregator of TranslationTimings.
+
+    Instances are callables, so they can be passed straight to
+    `utils.set_timing_hook`. Durations are bucketed on a log scale starting
+    at one microsecond, so memory use does not grow with the number of calls.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self._stages = {stage: _Histogram(1e-6) for stage in STAGES}
+            self._total = _Histogram(1e-6)
+            self._size = _Histogram(1.0)
+            self._errors = 0
+            self._cache_hits: Dict[str, int] = {}
+
+    def __call__(self, timing: TranslationTiming) -> None:
+        with self._lock:
+            for stage, seconds in timing.stages.items():
+                self._stages[stage].add(seconds)
+            self._total.add(timing.total)
+            self._size.add(timing.size)
+            if not timing.ok:
+                self._errors += 1
+            if timing.cache is not None:
+                self._cache_hits[timing.cache] = (
+                    self._cache_hits.get(timing.cache, 0) + 1
+                )
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean, quantiles etc. per stage (in seconds) and of the message size.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable summary
+        """
+        with self._lock:
+            return {
+                "calls": self._total.count,
+                "errors": self._errors,
+                "cache_hits": dict(self._cache_hits),
+                "total": self._total.summary(),
+                "stages": {
+                    stage: histogram.summary()
+                    for stage, histogram in self._stages.items()
+                },
+                "size": self._size.summary(),
+            }
+
+    def dump(self, indent: Optional[int] = 2) -> str:
+        """Return `summary()` as a JSON string."""
+        return json.dumps(self.summary(), indent=indent)
@@ -1,2 +1,8 @@
 from daide2eng.keywords.base_keywords import *
+from daide2eng.keywords.daide_object import (
+    disable_hash_consing,
+    enable_hash_consing,
+    hash_consing_enabled,
+    intern_keyword,
+)
 from daide2eng.keywords.press_keywords import *
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Tuple, Union
+import sys
+from typing import Dict, List, Optional, Tuple, Union
 
 from typing_extensions import get_args
 
 from daide2eng.constants import *
-from daide2eng.keywords.daide_object import _DAIDEObject
-from daide2eng.keywords.keyword_utils import and_items, unit_dict
+from daide2eng.keywords.daide_object import (
+    _DAIDEObject,
+    daide_dataclass,
+    intern_keyword,
+)
+from daide2eng.keywords.keyword_utils import render, render_and_items, unit_dict
 
-_prov_no_coast = [prov for lit in get_args(ProvinceNoCoast) for prov in get_args(lit)]
+_prov_no_coast = get_args(ProvinceNoCoast)
+_prov_coast = [tuple(prov_coast.split()) for prov_coast in get_args(ProvinceCoast)]
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class Location:
     province: ProvinceNoCoast
     coast: Optional[Coast] = None
@@ -32,16 +37,20 @@ class Location:
             return f"({self.province} {self.coast})"
         return self.province
 
-    def __hash__(self) -> int:
-        return hash(str(self))
+    def _render(self, out: List[str]) -> None:
+        if self.coast:
+            out.append(f"({self.province} {self.coast})")
+        else:
+            out.append(self.province)
 
     def __lt__(self, o):
         if self.province == o.province:
-            return self.coast < o.coast
+            # a province without coast comes before its coasts
+            return (self.coast or "") < (o.coast or "")
         return self.province < o.province
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class Unit(_DAIDEObject):
     power: Power
     unit_type: UnitType
@@ -52,33 +61,94 @@ class Unit(_DAIDEObject):
             object.__setattr__(self, "location", Location(province=self.location))
         super().__post_init__()
 
-    def __str__(self):
-        unit = unit_dict[self.unit_type]
-        return f"{self.power}'s {unit} in {self.location} "
+    def _render(self, out):
+        out.append(f"{self.power}'s {unit_dict[self.unit_type]} in ")
+        render(self.location, out)
+        out.append(" ")
+
+
+# Locations and units are immutable, so parsed messages share one instance per
+# distinct value instead of allocating one per occurrence. The tables are keyed
+# by grammar literals, so they stay small.
+_locations: Dict[Tuple[str, Optional[str]], Location] = {
+    (province, None): Location(province) for province in _prov_no_coast
+}
+_locations.update(
+    ((province, coast), Location(province, coast)) for province, coast in _prov_coast
+)
+_units: Dict[Tuple[str, str, Location], Unit] = {}
+
+
+def get_location(province: str, coast: Optional[str] = None) -> Location:
+    """Return the shared Location of a province and optional coast.
+
+    Args:
+        province (str): province token, e.g. 'STP'
+        coast (Optional[str]): coast token, e.g. 'NCS'
+
+    Returns:
+        Location: canonical instance, equal to Location(province, coast)
+    """
+    location = _locations.get((province, coast))
+    if location is None:
+        province = sys.intern(province)
+        coast = coast if coast is None else sys.intern(coast)
+        location = _locations.setdefault(
+            (province, coast), Location(province, coast)
+        )
+    return intern_keyword(location)
+
+
+def get_unit(power: str, unit_type: str, location: Location) -> Unit:
+    """Return the shared Unit of a power and unit type at a location.
+
+    Args:
+        power (str): power token, e.g. 'ENG'
+        unit_type (str): unit type token, e.g. 'FLT'
+        location (Location): the unit's location
+
+    Returns:
+        Unit: canonical instance, equal to Unit(power, unit_type, location)
+    """
+    key = (power, unit_type, location)
+    unit = _units.get(key)
+    if unit is None:
+        power = sys.intern(power)
+        unit_type = sys.intern(unit_type)
+        unit = _units.setdefault(
+            (power, unit_type, location), Unit(power, unit_type, location)
+        )
+    return intern_keyword(unit)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class HLD(_DAIDEObject):
     unit: Unit
 
-    def __str__(self):
-        return f"holding {self.unit} "
+    def _render(self, out):
+        out.append("holding ")
+        render(self.unit, out)
+        out.append(" ")
 
     @property
     def location(self) -> Location:
         return self.unit.location
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class MTO(_DAIDEObject):
     unit: Unit
     location: Location
 
-    def __str__(self):
-        return f"moving {self.unit} to {self.location} "
+    def _render(self, out):
+        out.append("moving ")
+        render(self.unit, out)
+        out.append(" to ")
+        render(self.location, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class SUP(_DAIDEObject):
     supporting_unit: Unit
     supported_unit: Unit
@@ -104,14 +174,18 @@ class SUP(_DAIDEObject):
     def location(self) -> Location:
         return self.unit.location
 
-    def __str__(self):
-        if not self.province_no_coast:
-            return f"using {self.supporting_unit} to support {self.supported_unit} "
-        else:
-            return f"using {self.supporting_unit} to support {self.supported_unit} moving into {self.province_no_coast} "
+    def _render(self, out):
+        out.append("using ")
+        render(self.supporting_unit, out)
+        out.append(" to support ")
+        render(self.supported_unit, out)
+        if self.province_no_coast:
+            out.append(" moving into ")
+            render(self.province_no_coast, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class CVY(_DAIDEObject):
     convoying_unit: Unit
     convoyed_unit: Unit
@@ -122,8 +196,14 @@ class CVY(_DAIDEObject):
             object.__setattr__(self, "province", Location(province=self.province))
         super().__post_init__()
 
-    def __str__(self):
-        return f"using {self.convoying_unit} to convoy {self.convoyed_unit} into {self.province} "
+    def _render(self, out):
+        out.append("using ")
+        render(self.convoying_unit, out)
+        out.append(" to convoy ")
+        render(self.convoyed_unit, out)
+        out.append(" into ")
+        render(self.province, out)
+        out.append(" ")
 
     @property
     def unit(self) -> Unit:
@@ -139,7 +219,7 @@ class CVY(_DAIDEObject):
         return self.unit.location
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class MoveByCVY(_DAIDEObject):
     unit: Unit
     province: Location
@@ -158,83 +238,95 @@ class MoveByCVY(_DAIDEObject):
                 "Movement via convoy must include at least one sea province."
             )
 
-    def __str__(self):
-        return (
-            f"moving {self.unit} by convoy into {self.province} via "
-            + and_items(list(map(lambda x: str(x), self.province_seas)))
-        )
+    def _render(self, out):
+        out.append("moving ")
+        render(self.unit, out)
+        out.append(" by convoy into ")
+        render(self.province, out)
+        out.append(" via ")
+        render_and_items(self.province_seas, out)
 
     @property
     def location(self) -> Location:
         return self.province
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class RTO(_DAIDEObject):
     unit: Unit
     location: Location
 
-    def __str__(self):
-        return f"retreating {self.unit} to {self.location} "
+    def _render(self, out):
+        out.append("retreating ")
+        render(self.unit, out)
+        out.append(" to ")
+        render(self.location, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class DSB(_DAIDEObject):
     unit: Unit
 
-    def __str__(self):
-        return f"disbanding {self.unit} "
+    def _render(self, out):
+        out.append("disbanding ")
+        render(self.unit, out)
+        out.append(" ")
 
     @property
     def location(self) -> None:
         return None
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class BLD(_DAIDEObject):
     unit: Unit
 
-    def __str__(self):
-        return f"building {self.unit} "
+    def _render(self, out):
+        out.append("building ")
+        render(self.unit, out)
+        out.append(" ")
 
     @property
     def location(self) -> Location:
         return self.unit.location
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class REM(_DAIDEObject):
     unit: Unit
 
-    def __str__(self):
-        return f"removing {self.unit} "
+    def _render(self, out):
+        out.append("removing ")
+        render(self.unit, out)
+        out.append(" ")
 
     @property
     def location(self) -> None:
         return None
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class WVE(_DAIDEObject):
     """Wave a build"""
 
     power: Power
 
-    def __str__(self):
-        return f"waiving {self.power} "
+    def _render(self, out):
+        out.append(f"waiving {self.power} ")
 
     @property
     def location(self) -> None:
         return None
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class Turn(_DAIDEObject):
     season: Season
     year: int
 
-    def __str__(self):
-        return f"{self.season} {self.year} "
+    def _render(self, out):
+        out.append(f"{self.season} {self.year} ")
 
 
 Order = Union[
@@ -1,19 +1,237 @@
-from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from abc import ABC, ABCMeta, abstractmethod
+from dataclasses import FrozenInstanceError, dataclass, fields
+from operator import attrgetter
+from typing import Callable, List, Optional, Sequence, Tuple, Type, TypeVar
+from weakref import WeakValueDictionary
 
-from typing_extensions import get_args
+_T = TypeVar("_T")
 
-from daide2eng.grammar import create_daide_grammar
-from daide2eng.grammar.grammar import DAIDELevel
+# instance attributes of keyword objects besides their fields
+_CACHE_SLOTS = ("_str", "_hash", "__weakref__")
 
-_grammar = create_daide_grammar(get_args(DAIDELevel)[-1], string_type="all")
+# canonical keyword objects keyed by class and field values while hash-consing
+# is enabled, see enable_hash_consing
+_interned: Optional[WeakValueDictionary] = None
+
+
+def _intern_key(value: object) -> object:
+    """Key of a field value that tells apart values that merely compare equal.
+
+    Equal numbers can differ in type and repr, like 1 and 1.0 or 0.0 and -0.0,
+    and so can keyword objects holding them; both render differently. Keyword
+    objects are keyed by identity, since their fields are canonical already.
+    """
+    cls = type(value)
+    if cls is str:
+        return value
+    if cls is tuple:
+        return tuple(map(_intern_key, value))
+    if isinstance(cls, _KeywordMeta):
+        # the canonical parent keeps the object alive while it is interned
+        return id(value)
+    return cls, repr(value)
+
+
+def intern_keyword(obj: _T) -> _T:
+    """Return the canonical instance equal to keyword object `obj`.
+
+    Instances are only merged if their non-keyword field values have the same
+    type and repr and their keyword fields are the same objects, so a
+    canonical instance always renders like `obj`. While hash-consing is
+    disabled, `obj` itself is returned.
+    """
+    table = _interned
+    if table is None:
+        return obj
+    key = [type(obj)]
+    for value in obj._field_values(obj):
+        # the common cases of _intern_key, inlined
+        cls = type(value)
+        if cls is str:
+            key.append(value)
+        elif isinstance(cls, _KeywordMeta):
+            key.append(id(value))
+        else:
+            key.append(_intern_key(value))
+    return table.setdefault(tuple(key), obj)
+
+
+def _interning_call(cls, *args, **kwargs):
+    return intern_keyword(ABCMeta.__call__(cls, *args, **kwargs))
+
+
+class _KeywordMeta(ABCMeta):
+    """Metaclass of the keyword classes.
+
+    While hash-consing is enabled its `__call__` is `_interning_call`, so the
+    constructors return canonical instances; otherwise classes are called as
+    usual, without any overhead.
+    """
+
+
+def enable_hash_consing() -> None:
+    """Make keyword constructors, and thus the parsers, return canonical instances.
+
+    Structurally equal keyword objects built while hash-consing is enabled are
+    the same object, so trees that quote earlier messages share their subtrees
+    and comparing them often stops at an identity check. Canonical instances
+    are held weakly and forgotten once nothing else refers to them. Objects
+    built before enabling, unpickled or copied are not canonical, and neither
+    are objects built from them; `intern_keyword` finds the canonical instance
+    of an object whose keyword fields are canonical.
+    """
+    global _interned
+    if _interned is None:
+        _interned = WeakValueDictionary()
+        _KeywordMeta.__call__ = _interning_call  # type: ignore[assignment]
+
+
+def disable_hash_consing() -> None:
+    """Stop returning canonical instances and drop the intern table."""
+    global _interned
+    if _interned is not None:
+        _interned = None
+        del _KeywordMeta.__call__
+
+
+def hash_consing_enabled() -> bool:
+    """Whether keyword constructors return canonical instances."""
+    return _interned is not None
+
+
+def _field_getter(names: Sequence[str]) -> Callable[[object], Tuple]:
+    if len(names) > 1:
+        return attrgetter(*names)
+    if names:
+        get = attrgetter(names[0])
+        return lambda obj: (get(obj),)
+    return lambda obj: ()
+
+
+def _trusted_factory(cls: type, names: Sequence[str]) -> Callable[..., object]:
+    """Generate a function that builds an instance of `cls` from its field values.
+
+    The function sets the slots directly, like dataclasses generate
+    `__init__`, without running `__init__` or `__post_init__`.
+    """
+    namespace = {"_new": object.__new__, "_cls": cls, "_intern": intern_keyword}
+    lines = [f"def _trusted({', '.join(names)}):", "    _self = _new(_cls)"]
+    for index, name in enumerate(names):
+        namespace[f"_set_{index}"] = cls.__dict__[name].__set__
+        lines.append(f"    _set_{index}(_self, {name})")
+    lines.append("    return _intern(_self)")
+    exec("\n".join(lines), namespace)
+    return namespace["_trusted"]
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+
+def _with_slots(cls: type) -> type:
+    """Recreate the dataclass `cls` with `__slots__` instead of a `__dict__`.
+
+    This is what `dataclass(slots=True)` does on Python 3.10+. Field defaults
+    have to leave the class namespace, since they would clash with the slots;
+    the generated `__init__` keeps its own copy of them.
+    """
+    names = tuple(field.name for field in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names + _CACHE_SLOTS
+    namespace["_field_values"] = staticmethod(_field_getter(names))
+    # the generated frozen __setattr__ and __delattr__ refer to the old class
+    namespace["__setattr__"] = _frozen_setattr
+    namespace["__delattr__"] = _frozen_delattr
+    slotted = _KeywordMeta(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    slotted._trusted = staticmethod(_trusted_factory(slotted, names))
+
+    # point zero-argument super() in the methods at the new class
+    for value in namespace.values():
+        if isinstance(value, property):
+            value = value.fget
+        code = getattr(value, "__code__", None)
+        if code is not None and "__class__" in code.co_freevars:
+            value.__closure__[code.co_freevars.index("__class__")].cell_contents = (
+                slotted
+            )
+    return slotted
+
+
+def daide_dataclass(cls: Type[_T]) -> Type[_T]:
+    """Make `cls` a slotted, frozen dataclass that computes its string form and hash once.
+
+    Keyword objects are immutable, but `str` and `hash` of a nested arrangement
+    walk the whole subtree, and parents call them on their children when they
+    sort and deduplicate them. Caching both on the instance keeps building,
+    hashing and rendering a tree linear in its size.
+
+    The caches are not part of the dataclass fields, so equality, `repr` and
+    pickling see only the fields. Instances have no `__dict__`, which makes
+    large parsed histories considerably smaller.
+
+    The parsers build keyword objects from values the grammar has already
+    checked. They use `cls._trusted(*field_values)`, which skips `__init__`
+    and `__post_init__` and stores the values as given, so callers must pass
+    every field in the form `__init__` would store it: sorted, deduplicated
+    tuples, `Location`s rather than province strings and so on. Classes
+    with such fields provide a `_from_parsed` classmethod that normalizes
+    them like `__init__` before calling `_trusted`. Anything else should call
+    the validating constructor.
+    """
+    cls = _with_slots(dataclass(eq=True, frozen=True)(cls))
+    render_str = cls.__str__
+    fields_hash = cls.__hash__
+    field_values = cls._field_values  # type: ignore[attr-defined]
+
+    def __str__(self) -> str:
+        string = getattr(self, "_str", None)
+        if string is None:
+            string = render_str(self)
+            object.__setattr__(self, "_str", string)
+        return string
+
+    def __hash__(self) -> int:
+        value = getattr(self, "_hash", None)
+        if value is None:
+            value = fields_hash(self)
+            object.__setattr__(self, "_hash", value)
+        return value
+
+    def __getstate__(self) -> Tuple:
+        return field_values(self)
+
+    def __setstate__(self, state: Tuple) -> None:
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
+
+    cls.__str__ = __str__  # type: ignore[assignment]
+    cls.__hash__ = __hash__  # type: ignore[assignment]
+    cls.__getstate__ = __getstate__  # type: ignore[attr-defined]
+    cls.__setstate__ = __setstate__  # type: ignore[attr-defined]
+    return cls
 
 
 @dataclass(eq=True, frozen=True)
 class _DAIDEObject(ABC):
+    __slots__ = ()
+
     @abstractmethod
+    def _render(self, out: List[str]) -> None:
+        """Append the English fragments of this object to the buffer `out`."""
+
     def __str__(self) -> str:
-        pass
+        out: List[str] = []
+        self._render(out)
+        return "".join(out)
 
     def __post_init__(self):
-        pass
\ No newline at end of file
+        pass
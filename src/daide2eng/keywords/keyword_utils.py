@@ -1,18 +1,70 @@
-def and_items(items):
-    if len(items) == 1:
-        return str(items[0]) + " "
-    elif len(items) == 2:
-        return str(items[0]) + " and " + str(items[1]) + " "
+from typing import List, Sequence
+
+
+def render(obj, out: List[str]) -> None:
+    """Append the English form of `obj` to the buffer `out`.
+
+    Keyword objects append their fragments themselves, or their string form if
+    it was already computed; anything else (powers, provinces, numbers) is
+    appended as its `str`.
+    """
+    if type(obj) is str:
+        out.append(obj)
+        return
+    string = getattr(obj, "_str", None)
+    if string is not None:
+        out.append(string)
+        return
+    render_into = getattr(obj, "_render", None)
+    if render_into is None:
+        out.append(str(obj))
     else:
-        return ", ".join([str(item) for item in items[:-1]]) + ", and " + str(items[-1]) + " "
+        render_into(out)
+
+
+def _render_items(
+    items: Sequence, conjunction: str, out: List[str], item_suffix: str
+) -> None:
+    last = items[-1]
+    count = len(items)
+    for index in range(count - 1):
+        render(items[index], out)
+        if item_suffix:
+            out.append(item_suffix)
+        if index < count - 2:
+            out.append(", ")
+    if count == 2:
+        out.append(f" {conjunction} ")
+    elif count > 2:
+        out.append(f", {conjunction} ")
+    render(last, out)
+    if item_suffix:
+        out.append(item_suffix)
+    out.append(" ")
+
+
+def render_and_items(items: Sequence, out: List[str], item_suffix: str = "") -> None:
+    """Append `items` to `out` as an English list joined with "and".
+
+    `item_suffix` is appended after each item.
+    """
+    _render_items(items, "and", out, item_suffix)
+
+
+def render_or_items(items: Sequence, out: List[str]) -> None:
+    """Append `items` to `out` as an English list joined with "or"."""
+    _render_items(items, "or", out, "")
+
+
+def and_items(items):
+    out: List[str] = []
+    render_and_items(items, out)
+    return "".join(out)
 
 def or_items(items):
-    if len(items) == 1:
-        return str(items[0]) + " "
-    elif len(items) == 2:
-        return str(items[0]) + " or " + str(items[1]) + " "
-    else:
-        return ", ".join([str(item) for item in items[:-1]]) + ", or " + str(items[-1]) + " "
+    out: List[str] = []
+    render_or_items(items, out)
+    return "".join(out)
 
 power_dict = {
     "AUSTRIA": "AUSTRIA",
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Iterable, List
+from dataclasses import field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
 
 from daide2eng.constants import *
 from daide2eng.keywords.base_keywords import *
-from daide2eng.keywords.daide_object import _DAIDEObject
-from daide2eng.keywords.keyword_utils import and_items, or_items
+from daide2eng.keywords.daide_object import _DAIDEObject, daide_dataclass
+from daide2eng.keywords.keyword_utils import (
+    render,
+    render_and_items,
+    render_or_items,
+)
 
-@dataclass(eq=True, frozen=True)
+
+# Keyword objects store collections sorted and deduplicated, so that equal
+# arrangements compare and render alike. __init__ and the `_from_parsed`
+# classmethods, which build objects from parser output with `_trusted`,
+# both normalize with these.
+def _sorted_set(values: Iterable) -> Tuple:
+    return tuple(sorted(set(values)))
+
+
+def _sorted_set_by_str(values: Iterable) -> Tuple:
+    return tuple(sorted(set(values), key=str))
+
+
+@daide_dataclass
 class PCE(_DAIDEObject):
     powers: Tuple[Power]
 
     def __init__(self, *powers: Power):
-        object.__setattr__(self, "powers", tuple(sorted(set(powers))))
+        object.__setattr__(self, "powers", _sorted_set(powers))
         self.__post_init__()
 
     def __post_init__(self):
@@ -21,57 +38,70 @@ class PCE(_DAIDEObject):
         if len(self.powers) < 2:
             raise ValueError("A peace must have at least 2 powers.")
 
-    def __str__(self):
-        return "peace between " + and_items(self.powers)
+    def _render(self, out):
+        out.append("peace between ")
+        render_and_items(self.powers, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class CCL(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"cancel \"{self.press_message}\" "
+    def _render(self, out):
+        out.append('cancel "')
+        render(self.press_message, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class TRY(_DAIDEObject):
     try_tokens: Tuple[TryTokens]
 
     def __init__(self, *try_tokens):
-        object.__setattr__(self, "try_tokens", tuple(sorted(set(try_tokens))))
+        object.__setattr__(self, "try_tokens", _sorted_set(try_tokens))
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(cls, try_tokens: Iterable[TryTokens]) -> TRY:
+        return cls._trusted(_sorted_set(try_tokens))
+
     def __post_init__(self):
         super().__post_init__()
         if not self.try_tokens:
             raise ValueError("A TRY message must have at least 1 token.")
 
-    def __str__(self):
-        return "try the following tokens: " + " ".join(self.try_tokens) + " "
+    def _render(self, out):
+        out.append("try the following tokens: ")
+        out.append(" ".join(self.try_tokens))
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class HUH(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"not understand \"{self.press_message}\" "
+    def _render(self, out):
+        out.append('not understand "')
+        render(self.press_message, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class PRP(_DAIDEObject):
     arrangement: Arrangement
 
-    def __str__(self):
-        return f"propose {self.arrangement} "
+    def _render(self, out):
+        out.append("propose ")
+        render(self.arrangement, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class ALYONLY(_DAIDEObject):
     powers: Tuple[Power]
 
     def __init__(self, *powers: Power):
-        object.__setattr__(self, "powers", tuple(sorted(set(powers))))
+        object.__setattr__(self, "powers", _sorted_set(powers))
         self.__post_init__()
 
     def __post_init__(self):
@@ -79,17 +109,18 @@ class ALYONLY(_DAIDEObject):
         if len(self.powers) < 2:
             raise ValueError("An alliance must have at least 2 allies.")
 
-    def __str__(self):
-        return "an alliance of " + and_items(self.powers)
+    def _render(self, out):
+        out.append("an alliance of ")
+        render_and_items(self.powers, out)
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class ALYVSS(_DAIDEObject):
     aly_powers: Tuple[Power]
     vss_powers: Tuple[Power]
 
     def __init__(self, aly_powers: Iterable[Power], vss_powers: Iterable[Power]):
-        object.__setattr__(self, "aly_powers", tuple(sorted(set(aly_powers))))
-        object.__setattr__(self, "vss_powers", tuple(sorted(set(vss_powers))))
+        object.__setattr__(self, "aly_powers", _sorted_set(aly_powers))
+        object.__setattr__(self, "vss_powers", _sorted_set(vss_powers))
         self.__post_init__()
 
     def __post_init__(self):
@@ -99,49 +130,53 @@ class ALYVSS(_DAIDEObject):
         if len(self.vss_powers) < 1:
             raise ValueError("An alliance must have at least 1 enemy.")
 
-    def __str__(self):
+    def _render(self, out):
         if not any(pp in self.aly_powers for pp in self.vss_powers):
             # if there is VSS power and no overlap between the allies and the enemies
-            return (
-                "an alliance with "
-                + and_items(self.aly_powers)
-                + "against "
-                + and_items(self.vss_powers)
-            )
+            out.append("an alliance with ")
+            render_and_items(self.aly_powers, out)
+            out.append("against ")
+            render_and_items(self.vss_powers, out)
         else:
-            return "an alliance of " + and_items(self.aly_powers)
+            out.append("an alliance of ")
+            render_and_items(self.aly_powers, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class SLO(_DAIDEObject):
     power: Power
 
-    def __str__(self):
-        return f"{self.power} solo"
+    def _render(self, out):
+        render(self.power, out)
+        out.append(" solo")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class NOT(_DAIDEObject):
     arrangement_qry: Union[Arrangement, QRY]
 
-    def __str__(self):
-        return f"not {self.arrangement_qry} "
+    def _render(self, out):
+        out.append("not ")
+        render(self.arrangement_qry, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class NAR(_DAIDEObject):
     arrangement: Arrangement
 
-    def __str__(self):
-        return f"lack of arragement: {self.arrangement} "
+    def _render(self, out):
+        out.append("lack of arragement: ")
+        render(self.arrangement, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class DRW(_DAIDEObject):
     powers: Tuple[Power]
 
     def __init__(self, *powers: Power):
-        object.__setattr__(self, "powers", tuple(sorted(set(powers))))
+        object.__setattr__(self, "powers", _sorted_set(powers))
         self.__post_init__()
 
     def __post_init__(self):
@@ -149,46 +184,55 @@ class DRW(_DAIDEObject):
         if len(self.powers) == 1:
             raise ValueError("A draw cannot involve only a single power.")
 
-    def __str__(self):
+    def _render(self, out):
         if self.powers:
-            return and_items(self.powers) + "draw "
+            render_and_items(self.powers, out)
+            out.append("draw ")
         else:
-            return f"draw"
+            out.append("draw")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class YES(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"accept {self.press_message} "
+    def _render(self, out):
+        out.append("accept ")
+        render(self.press_message, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class REJ(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"reject {self.press_message} "
+    def _render(self, out):
+        out.append("reject ")
+        render(self.press_message, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class BWX(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"refuse answering to {self.press_message} "
+    def _render(self, out):
+        out.append("refuse answering to ")
+        render(self.press_message, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class FCT(_DAIDEObject):
     arrangement_qry_not: Union[Arrangement, QRY, NOT]
 
-    def __str__(self):
-        return f"expect the following: \"{self.arrangement_qry_not}\" "
+    def _render(self, out):
+        out.append('expect the following: "')
+        render(self.arrangement_qry_not, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class FRM(_DAIDEObject):
     frm_power: Power
     recv_powers: Tuple[Power]
@@ -198,32 +242,64 @@ class FRM(_DAIDEObject):
         self, frm_power: Power, recv_powers: Iterable[Power], message: Message
     ):
         object.__setattr__(self, "frm_power", frm_power)
-        object.__setattr__(self, "recv_powers", tuple(sorted(set(recv_powers))))
+        object.__setattr__(self, "recv_powers", _sorted_set(recv_powers))
         object.__setattr__(self, "message", message)
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, frm_power: Power, recv_powers: Iterable[Power], message: Message
+    ) -> FRM:
+        return cls._trusted(frm_power, _sorted_set(recv_powers), message)
+
     def __post_init__(self):
         super().__post_init__()
         if not self.recv_powers:
             raise ValueError("A FRM must have at least 1 receiving power.")
 
-    def __str__(self):
-        return (
-            f"from {self.frm_power} to "
-            + and_items(self.recv_powers)
-            + f": \"{self.message}\" "
-        )
+    def _render(self, out):
+        out.append("from ")
+        render(self.frm_power, out)
+        out.append(" to ")
+        render_and_items(self.recv_powers, out)
+        out.append(': "')
+        render(self.message, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class XDO(_DAIDEObject):
     order: Command
 
-    def __str__(self):
-        return f"an order {self.order} "
+    def _render(self, out):
+        out.append("an order ")
+        render(self.order, out)
+        out.append(" ")
+
 
+# coastal provinces, and the locations a DMZ of each of them covers
+_COASTAL_PROVINCES: Dict[Location, Tuple[Location, ...]] = {
+    get_location(province): (get_location(province),)
+    + tuple(get_location(province, coast) for coast in coasts)
+    for province, coasts in (
+        ("STP", ("NCS", "SCS")),
+        ("SPA", ("NCS", "SCS")),
+        ("BUL", ("ECS", "SCS")),
+    )
+}
 
-@dataclass(eq=True, frozen=True)
+
+def _exhaustive_provinces(provinces: Tuple[Location, ...]) -> Tuple[Location, ...]:
+    """Add the coasts of the coastal provinces to `provinces`, a sorted tuple of unique locations."""
+    if _COASTAL_PROVINCES.keys().isdisjoint(provinces):
+        return provinces
+    exhaustive_provinces: List[Location] = []
+    for province in provinces:
+        exhaustive_provinces.extend(_COASTAL_PROVINCES.get(province, (province,)))
+    return _sorted_set(exhaustive_provinces)
+
+
+@daide_dataclass
 class DMZ(_DAIDEObject):
     """This is an arrangement for the listed powers to remove all units from, and not order to, support to, convoy to, retreat to, or build any units in any of the list of provinces. Eliminated powers must not be included in the power list. The arrangement is continuous (i.e. it isn't just for the current turn)."""
 
@@ -232,32 +308,23 @@ class DMZ(_DAIDEObject):
     exhaustive_provinces: Tuple[Location] = field(init=False)
 
     def __init__(self, powers: Iterable[Power], provinces: Iterable[Location]):
-        object.__setattr__(self, "powers", tuple(sorted(set(powers))))
-        object.__setattr__(self, "provinces", tuple(sorted(set(provinces))))
-
-        exhaustive_provinces: List[Location] = []
-        for province in self.provinces:
-            if province == Location(province="STP"):
-                exhaustive_provinces.append(Location(province="STP"))
-                exhaustive_provinces.append(Location(province="STP", coast="NCS"))
-                exhaustive_provinces.append(Location(province="STP", coast="SCS"))
-            elif province == Location(province="SPA"):
-                exhaustive_provinces.append(Location(province="SPA"))
-                exhaustive_provinces.append(Location(province="SPA", coast="NCS"))
-                exhaustive_provinces.append(Location(province="SPA", coast="SCS"))
-            elif province == Location(province="BUL"):
-                exhaustive_provinces.append(Location(province="BUL"))
-                exhaustive_provinces.append(Location(province="BUL", coast="ECS"))
-                exhaustive_provinces.append(Location(province="BUL", coast="SCS"))
-            else:
-                exhaustive_provinces.append(province)
-
+        object.__setattr__(self, "powers", _sorted_set(powers))
+        object.__setattr__(self, "provinces", _sorted_set(provinces))
         object.__setattr__(
-            self, "exhaustive_provinces", tuple(sorted(set(exhaustive_provinces)))
+            self, "exhaustive_provinces", _exhaustive_provinces(self.provinces)
         )
 
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, powers: Iterable[Power], provinces: Iterable[Location]
+    ) -> DMZ:
+        provinces = _sorted_set(provinces)
+        return cls._trusted(
+            _sorted_set(powers), provinces, _exhaustive_provinces(provinces)
+        )
+
     def __post_init__(self):
         super().__post_init__()
         if not self.powers:
@@ -265,22 +332,18 @@ class DMZ(_DAIDEObject):
         if not self.provinces:
             raise ValueError("A DMZ must include at least 1 province.")
 
-    def __str__(self):
-        return (
-            and_items(self.powers)
-            + "demilitarize "
-            + and_items(list(map(lambda x: str(x), self.provinces)))
-        )
+    def _render(self, out):
+        render_and_items(self.powers, out)
+        out.append("demilitarize ")
+        render_and_items(self.provinces, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class AND(_DAIDEObject):
     arrangements: Tuple[Arrangement]
 
     def __init__(self, *arrangements: Arrangement):
-        object.__setattr__(
-            self, "arrangements", tuple(sorted(set(arrangements), key=str))
-        )
+        object.__setattr__(self, "arrangements", _sorted_set_by_str(arrangements))
         self.__post_init__()
 
     def __post_init__(self):
@@ -288,18 +351,16 @@ class AND(_DAIDEObject):
         if len(self.arrangements) < 2:
             raise ValueError("An AND must have at least 2 arrangements.")
 
-    def __str__(self):
-        return and_items(self.arrangements)
+    def _render(self, out):
+        render_and_items(self.arrangements, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class ORR(_DAIDEObject):
     arrangements: Tuple[Arrangement]
 
     def __init__(self, *arrangements: Arrangement):
-        object.__setattr__(
-            self, "arrangements", tuple(sorted(set(arrangements), key=str))
-        )
+        object.__setattr__(self, "arrangements", _sorted_set_by_str(arrangements))
         self.__post_init__()
 
     def __post_init__(self):
@@ -307,20 +368,26 @@ class ORR(_DAIDEObject):
         if len(self.arrangements) < 2:
             raise ValueError("An ORR must have at least 2 arrangements.")
 
-    def __str__(self):
-        return or_items(self.arrangements)
+    def _render(self, out):
+        render_or_items(self.arrangements, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class PowerAndSupplyCenters:
     power: Power
     supply_centers: Tuple[Location]  # Supply centers
 
     def __init__(self, power, *supply_centers: Location):
         object.__setattr__(self, "power", power)
-        object.__setattr__(self, "supply_centers", tuple(sorted(set(supply_centers))))
+        object.__setattr__(self, "supply_centers", _sorted_set(supply_centers))
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, power: Power, supply_centers: Iterable[Location]
+    ) -> PowerAndSupplyCenters:
+        return cls._trusted(power, _sorted_set(supply_centers))
+
     def __post_init__(self):
         if not self.supply_centers:
             raise ValueError(
@@ -328,10 +395,17 @@ class PowerAndSupplyCenters:
             )
 
     def __str__(self):
-        return f"{self.power} to have " + and_items(list(map(lambda x: str(x), self.supply_centers)))
+        out: List[str] = []
+        self._render(out)
+        return "".join(out)
 
+    def _render(self, out: List[str]) -> None:
+        render(self.power, out)
+        out.append(" to have ")
+        render_and_items(self.supply_centers, out)
 
-@dataclass(eq=True, frozen=True)
+
+@daide_dataclass
 class SCD(_DAIDEObject):
     power_and_supply_centers: Tuple[PowerAndSupplyCenters]
 
@@ -339,39 +413,49 @@ class SCD(_DAIDEObject):
         object.__setattr__(
             self,
             "power_and_supply_centers",
-            tuple(sorted(set(power_and_supply_centers), key=str)),
+            _sorted_set_by_str(power_and_supply_centers),
         )
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, power_and_supply_centers: Iterable[PowerAndSupplyCenters]
+    ) -> SCD:
+        return cls._trusted(_sorted_set_by_str(power_and_supply_centers))
+
     def __post_init__(self):
         super().__post_init__()
         if not self.power_and_supply_centers:
             raise ValueError("An SCD must have at least 1 power and supply center.")
 
-    def __str__(self):
-        pas_str = [str(pas) + " " for pas in self.power_and_supply_centers]
-        return f"an arragement of supply centre distribution as follows: " + and_items(pas_str)
+    def _render(self, out):
+        out.append("an arragement of supply centre distribution as follows: ")
+        render_and_items(self.power_and_supply_centers, out, item_suffix=" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class OCC(_DAIDEObject):
     units: Tuple[Unit]
 
     def __init__(self, *units: Unit):
-        object.__setattr__(self, "units", tuple(sorted(set(units), key=str)))
+        object.__setattr__(self, "units", _sorted_set_by_str(units))
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(cls, units: Iterable[Unit]) -> OCC:
+        return cls._trusted(_sorted_set_by_str(units))
+
     def __post_init__(self):
         super().__post_init__()
         if not self.units:
             raise ValueError("An OCC must have at least 1 unit.")
 
-    def __str__(self):
-        unit_str = [str(unit) for unit in self.units]
-        return f"placing " + and_items(unit_str)
+    def _render(self, out):
+        out.append("placing ")
+        render_and_items(self.units, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class CHO(_DAIDEObject):
     minimum: int
     maximum: int
@@ -380,148 +464,194 @@ class CHO(_DAIDEObject):
     def __init__(self, minimum: int, maximum: int, *arrangements: Arrangement):
         object.__setattr__(self, "minimum", minimum)
         object.__setattr__(self, "maximum", maximum)
-        object.__setattr__(
-            self, "arrangements", tuple(sorted(set(arrangements), key=str))
-        )
+        object.__setattr__(self, "arrangements", _sorted_set_by_str(arrangements))
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, minimum: int, maximum: int, arrangements: Iterable[Arrangement]
+    ) -> CHO:
+        return cls._trusted(minimum, maximum, _sorted_set_by_str(arrangements))
+
     def __post_init__(self):
         super().__post_init__()
         if not self.arrangements:
             raise ValueError("A CHO must have at least 1 arrangement.")
 
-    def __str__(self):
+    def _render(self, out):
         if self.minimum == self.maximum:
-            return f"choosing {self.minimum} in " + and_items(self.arrangements)
+            out.append(f"choosing {self.minimum} in ")
         else:
-            return f"choosing between {self.minimum} and {self.maximum} in " + and_items(self.arrangements)
+            out.append(f"choosing between {self.minimum} and {self.maximum} in ")
+        render_and_items(self.arrangements, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class INS(_DAIDEObject):
     arrangement: Arrangement
 
-    def __str__(self):
-        return f"insist {self.arrangement} "
+    def _render(self, out):
+        out.append("insist ")
+        render(self.arrangement, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class QRY(_DAIDEObject):
     arrangement: Arrangement
 
-    def __str__(self):
-        return f"Is {self.arrangement} true? "
+    def _render(self, out):
+        out.append("Is ")
+        render(self.arrangement, out)
+        out.append(" true? ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class THK(_DAIDEObject):
     arrangement_qry_not: Union[Arrangement, QRY, NOT, None]
 
-    def __str__(self):
-        return f"think {self.arrangement_qry_not} is true "
+    def _render(self, out):
+        out.append("think ")
+        render(self.arrangement_qry_not, out)
+        out.append(" is true ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class IDK(_DAIDEObject):
     qry_exp_wht_prp_ins_sug: Union[QRY, EXP, WHT, PRP, INS, SUG]
 
-    def __str__(self):
-        return f"don't know about {self.qry_exp_wht_prp_ins_sug} "
+    def _render(self, out):
+        out.append("don't know about ")
+        render(self.qry_exp_wht_prp_ins_sug, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class SUG(_DAIDEObject):
     arrangement: Arrangement
 
-    def __str__(self):
-        return f"suggest {self.arrangement} "
+    def _render(self, out):
+        out.append("suggest ")
+        render(self.arrangement, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class WHT(_DAIDEObject):
     unit: Unit
 
-    def __str__(self):
-        return f"What do you think about {self.unit} ? "
+    def _render(self, out):
+        out.append("What do you think about ")
+        render(self.unit, out)
+        out.append(" ? ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class HOW(_DAIDEObject):
     province_power: Union[Location, Power]
 
-    def __str__(self):
-        return f"How do you think we should attack {self.province_power} ? "
+    def _render(self, out):
+        out.append("How do you think we should attack ")
+        render(self.province_power, out)
+        out.append(" ? ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class EXP(_DAIDEObject):
     turn: Turn
     message: Message
     power: str
 
-    def __str__(self):
-        return f"The explanation for what {self.power} did in {self.turn} is {self.message} "
+    def _render(self, out):
+        out.append("The explanation for what ")
+        render(self.power, out)
+        out.append(" did in ")
+        render(self.turn, out)
+        out.append(" is ")
+        render(self.message, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class SRY(_DAIDEObject):
     exp: EXP
 
-    def __str__(self):
-        return f"I'm sorry about {self.exp} "
+    def _render(self, out):
+        out.append("I'm sorry about ")
+        render(self.exp, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class FOR(_DAIDEObject):
     start_turn: Turn
     end_turn: Optional[Turn]
     arrangement: Arrangement
 
-    def __str__(self):
+    def _render(self, out):
+        render(self.arrangement, out)
         if not self.end_turn:
-            return f"{self.arrangement} in {self.start_turn} "
+            out.append(" in ")
+            render(self.start_turn, out)
         else:
-            return f"{self.arrangement} from {self.start_turn} to {self.end_turn} "
+            out.append(" from ")
+            render(self.start_turn, out)
+            out.append(" to ")
+            render(self.end_turn, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class IFF(_DAIDEObject):
     arrangement: Arrangement
     press_message: PressMessage
     els_press_message: Optional[PressMessage] = None
 
-    def __str__(self):
-        if not self.els_press_message:
-            return f"if {self.arrangement} then \"{self.press_message}\" "
-        else:
-            return f"if {self.arrangement} then \"{self.press_message}\" else \"{self.els_press_message}\" "
+    def _render(self, out):
+        out.append("if ")
+        render(self.arrangement, out)
+        out.append(' then "')
+        render(self.press_message, out)
+        if self.els_press_message:
+            out.append('" else "')
+            render(self.els_press_message, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class XOY(_DAIDEObject):
     power_x: Power
     power_y: Power
 
-    def __str__(self):
-        return f"{self.power_x} owes {self.power_y} "
+    def _render(self, out):
+        render(self.power_x, out)
+        out.append(" owes ")
+        render(self.power_y, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class YDO(_DAIDEObject):
     power: Power
     units: Tuple[Unit]
 
     def __init__(self, power, *units):
         object.__setattr__(self, "power", power)
-        object.__setattr__(self, "units", tuple(sorted(set(units), key=str)))
+        object.__setattr__(self, "units", _sorted_set_by_str(units))
         self.__post_init__()
 
-    def __str__(self):
-        unit_str = [str(unit) for unit in self.units]
-        return f"giving {self.power} the control of" + and_items(unit_str)
+    @classmethod
+    def _from_parsed(cls, power: Power, units: Iterable[Unit]) -> YDO:
+        return cls._trusted(power, _sorted_set_by_str(units))
+
+    def _render(self, out):
+        out.append("giving ")
+        render(self.power, out)
+        out.append(" the control of")
+        render_and_items(self.units, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class SND(_DAIDEObject):
     power: Power
     recv_powers: Tuple[Power]
@@ -529,48 +659,62 @@ class SND(_DAIDEObject):
 
     def __init__(self, power: Power, recv_powers: Iterable[Power], message: Message):
         object.__setattr__(self, "power", power)
-        object.__setattr__(self, "recv_powers", tuple(sorted(set(recv_powers))))
+        object.__setattr__(self, "recv_powers", _sorted_set(recv_powers))
         object.__setattr__(self, "message", message)
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, power: Power, recv_powers: Iterable[Power], message: Message
+    ) -> SND:
+        return cls._trusted(power, _sorted_set(recv_powers), message)
+
     def __post_init__(self):
         super().__post_init__()
         if not self.recv_powers:
             raise ValueError("A SND must have at least 1 receiving power.")
 
-    def __str__(self):
+    def _render(self, out):
+        render(self.power, out)
+        out.append(" sending ")
+        render(self.message, out)
+        out.append(" to ")
+        render_and_items(self.recv_powers, out)
 
-        return (
-            f"{self.power} sending {self.message} to "
-            + and_items(self.recv_powers)
-        )
 
-
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class FWD(_DAIDEObject):
     powers: Tuple[Power]
     power_1: Power
     power_2: Power
 
     def __init__(self, powers: Iterable[Power], power_1: Power, power_2: Power):
-        object.__setattr__(self, "powers", tuple(sorted(set(powers))))
+        object.__setattr__(self, "powers", _sorted_set(powers))
         object.__setattr__(self, "power_1", power_1)
         object.__setattr__(self, "power_2", power_2)
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, powers: Iterable[Power], power_1: Power, power_2: Power
+    ) -> FWD:
+        return cls._trusted(_sorted_set(powers), power_1, power_2)
+
     def __post_init__(self):
         super().__post_init__()
         if not self.powers:
             raise ValueError("A FWD must have at least 1 receiving power.")
 
-    def __str__(self):
-        return (
-            f"forwarding to {self.power_2} if {self.power_1} receives message from "
-            + and_items(self.powers)
-        )
+    def _render(self, out):
+        out.append("forwarding to ")
+        render(self.power_2, out)
+        out.append(" if ")
+        render(self.power_1, out)
+        out.append(" receives message from ")
+        render_and_items(self.powers, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class BCC(_DAIDEObject):
     power_1: Power
     powers: Tuple[Power]
@@ -578,84 +722,110 @@ class BCC(_DAIDEObject):
 
     def __init__(self, power_1: Power, powers: Iterable[Power], power_2: Power):
         object.__setattr__(self, "power_1", power_1)
-        object.__setattr__(self, "powers", tuple(sorted(set(powers))))
+        object.__setattr__(self, "powers", _sorted_set(powers))
         object.__setattr__(self, "power_2", power_2)
         self.__post_init__()
 
+    @classmethod
+    def _from_parsed(
+        cls, power_1: Power, powers: Iterable[Power], power_2: Power
+    ) -> BCC:
+        return cls._trusted(power_1, _sorted_set(powers), power_2)
+
     def __post_init__(self):
         super().__post_init__()
         if not self.powers:
             raise ValueError("A BCC must have at least 1 receiving power.")
 
-    def __str__(self):
-        return (
-            f"forwarding to {self.power_2} if {self.power_1} sends message to "
-            + and_items(self.powers)
-        )
+    def _render(self, out):
+        out.append("forwarding to ")
+        render(self.power_2, out)
+        out.append(" if ")
+        render(self.power_1, out)
+        out.append(" sends message to ")
+        render_and_items(self.powers, out)
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class WHY(_DAIDEObject):
     fct_thk_prp_ins: Union[FCT, THK, PRP, INS]
 
-    def __str__(self):
-        return f"Why do you believe \"{self.fct_thk_prp_ins}\" ? "
+    def _render(self, out):
+        out.append('Why do you believe "')
+        render(self.fct_thk_prp_ins, out)
+        out.append('" ? ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class POB(_DAIDEObject):
     why: WHY
 
-    def __str__(self):
-        return f"answer \"{self.why}\": the position on the board, or the previous moves, suggests/implies it "
+    def _render(self, out):
+        out.append('answer "')
+        render(self.why, out)
+        out.append('": the position on the board, or the previous moves, suggests/implies it ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class UHY(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"am unhappy that \"{self.press_message}\" "
+    def _render(self, out):
+        out.append('am unhappy that "')
+        render(self.press_message, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class HPY(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"am happy that \"{self.press_message}\" "
+    def _render(self, out):
+        out.append('am happy that "')
+        render(self.press_message, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class ANG(_DAIDEObject):
     press_message: PressMessage
 
-    def __str__(self):
-        return f"am angry that \"{self.press_message}\" "
+    def _render(self, out):
+        out.append('am angry that "')
+        render(self.press_message, out)
+        out.append('" ')
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class ROF(_DAIDEObject):
-    def __str__(self):
-        return f"requesting an offer"
+    def _render(self, out):
+        out.append("requesting an offer")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class ULB(_DAIDEObject):
     power: Power
     float_val: float
 
-    def __str__(self):
-        return f"having a utility lower bound of float for {self.power} is {self.float_val} "
+    def _render(self, out):
+        out.append("having a utility lower bound of float for ")
+        render(self.power, out)
+        out.append(" is ")
+        render(self.float_val, out)
+        out.append(" ")
 
 
-@dataclass(eq=True, frozen=True)
+@daide_dataclass
 class UUB(_DAIDEObject):
     power: Power
     float_val: float
 
-    def __str__(self):
-        return f"having a utility upper bound of float for {self.power} is {self.float_val} "
+    def _render(self, out):
+        out.append("having a utility upper bound of float for ")
+        render(self.power, out)
+        out.append(" is ")
+        render(self.float_val, out)
+        out.append(" ")
 
 
 Reply = Union[YES, REJ, BWX, HUH, FCT, THK, IDK, WHY, POB, UHY, HPY, ANG]
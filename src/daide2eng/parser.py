@@ -0,0 +1,975 @@
+"""
+Native recursive-descent parser for level-160 DAIDE.
+
+This is an alternative to running the parsimonious grammar and then walking the
+resulting parse tree with `DAIDEVisitor`. The input is tokenized once into
+parentheses and words, and the keyword objects from `base_keywords` and
+`press_keywords` are built directly while parsing, without an intermediate
+`Node` tree.
+
+The parser follows the PEG in `grammar.py` rule by rule, including its ordered
+choices and whitespace handling, and builds the same objects the visitor
+builds. Literal sets (powers, provinces, try tokens, ...) are read from the
+grammar dicts, so they stay in sync with the PEG.
+"""
+
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from parsimonious.exceptions import ParseError
+from typing_extensions import Literal
+
+from daide2eng.grammar.grammar import LEVEL_0
+from daide2eng.grammar.grammar_utils import (
+    _create_daide_grammar_dict,
+    get_daide_grammar,
+)
+from daide2eng.keywords.base_keywords import *
+from daide2eng.keywords.press_keywords import *
+from daide2eng.visitor import daide_visitor
+
+__all__ = ["DAIDEParseError", "DAIDEParser", "daide_parser"]
+
+
+def _literals(rule: str) -> Tuple[str, ...]:
+    return tuple(re.findall(r'"([^"]+)"', rule))
+
+
+_grammar_dict = _create_daide_grammar_dict(160)
+
+_POWERS = _literals(LEVEL_0["power"])
+_POWER_SET = frozenset(_POWERS)
+_UNIT_TYPES = frozenset(_literals(LEVEL_0["unit_type"]))
+_PROV_LAND_SEA = frozenset(_literals(LEVEL_0["prov_land_sea"]))
+_PROV_LANDLOCK = frozenset(_literals(LEVEL_0["prov_landlock"]))
+_PROV_SEA = frozenset(_literals(LEVEL_0["prov_sea"]))
+_PROV_NO_COAST = _PROV_LAND_SEA | _PROV_LANDLOCK | _PROV_SEA
+_PROV_COAST = frozenset(
+    zip(*[iter(_literals(LEVEL_0["prov_coast"]))] * 2)
+)  # (province, coast) pairs
+_SUPPLY_CENTERS = frozenset(_literals(LEVEL_0["supply_center"]))
+_SEASONS = frozenset(_literals(LEVEL_0["season"]))
+_TRY_TOKENS = frozenset(_literals(_grammar_dict["try_tokens"]))
+
+_TOKEN_RE = re.compile(r"[()]|[^\s()]+")
+_DIGITS_RE = re.compile(r"\d+")
+_YEAR_RE = re.compile(r"\d{4}")
+_FLOAT_RE = re.compile(r"[-+]?((\d*\.\d+)|(\d+\.?))([Ee][+-]?\d+)?")
+
+# result of a rule: the built value and the token index after the match, or None
+_Match = Optional[Tuple[Any, int]]
+
+
+class DAIDEParseError(ParseError):
+    """Raised when the native parser cannot parse a DAIDE string."""
+
+    def __init__(self, text: str, pos: int = -1, expected: str = "") -> None:
+        super().__init__(text, pos)
+        self.expected = expected
+
+    def __str__(self) -> str:
+        return "Expected %s at '%s' (line %s, column %s)." % (
+            self.expected or "end of input",
+            self.text[self.pos : self.pos + 20],
+            self.line(),
+            self.column(),
+        )
+
+
+class _ParseState:
+    """Token stream and rule methods for parsing a single string."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.words: List[str] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        for match in _TOKEN_RE.finditer(text):
+            # interned, so powers, provinces etc. kept in keyword objects are
+            # shared with the grammar literals instead of copied per message
+            self.words.append(sys.intern(match.group()))
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+        self.n_tokens = len(self.words)
+        # sentinels so lookahead past the end fails without bounds checks
+        for _ in range(4):
+            self.words.append("")
+            self.starts.append(len(text))
+            self.ends.append(len(text))
+
+        # furthest token a rule failed at, reported in DAIDEParseError
+        self.error_pos = 0
+        self.error_expected = ""
+
+        self.press_message_rules: Dict[str, Callable[[int], _Match]] = {
+            "PRP": self.prp,
+            "CCL": self.ccl,
+            "FCT": self.fct,
+            "TRY": self.try_,
+            "FRM": self.frm,
+            "THK": self.thk,
+            "INS": self.ins,
+            "QRY": self.qry,
+            "SUG": self.sug,
+            "WHT": self.wht,
+            "HOW": self.how,
+            "EXP": self.exp,
+            "IFF": self.iff,
+        }
+        self.reply_rules: Dict[str, Callable[[int], _Match]] = {
+            "YES": self.yes,
+            "REJ": self.rej,
+            "BWX": self.bwx,
+            "HUH": self.huh,
+            "FCT": self.fct,
+            "THK": self.thk,
+            "IDK": self.idk,
+            "WHY": self.why,
+            "POB": self.pob,
+            "HPY": self.hpy,
+            "UHY": self.uhy,
+            "ANG": self.ang,
+        }
+        self.arrangement_rules: Dict[str, Callable[[int], _Match]] = {
+            "PCE": self.pce,
+            "ALY": self.aly_vss,
+            "DRW": self.drw,
+            "SLO": self.slo,
+            "NOT": self.not_,
+            "NAR": self.nar,
+            "XDO": self.xdo,
+            "DMZ": self.dmz,
+            "AND": self.and_,
+            "ORR": self.orr,
+            "SCD": self.scd,
+            "OCC": self.occ,
+            "CHO": self.cho,
+            "FOR": self.for_,
+            "XOY": self.xoy,
+            "YDO": self.ydo,
+            "SND": self.snd,
+            "FWD": self.fwd,
+            "BCC": self.bcc,
+            "ROF": self.rof,
+            "ULB": self.ulb,
+            "UUB": self.uub,
+        }
+        self.sub_arrangement_rules = dict(self.arrangement_rules)
+        del self.sub_arrangement_rules["ROF"]
+        self.sub_arrangement_rules["("] = self.mto
+
+    def parse(self, string_type: str) -> Any:
+        if not self.n_tokens or self.starts[0] != 0:
+            raise DAIDEParseError(self.text, 0, "a DAIDE keyword")
+
+        if string_type == "arrangement":
+            match = self.message(0) or self.arrangement(0)
+        else:
+            match = self.message(0)
+
+        if match is not None:
+            value, pos = match
+            if pos == self.n_tokens and (
+                self.words[pos - 1] == ")" or self.ends[pos - 1] == len(self.text)
+            ):
+                return value
+            self.fail(pos, "end of input")
+
+        if self.error_pos < self.n_tokens:
+            offset = self.starts[self.error_pos]
+        else:
+            offset = len(self.text)
+        raise DAIDEParseError(self.text, offset, self.error_expected)
+
+    def fail(self, pos: int, expected: str) -> None:
+        if pos >= self.error_pos:
+            self.error_pos = pos
+            self.error_expected = expected
+
+    # terminals
+
+    def lit(self, pos: int, literal: str) -> int:
+        if self.words[pos] == literal:
+            return pos + 1
+        self.fail(pos, repr(literal))
+        return -1
+
+    def ws(self, pos: int) -> bool:
+        # `rpar` already consumed any whitespace following a ')'
+        return self.words[pos - 1] != ")" and self.starts[pos] > self.ends[pos - 1]
+
+    def one_of(self, pos: int, literals: frozenset, expected: str) -> Optional[str]:
+        word = self.words[pos]
+        if word in literals:
+            return word
+        self.fail(pos, expected)
+        return None
+
+    def power(self, pos: int) -> Optional[str]:
+        return self.one_of(pos, _POWER_SET, "a power")
+
+    def powers(self, pos: int, minimum: int) -> _Match:
+        """power (ws power)*, requiring at least `minimum` powers"""
+        power = self.power(pos)
+        if power is None:
+            return None
+        powers = [power]
+        pos += 1
+        while self.ws(pos) and self.words[pos] in _POWER_SET:
+            powers.append(self.words[pos])
+            pos += 1
+        if len(powers) < minimum:
+            self.fail(pos, "a power")
+            return None
+        return powers, pos
+
+    def par_power(self, pos: int) -> _Match:
+        """lpar power rpar"""
+        pos = self.lit(pos, "(")
+        if pos < 0:
+            return None
+        power = self.power(pos)
+        if power is None:
+            return None
+        pos = self.lit(pos + 1, ")")
+        if pos < 0:
+            return None
+        return power, pos
+
+    def par_powers(self, pos: int, minimum: int) -> _Match:
+        """lpar power (ws power)* rpar"""
+        pos = self.lit(pos, "(")
+        if pos < 0:
+            return None
+        match = self.powers(pos, minimum)
+        if match is None:
+            return None
+        powers, pos = match
+        pos = self.lit(pos, ")")
+        if pos < 0:
+            return None
+        return powers, pos
+
+    def par(self, pos: int, rule: Callable[[int], _Match]) -> _Match:
+        """lpar rule rpar"""
+        pos = self.lit(pos, "(")
+        if pos < 0:
+            return None
+        match = rule(pos)
+        if match is None:
+            return None
+        value, pos = match
+        pos = self.lit(pos, ")")
+        if pos < 0:
+            return None
+        return value, pos
+
+    def keyword_par(self, pos: int, keyword: str, rule: Callable[[int], _Match]) -> _Match:
+        """keyword lpar rule rpar"""
+        pos = self.lit(pos, keyword)
+        if pos < 0:
+            return None
+        return self.par(pos, rule)
+
+    def par_list(self, pos: int, rule: Callable[[int], _Match]) -> _Match:
+        """(lpar rule rpar)+"""
+        match = self.par(pos, rule)
+        if match is None:
+            return None
+        value, pos = match
+        values = [value]
+        match = self.par(pos, rule)
+        while match is not None:
+            value, pos = match
+            values.append(value)
+            match = self.par(pos, rule)
+        return values, pos
+
+    def dispatch(self, pos: int, rules: Dict[str, Callable[[int], _Match]], expected: str) -> _Match:
+        # every alternative of these rules starts with its own keyword, so only
+        # the rule for the leading token can match
+        rule = rules.get(self.words[pos])
+        if rule is None:
+            self.fail(pos, expected)
+            return None
+        return rule(pos)
+
+    # messages
+
+    def message(self, pos: int) -> _Match:
+        return self.press_message(pos) or self.reply(pos)
+
+    def press_message(self, pos: int) -> _Match:
+        return self.dispatch(pos, self.press_message_rules, "a press message")
+
+    def reply(self, pos: int) -> _Match:
+        return self.dispatch(pos, self.reply_rules, "a reply")
+
+    def arrangement(self, pos: int) -> _Match:
+        return self.dispatch(pos, self.arrangement_rules, "an arrangement")
+
+    def sub_arrangement(self, pos: int) -> _Match:
+        return self.dispatch(pos, self.sub_arrangement_rules, "an arrangement")
+
+    def wrap(self, pos: int, keyword: str, rule: Callable[[int], _Match], cls: type) -> _Match:
+        match = self.keyword_par(pos, keyword, rule)
+        if match is None:
+            return None
+        value, pos = match
+        return cls._trusted(value), pos
+
+    def prp(self, pos: int) -> _Match:
+        return self.wrap(pos, "PRP", self.arrangement, PRP)
+
+    def ccl(self, pos: int) -> _Match:
+        return self.wrap(pos, "CCL", self.press_message, CCL)
+
+    def fct(self, pos: int) -> _Match:
+        return (
+            self.wrap(pos, "FCT", self.arrangement, FCT)
+            or self.wrap(pos, "FCT", self.qry, FCT)
+            or self.wrap(pos, "FCT", self.not_, FCT)
+        )
+
+    def thk(self, pos: int) -> _Match:
+        return (
+            self.wrap(pos, "THK", self.arrangement, THK)
+            or self.wrap(pos, "THK", self.qry, THK)
+            or self.wrap(pos, "THK", self.not_, THK)
+        )
+
+    def try_(self, pos: int) -> _Match:
+        pos = self.lit(pos, "TRY")
+        if pos < 0:
+            return None
+        pos = self.lit(pos, "(")
+        if pos < 0:
+            return None
+        token = self.one_of(pos, _TRY_TOKENS, "a try token")
+        if token is None:
+            return None
+        try_tokens = [token]
+        pos += 1
+        while self.ws(pos) and self.words[pos] in _TRY_TOKENS:
+            try_tokens.append(self.words[pos])
+            pos += 1
+        pos = self.lit(pos, ")")
+        if pos < 0:
+            return None
+        return TRY._from_parsed(try_tokens), pos
+
+    def ins(self, pos: int) -> _Match:
+        return self.wrap(pos, "INS", self.arrangement, INS)
+
+    def qry(self, pos: int) -> _Match:
+        return self.wrap(pos, "QRY", self.arrangement, QRY)
+
+    def sug(self, pos: int) -> _Match:
+        return self.wrap(pos, "SUG", self.arrangement, SUG)
+
+    def wht(self, pos: int) -> _Match:
+        return self.wrap(pos, "WHT", self.unit, WHT)
+
+    def how(self, pos: int) -> _Match:
+        return self.wrap(pos, "HOW", self.province, HOW) or self.wrap(
+            pos, "HOW", self.power_match, HOW
+        )
+
+    def exp(self, pos: int) -> _Match:
+        match = self.keyword_par(pos, "EXP", self.turn)
+        if match is None:
+            return None
+        turn, pos = match
+        match = self.par(pos, self.message)
+        if match is None:
+            return None
+        message, pos = match
+        return EXP(turn, message), pos
+
+    def iff(self, pos: int) -> _Match:
+        match = self.keyword_par(pos, "IFF", self.arrangement)
+        if match is None:
+            return None
+        arrangement, pos = match
+        match = self.keyword_par(pos, "THN", self.press_message)
+        if match is None:
+            return None
+        press_message, pos = match
+        match = self.keyword_par(pos, "ELS", self.press_message)
+        if match is None:
+            return IFF._trusted(arrangement, press_message, None), pos
+        els_press_message, pos = match
+        return IFF._trusted(arrangement, press_message, els_press_message), pos
+
+    def frm(self, pos: int) -> _Match:
+        pos = self.lit(pos, "FRM")
+        if pos < 0:
+            return None
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        frm_power, pos = match
+        match = self.par_powers(pos, 1)
+        if match is None:
+            return None
+        recv_powers, pos = match
+        match = self.par(pos, self.message)
+        if match is None:
+            return None
+        message, pos = match
+        return FRM._from_parsed(frm_power, recv_powers, message), pos
+
+    def yes(self, pos: int) -> _Match:
+        return self.wrap(pos, "YES", self.press_message, YES)
+
+    def rej(self, pos: int) -> _Match:
+        return self.wrap(pos, "REJ", self.press_message, REJ)
+
+    def bwx(self, pos: int) -> _Match:
+        return self.wrap(pos, "BWX", self.press_message, BWX)
+
+    def huh(self, pos: int) -> _Match:
+        return self.wrap(pos, "HUH", self.press_message, HUH)
+
+    def idk_param(self, pos: int) -> _Match:
+        return (
+            self.qry(pos)
+            or self.exp(pos)
+            or self.wht(pos)
+            or self.prp(pos)
+            or self.ins(pos)
+            or self.sug(pos)
+        )
+
+    def idk(self, pos: int) -> _Match:
+        return self.wrap(pos, "IDK", self.idk_param, IDK)
+
+    def why_param(self, pos: int) -> _Match:
+        return self.fct(pos) or self.thk(pos) or self.prp(pos) or self.ins(pos)
+
+    def why(self, pos: int) -> _Match:
+        return self.wrap(pos, "WHY", self.why_param, WHY)
+
+    def pob(self, pos: int) -> _Match:
+        return self.wrap(pos, "POB", self.why, POB)
+
+    def uhy(self, pos: int) -> _Match:
+        return self.wrap(pos, "UHY", self.press_message, UHY)
+
+    def hpy(self, pos: int) -> _Match:
+        return self.wrap(pos, "HPY", self.press_message, HPY)
+
+    def ang(self, pos: int) -> _Match:
+        return self.wrap(pos, "ANG", self.press_message, ANG)
+
+    # arrangements
+
+    def pce(self, pos: int) -> _Match:
+        pos = self.lit(pos, "PCE")
+        if pos < 0:
+            return None
+        match = self.par_powers(pos, 2)
+        if match is None:
+            return None
+        powers, pos = match
+        return PCE(*powers), pos
+
+    def aly_vss(self, pos: int) -> _Match:
+        start = self.lit(pos, "ALY")
+        if start < 0:
+            return None
+        match = self.par_powers(start, 2)
+        if match is None:
+            return None
+        aly_powers, pos = match
+        if self.words[pos] == "VSS":
+            vss_match = self.par_powers(pos + 1, 1)
+            if vss_match is not None:
+                vss_powers, vss_pos = vss_match
+                return ALYVSS(aly_powers, vss_powers), vss_pos
+        else:
+            self.fail(pos, "'VSS'")
+        return ALYONLY(*aly_powers), pos
+
+    def drw(self, pos: int) -> _Match:
+        pos = self.lit(pos, "DRW")
+        if pos < 0:
+            return None
+        match = self.par_powers(pos, 2)
+        if match is None:
+            return DRW(), pos
+        powers, pos = match
+        return DRW(*powers), pos
+
+    def slo(self, pos: int) -> _Match:
+        return self.wrap(pos, "SLO", self.power_match, SLO)
+
+    def not_(self, pos: int) -> _Match:
+        return self.wrap(pos, "NOT", self.arrangement, NOT) or self.wrap(
+            pos, "NOT", self.qry, NOT
+        )
+
+    def nar(self, pos: int) -> _Match:
+        return self.wrap(pos, "NAR", self.arrangement, NAR)
+
+    def xdo(self, pos: int) -> _Match:
+        return self.wrap(pos, "XDO", self.order, XDO)
+
+    def dmz(self, pos: int) -> _Match:
+        pos = self.lit(pos, "DMZ")
+        if pos < 0:
+            return None
+        match = self.par_powers(pos, 1)
+        if match is None:
+            return None
+        powers, pos = match
+        pos = self.lit(pos, "(")
+        if pos < 0:
+            return None
+        match = self.province(pos)
+        if match is None:
+            return None
+        province, pos = match
+        provinces = [province]
+        while self.ws(pos):
+            match = self.province(pos)
+            if match is None:
+                break
+            province, pos = match
+            provinces.append(province)
+        pos = self.lit(pos, ")")
+        if pos < 0:
+            return None
+        return DMZ._from_parsed(powers, provinces), pos
+
+    def multipart(self, pos: int, keyword: str, cls: type) -> _Match:
+        pos = self.lit(pos, keyword)
+        if pos < 0:
+            return None
+        match = self.par(pos, self.sub_arrangement)
+        if match is None:
+            return None
+        arrangement, pos = match
+        match = self.par_list(pos, self.sub_arrangement)
+        if match is None:
+            return None
+        arrangements, pos = match
+        return cls(arrangement, *arrangements), pos
+
+    def and_(self, pos: int) -> _Match:
+        return self.multipart(pos, "AND", AND)
+
+    def orr(self, pos: int) -> _Match:
+        return self.multipart(pos, "ORR", ORR)
+
+    def power_and_supply_centers(self, pos: int) -> _Match:
+        """power ws supply_center (ws supply_center)*"""
+        power = self.power(pos)
+        if power is None:
+            return None
+        pos += 1
+        if not self.ws(pos) or self.one_of(pos, _SUPPLY_CENTERS, "a supply center") is None:
+            return None
+        supply_centers = [get_location(self.words[pos])]
+        pos += 1
+        while self.ws(pos) and self.words[pos] in _SUPPLY_CENTERS:
+            supply_centers.append(get_location(self.words[pos]))
+            pos += 1
+        return PowerAndSupplyCenters._from_parsed(power, supply_centers), pos
+
+    def scd(self, pos: int) -> _Match:
+        pos = self.lit(pos, "SCD")
+        if pos < 0:
+            return None
+        match = self.par_list(pos, self.power_and_supply_centers)
+        if match is None:
+            return None
+        power_and_supply_centers, pos = match
+        return SCD._from_parsed(power_and_supply_centers), pos
+
+    def occ(self, pos: int) -> _Match:
+        pos = self.lit(pos, "OCC")
+        if pos < 0:
+            return None
+        match = self.par_list(pos, self.unit)
+        if match is None:
+            return None
+        units, pos = match
+        return OCC._from_parsed(units), pos
+
+    def cho_range(self, pos: int) -> _Match:
+        """~"\\d+ \\d+" """
+        words, starts, ends = self.words, self.starts, self.ends
+        if (
+            _DIGITS_RE.fullmatch(words[pos])
+            and _DIGITS_RE.fullmatch(words[pos + 1])
+            and starts[pos + 1] == ends[pos] + 1
+            and self.text[ends[pos]] == " "
+        ):
+            return (int(words[pos]), int(words[pos + 1])), pos + 2
+        self.fail(pos, "a range")
+        return None
+
+    def cho(self, pos: int) -> _Match:
+        match = self.keyword_par(pos, "CHO", self.cho_range)
+        if match is None:
+            return None
+        (minimum, maximum), pos = match
+        match = self.par_list(pos, self.arrangement)
+        if match is None:
+            return None
+        arrangements, pos = match
+        return CHO._from_parsed(minimum, maximum, arrangements), pos
+
+    def turn_range(self, pos: int) -> _Match:
+        """lpar turn rpar lpar turn rpar"""
+        match = self.par(pos, self.turn)
+        if match is None:
+            return None
+        start_turn, pos = match
+        match = self.par(pos, self.turn)
+        if match is None:
+            return None
+        end_turn, pos = match
+        return (start_turn, end_turn), pos
+
+    def for_(self, pos: int) -> _Match:
+        match = self.keyword_par(pos, "FOR", self.turn)
+        if match is not None:
+            start_turn, for_pos = match
+            end_turn = None
+        else:
+            match = self.keyword_par(pos, "FOR", self.turn_range)
+            if match is None:
+                return None
+            (start_turn, end_turn), for_pos = match
+        match = self.par(for_pos, self.arrangement)
+        if match is None:
+            return None
+        arrangement, pos = match
+        return FOR._trusted(start_turn, end_turn, arrangement), pos
+
+    def xoy(self, pos: int) -> _Match:
+        pos = self.lit(pos, "XOY")
+        if pos < 0:
+            return None
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power_x, pos = match
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power_y, pos = match
+        return XOY._trusted(power_x, power_y), pos
+
+    def ydo(self, pos: int) -> _Match:
+        pos = self.lit(pos, "YDO")
+        if pos < 0:
+            return None
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power, pos = match
+        match = self.par_list(pos, self.unit)
+        if match is None:
+            return None
+        units, pos = match
+        return YDO._from_parsed(power, units), pos
+
+    def snd(self, pos: int) -> _Match:
+        pos = self.lit(pos, "SND")
+        if pos < 0:
+            return None
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power, pos = match
+        match = self.par_powers(pos, 1)
+        if match is None:
+            return None
+        recv_powers, pos = match
+        match = self.par(pos, self.message)
+        if match is None:
+            return None
+        message, pos = match
+        return SND._from_parsed(power, recv_powers, message), pos
+
+    def fwd(self, pos: int) -> _Match:
+        pos = self.lit(pos, "FWD")
+        if pos < 0:
+            return None
+        match = self.par_powers(pos, 1)
+        if match is None:
+            return None
+        powers, pos = match
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power_1, pos = match
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power_2, pos = match
+        return FWD._from_parsed(powers, power_1, power_2), pos
+
+    def bcc(self, pos: int) -> _Match:
+        pos = self.lit(pos, "BCC")
+        if pos < 0:
+            return None
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power_1, pos = match
+        match = self.par_powers(pos, 1)
+        if match is None:
+            return None
+        powers, pos = match
+        match = self.par_power(pos)
+        if match is None:
+            return None
+        power_2, pos = match
+        return BCC._from_parsed(power_1, powers, power_2), pos
+
+    def rof(self, pos: int) -> _Match:
+        pos = self.lit(pos, "ROF")
+        if pos < 0:
+            return None
+        return ROF._trusted(), pos
+
+    def power_float(self, pos: int) -> _Match:
+        """power float, where float = ws* ~"[-+]?..." """
+        word = self.words[pos]
+        if word in _POWER_SET:
+            if _FLOAT_RE.fullmatch(self.words[pos + 1]):
+                return (word, float(self.words[pos + 1])), pos + 2
+            self.fail(pos + 1, "a float")
+            return None
+        for power in _POWERS:
+            if word.startswith(power):
+                if _FLOAT_RE.fullmatch(word, len(power)):
+                    return (power, float(word[len(power) :])), pos + 1
+                break
+        self.fail(pos, "a power")
+        return None
+
+    def utility(self, pos: int, keyword: str, cls: type) -> _Match:
+        match = self.keyword_par(pos, keyword, self.power_float)
+        if match is None:
+            return None
+        (power, float_val), pos = match
+        return cls._trusted(power, float_val), pos
+
+    def ulb(self, pos: int) -> _Match:
+        return self.utility(pos, "ULB", ULB)
+
+    def uub(self, pos: int) -> _Match:
+        return self.utility(pos, "UUB", UUB)
+
+    # orders
+
+    def order(self, pos: int) -> _Match:
+        # every order but wve starts with `lpar unit rpar` and then differs by
+        # its keyword, so the unit is only parsed once
+        match = self.par(pos, self.unit)
+        if match is None:
+            return self.wve(pos)
+        unit, unit_pos = match
+        keyword = self.words[unit_pos]
+        after = unit_pos + 1
+        if keyword == "HLD":
+            return HLD._trusted(unit), after
+        if keyword == "MTO":
+            match = self.ws_province(after)
+            if match is not None:
+                province, after = match
+                return MTO._trusted(unit, province), after
+        elif keyword == "SUP":
+            match = self.par(after, self.unit)
+            if match is not None:
+                supported_unit, after = match
+                if self.words[after] == "MTO" and self.ws(after + 1):
+                    province = self.words[after + 1]
+                    if province in _PROV_NO_COAST:
+                        return SUP._trusted(unit, supported_unit, get_location(province)), after + 2
+                return SUP._trusted(unit, supported_unit, None), after
+        elif keyword == "CVY":
+            match = self.par(after, self.unit)
+            if match is not None:
+                convoyed_unit, after = match
+                after = self.lit(after, "CTO")
+                if after >= 0:
+                    match = self.ws_province(after)
+                    if match is not None:
+                        province, after = match
+                        return CVY._trusted(unit, convoyed_unit, province), after
+        elif keyword == "CTO":
+            match = self.move_by_cvy(unit, after)
+            if match is not None:
+                return match
+        elif keyword == "RTO":
+            match = self.ws_province(after)
+            if match is not None:
+                province, after = match
+                return RTO._trusted(unit, province), after
+        elif keyword == "DSB":
+            return DSB._trusted(unit), after
+        elif keyword == "BLD":
+            return BLD._trusted(unit), after
+        elif keyword == "REM":
+            return REM._trusted(unit), after
+        else:
+            self.fail(unit_pos, "an order")
+        return self.wve(pos)
+
+    def mto(self, pos: int) -> _Match:
+        match = self.par(pos, self.unit)
+        if match is None:
+            return None
+        unit, pos = match
+        pos = self.lit(pos, "MTO")
+        if pos < 0:
+            return None
+        match = self.ws_province(pos)
+        if match is None:
+            return None
+        province, pos = match
+        return MTO._trusted(unit, province), pos
+
+    def move_by_cvy(self, unit: Unit, pos: int) -> _Match:
+        match = self.ws_province(pos)
+        if match is None:
+            return None
+        province, pos = match
+        if not self.ws(pos):
+            self.fail(pos, "whitespace")
+            return None
+        pos = self.lit(pos, "VIA")
+        if pos < 0:
+            return None
+        pos = self.lit(pos, "(")
+        if pos < 0:
+            return None
+        province_sea = self.one_of(pos, _PROV_SEA, "a sea province")
+        if province_sea is None:
+            return None
+        province_seas = [province_sea]
+        pos += 1
+        while self.ws(pos) and self.words[pos] in _PROV_SEA:
+            province_seas.append(self.words[pos])
+            pos += 1
+        pos = self.lit(pos, ")")
+        if pos < 0:
+            return None
+        return MoveByCVY._trusted(unit, province, tuple(province_seas)), pos
+
+    def wve(self, pos: int) -> _Match:
+        power = self.power(pos)
+        if power is None or not self.ws(pos + 1):
+            return None
+        pos = self.lit(pos + 1, "WVE")
+        if pos < 0:
+            return None
+        return WVE._trusted(power), pos
+
+    # units and locations
+
+    def power_match(self, pos: int) -> _Match:
+        power = self.power(pos)
+        if power is None:
+            return None
+        return power, pos + 1
+
+    def unit(self, pos: int) -> _Match:
+        power = self.power(pos)
+        if power is None or not self.ws(pos + 1):
+            return None
+        unit_type = self.one_of(pos + 1, _UNIT_TYPES, "a unit type")
+        if unit_type is None:
+            return None
+        match = self.ws_province(pos + 2)
+        if match is None:
+            return None
+        location, pos = match
+        return get_unit(power, unit_type, location), pos
+
+    def ws_province(self, pos: int) -> _Match:
+        """ws province"""
+        if not self.ws(pos):
+            self.fail(pos, "whitespace")
+            return None
+        return self.province(pos)
+
+    def province(self, pos: int) -> _Match:
+        word = self.words[pos]
+        if word == "(":
+            # prov_coast
+            province, coast = self.words[pos + 1], self.words[pos + 2]
+            if (province, coast) in _PROV_COAST and self.words[pos + 3] == ")":
+                return get_location(province, coast), pos + 4
+        elif word in _PROV_NO_COAST:
+            return get_location(word), pos + 1
+        self.fail(pos, "a province")
+        return None
+
+    def turn(self, pos: int) -> _Match:
+        season = self.one_of(pos, _SEASONS, "a season")
+        if season is None or not self.ws(pos + 1):
+            return None
+        year = self.words[pos + 1]
+        if not _YEAR_RE.fullmatch(year):
+            self.fail(pos + 1, "a year")
+            return None
+        return Turn._trusted(season, int(year)), pos + 2
+
+
+class DAIDEParser:
+    """Parse level-160 DAIDE strings straight into keyword objects.
+
+    Produces the same objects as `daide_visitor.visit(grammar.parse(daide))`
+    for a level-160 grammar, and raises `DAIDEParseError` (a subclass of
+    parsimonious' `ParseError`) for strings the grammar rejects.
+
+    Keyword objects are built while parsing, before the whole string is known
+    to be valid. A string that is malformed after a keyword with invalid
+    arguments, e.g. 'PRP (PCE (ENG ENG)) (DRW)', therefore raises the
+    constructor's `ValueError` where the grammar would raise a `ParseError`.
+    Pass `grammar_errors=True` to re-parse such strings with the grammar and
+    visitor, so that errors are reported exactly as on the parsimonious path.
+    This compiles the full grammar on first use.
+
+    Args:
+        grammar_errors (bool, optional): re-parse strings whose keyword
+            arguments are rejected with the grammar. Defaults to False.
+    """
+
+    def __init__(self, grammar_errors: bool = False):
+        self.grammar_errors = grammar_errors
+
+    def parse(
+        self,
+        daide: str,
+        string_type: Literal["message", "arrangement"] = "message",
+    ) -> AnyDAIDEToken:
+        """Parse a DAIDE string.
+
+        Args:
+            daide (str): DAIDE string, e.g. 'PRP (PCE (ENG TUR))'
+            string_type (Literal["message", "arrangement"], optional):
+                if 'message' is passed (default), only full DAIDE messages are
+                recognized. If 'arrangement' is passed, arrangements are too.
+
+        Returns:
+            AnyDAIDEToken: the parsed keyword object
+        """
+        try:
+            return _ParseState(daide).parse(string_type)
+        except ValueError:
+            if not self.grammar_errors:
+                raise
+            grammar = get_daide_grammar(level=160, string_type=string_type)
+            return daide_visitor.visit(grammar.parse(daide))
+
+
+daide_parser = DAIDEParser()
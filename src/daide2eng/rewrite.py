@@ -0,0 +1,113 @@
+"""
+Single-pass, token-aware string rewriting.
+
+A table of `RewriteRule`s is compiled into one regular expression, so a string
+is scanned once however many rules there are. Rules match whole DAIDE tokens
+(runs of characters other than whitespace and parentheses), never parts of a
+longer token, and can require a particular token right before the one they
+rewrite::
+
+    rewrite = compile_rewrite_rules([
+        RewriteRule("BOT", "GOB"),
+        RewriteRule("ENG", "ECH", after="FLT"),
+        RewriteRule("/SC", " SCS", suffix=True),
+    ])
+    rewrite("(ENG FLT ENG) MTO BOT")  # '(ENG FLT ECH) MTO GOB'
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+__all__ = ["RewriteRule", "compile_rewrite_rules"]
+
+# token boundaries are whitespace and parentheses, and '/' before a coast
+# suffix. The checks before a token are written as lookbehinds after it, so the
+# compiled regex starts with literals and the regex engine can skip ahead to
+# their first characters instead of trying every rule at every position.
+def _starts_token(literal: str) -> str:
+    return f"(?<![^\\s()]{literal})"
+
+
+def _follows_token(literal: str) -> str:
+    return f"(?<=[^\\s()]{literal})"
+
+
+_TOKEN_END = r"(?![^\s()/])"
+_BOUNDARY_RE = re.compile(r"[\s()]")
+_SUFFIX_END = r"(?![^\s()])"
+
+
+class RewriteRule(NamedTuple):
+    """Replace one token.
+
+    Args:
+        token (str): token to replace
+        replacement (str): text to put in its place
+        after (Optional[str]): only replace `token` when it directly follows this
+            token, separated by whitespace only. The preceding token is kept.
+            Rules with `after` take precedence over rules without.
+        suffix (bool): match `token` at the end of a longer token, e.g. the coast
+            in 'STP/SC', instead of as a whole token
+    """
+
+    token: str
+    replacement: str
+    after: Optional[str] = None
+    suffix: bool = False
+
+
+def compile_rewrite_rules(rules: Iterable[RewriteRule]) -> Callable[[str], str]:
+    """Compile rewrite rules into a function applying all of them in one pass.
+
+    Args:
+        rules (Iterable[RewriteRule]): rules to apply. Each token is rewritten by
+            at most one rule, and replacements are not rewritten again. If
+            several rules match the same token (in the same context), the first
+            one wins.
+
+    Returns:
+        Callable[[str], str]: function rewriting a string
+    """
+    tokens: Dict[str, str] = {}
+    contexts: Dict[Tuple[str, str], str] = {}
+    suffixes: Dict[str, str] = {}
+    context_patterns: List[str] = []
+    patterns: List[str] = []
+    for rule in rules:
+        token = re.escape(rule.token)
+        if rule.suffix:
+            suffixes.setdefault(rule.token, rule.replacement)
+            patterns.append(f"{token}{_follows_token(token)}{_SUFFIX_END}")
+        elif rule.after is not None:
+            contexts.setdefault((rule.after, rule.token), rule.replacement)
+            after = re.escape(rule.after)
+            context_patterns.append(
+                f"{after}{_starts_token(after)}\\s+{token}{_TOKEN_END}"
+            )
+        else:
+            tokens.setdefault(rule.token, rule.replacement)
+            patterns.append(f"{token}{_starts_token(token)}{_TOKEN_END}")
+
+    if not patterns and not context_patterns:
+        return lambda text: text
+
+    # no capture groups: they would stop the regex engine from skipping ahead,
+    # so the rule is looked up from the matched text instead
+    regex = re.compile("|".join(context_patterns + patterns))
+
+    def replace(match: "re.Match[str]") -> str:
+        text = match.group()
+        start = match.start()
+        if start and not _BOUNDARY_RE.match(match.string, start - 1):
+            return suffixes[text]
+        replacement = tokens.get(text)
+        if replacement is not None:
+            return replacement
+        after = text.split(None, 1)[0]
+        token = text.rsplit(None, 1)[1]
+        return text[: len(text) - len(token)] + contexts[after, token]
+
+    def rewrite(text: str) -> str:
+        return regex.sub(replace, text)
+
+    return rewrite
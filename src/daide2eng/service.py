@@ -0,0 +1,199 @@
+"""
+asyncio front end for `gen_English`.
+
+Parsing a message holds the CPU for the whole parse, so calling `gen_English`
+from a coroutine stalls every other task on the event loop. `TranslationService`
+runs translations on a bounded executor instead:
+
+- identical requests that are in flight at the same time share one translation,
+- at most `max_pending` translations are queued or running; further requests
+  wait for a free slot (or fail with `TranslationQueueFull` when
+  `block=False`),
+- each request can have a timeout, and cancelling or timing out one request
+  never cancels the translation other requests are waiting on.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from daide2eng.utils import PARSERS, gen_English
+
+__all__ = ["TranslationQueueFull", "TranslationService", "translate"]
+
+_Key = Tuple[str, str, str, bool, Optional[str]]
+
+
+class TranslationQueueFull(Exception):
+    """Raised by a non-blocking request when `max_pending` translations are pending."""
+
+
+class TranslationService:
+    """Translate DAIDE to English from asyncio code without blocking the event loop.
+
+    Args:
+        max_workers (int): number of executor threads used when `executor` is not given
+        max_pending (int): maximum number of distinct translations queued or running
+        timeout (Optional[float]): default per-request timeout in seconds, None for no timeout
+        make_natural (bool): passed on to `gen_English`
+        parser (Optional[str]): parser engine, one of `utils.PARSERS`
+        executor (Optional[Executor]): executor to run translations on, e.g. a
+            `ProcessPoolExecutor`. It is not shut down by `close`.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_pending: int = 256,
+        timeout: Optional[float] = None,
+        make_natural: bool = True,
+        parser: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        if parser is not None and parser not in PARSERS:
+            raise ValueError(f"unknown parser {parser!r}, expected one of {PARSERS}")
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.make_natural = make_natural
+        self.parser = parser
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="daide2eng"
+        )
+        self._in_flight: Dict[_Key, "asyncio.Future[str]"] = {}
+        # created on first use so it binds to the running loop on Python < 3.10
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of distinct translations queued or running."""
+        return len(self._in_flight)
+
+    async def translate(
+        self,
+        daide: str,
+        sender: str = "I",
+        recipient: str = "You",
+        timeout: Optional[float] = None,
+        block: bool = True,
+    ) -> str:
+        """Translate one DAIDE message, see `utils.gen_English`.
+
+        Args:
+            daide (str): DAIDE string
+            sender (str): power sending the message
+            recipient (str): power receiving the message
+            timeout (Optional[float]): seconds to wait, including time spent
+                waiting for a free slot. Defaults to the service timeout.
+            block (bool): wait for a free slot when the queue is full instead of
+                raising `TranslationQueueFull`
+
+        Returns:
+            str: the English translation, or an "ERROR ..." string as returned by `gen_English`
+        """
+        if self._closed:
+            raise RuntimeError("TranslationService is closed")
+        if timeout is None:
+            timeout = self.timeout
+
+        key = (daide, sender, recipient, self.make_natural, self.parser)
+        future = self._in_flight.get(key)
+        if timeout is None:
+            if future is None:
+                future = await self._submit(key, block)
+            # shield so one caller giving up does not cancel the shared translation
+            return await asyncio.shield(future)
+
+        # one deadline covers both waiting for a slot and the translation
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if future is None:
+            future = await asyncio.wait_for(self._submit(key, block), timeout)
+        return await asyncio.wait_for(asyncio.shield(future), deadline - loop.time())
+
+    async def _submit(self, key: _Key, block: bool) -> "asyncio.Future[str]":
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._in_flight:
+                raise RuntimeError("TranslationService is in use by another event loop")
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._loop = loop
+        slots = self._slots
+        assert slots is not None
+        if slots.locked() and not block:
+            raise TranslationQueueFull(
+                f"{self.max_pending} translations are already pending"
+            )
+        await slots.acquire()
+
+        # an identical request may have been submitted while this one waited
+        future = self._in_flight.get(key)
+        if future is not None:
+            slots.release()
+            return future
+
+        daide, sender, recipient, make_natural, parser = key
+        try:
+            future = loop.run_in_executor(
+                self._executor,
+                functools.partial(
+                    gen_English, daide, sender, recipient, make_natural, parser
+                ),
+            )
+        except BaseException:
+            slots.release()
+            raise
+        self._in_flight[key] = future
+
+        def _done(_: "asyncio.Future[str]") -> None:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            slots.release()
+
+        future.add_done_callback(_done)
+        return future
+
+    async def close(self) -> None:
+        """Wait for pending translations and shut down the executor if the service created it."""
+        self._closed = True
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "TranslationService":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+
+_default_service: Optional[TranslationService] = None
+
+
+async def translate(
+    daide: str,
+    sender: str = "I",
+    recipient: str = "You",
+    timeout: Optional[float] = None,
+) -> str:
+    """Translate one DAIDE message on a shared, lazily created `TranslationService`.
+
+    Args:
+        daide (str): DAIDE string
+        sender (str): power sending the message
+        recipient (str): power receiving the message
+        timeout (Optional[float]): seconds to wait for the translation
+
+    Returns:
+        str: the English translation, or an "ERROR ..." string as returned by `gen_English`
+    """
+    global _default_service
+    if _default_service is None:
+        _default_service = TranslationService()
+    return await _default_service.translate(daide, sender, recipient, timeout)
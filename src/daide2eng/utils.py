@@ -1,41 +1,321 @@
-from daide2eng import create_daide_grammar
+from daide2eng import get_daide_grammar
 from daide2eng import daide_visitor
 from daide2eng.keywords.keyword_utils import power_dict, power_list
-from typing import List
+from daide2eng.cache import CacheInfo, LRUCache
+from daide2eng.instrumentation import TranslationTiming
+from daide2eng.parser import daide_parser
+from daide2eng.rewrite import RewriteRule, compile_rewrite_rules
+from daide2eng.validator import _OWN_LIMIT, MAX_DEPTH, daide_validator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice, repeat
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import parsimonious
+import re
 
-# create daide grammar
-grammar = create_daide_grammar(
-    level=160,
-)
+# level of the daide grammar used for translation. the grammar itself is
+# compiled lazily on first use by get_daide_grammar.
+GRAMMAR_LEVEL = 160
 
-def pre_process(daide: str) -> str:
+
+def __getattr__(name: str):
+    # `grammar` used to be built at import time; keep it available lazily
+    if name == "grammar":
+        return get_daide_grammar(level=GRAMMAR_LEVEL)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# parser engines understood by parse_daide:
+# - 'parsimonious': PEG parse followed by DAIDEVisitor
+# - 'native': single-pass recursive-descent parser in daide2eng.parser
+PARSERS = ('parsimonious', 'native')
+_default_parser = 'parsimonious'
+
+
+def set_default_parser(parser: str) -> None:
     '''
-        change the dipnet syntax to daidepp syntax
+    Set the parser engine used when none is passed to gen_English/parse_daide.
+
+    :param parser: one of PARSERS, e.g. 'native'
+    '''
+    global _default_parser
+    if parser not in PARSERS:
+        raise ValueError(f"unknown parser {parser!r}, expected one of {PARSERS}")
+    _default_parser = parser
+
+
+def set_max_depth(max_depth: Optional[int] = MAX_DEPTH) -> None:
     '''
-    # substitutions
-    # case CTO province VIA (sea_province sea_province ...)
+    Set how deeply parentheses may nest in a message. Deeper messages are
+    rejected with a DAIDENestingError before they are parsed. Both parsers
+    recurse per nesting level, so raising the limit far beyond the default
+    may also need sys.setrecursionlimit. The parse and render caches are
+    cleared, since they may hold messages that the new limit rejects.
+
+    :param max_depth: maximum nesting depth, or None for no limit
+    '''
+    if max_depth is not None and max_depth < 1:
+        raise ValueError("max_depth must be at least 1")
+    daide_validator.max_depth = max_depth
+    parse_cache = _parse_cache
+    if parse_cache is not None:
+        parse_cache.clear()
+    render_cache = _render_cache
+    if render_cache is not None:
+        render_cache.clear()
+
 
-    # case RTO province
+# opt-in cache of parsed keyword trees, see enable_parse_cache
+_parse_cache: Optional[LRUCache] = None
+# opt-in cache of rendered, speaker-independent sentences, see enable_render_cache
+_render_cache: Optional[LRUCache] = None
 
-    # case DMZ (power power ...) (province province ...)
+# opt-in per-stage timing callback, see set_timing_hook
+_timing_hook: Optional[Callable[[TranslationTiming], None]] = None
 
-    # case HOW (province)
+_WHITESPACE_RE = re.compile(r'\s+')
+# whitespace that is not a lone space, i.e. what _normalize_whitespace changes
+_UNNORMALIZED_RE = re.compile(r'[^\S ]|  ')
 
-    # since 'ENG' is used both as a power and a location, we need to substitute
-    # the location with 'ECH'.
-    # and replace coast with SCS, NCS, ECS, WCS
-    return daide.replace('BOT', 'GOB') \
-                .replace('FLT ENG', 'FLT ECH') \
-                .replace('AMY ENG', 'AMY ECH') \
-                .replace('CTO LON', 'CTO ECH') \
-                .replace('/SC', ' SCS') \
-                .replace('/NC', ' NCS') \
-                .replace('/EC', ' ECS') \
-                .replace('/WC', ' WCS')
+
+def _normalize_whitespace(daide: str) -> str:
+    '''
+    Collapse each run of whitespace into a single space without changing
+    whether the string parses. The only place where the exact whitespace
+    matters is between the two numbers of a CHO range, so runs between two
+    digits are kept as they are.
+    '''
+    def collapse(match):
+        start, end = match.span()
+        if 0 < start and end < len(daide) and daide[start - 1].isdecimal() \
+                and daide[end].isdecimal():
+            return match.group()
+        return ' '
+
+    if _UNNORMALIZED_RE.search(daide) is None:
+        return daide
+    return _WHITESPACE_RE.sub(collapse, daide)
+
+
+def enable_parse_cache(maxsize: int = 1024) -> None:
+    '''
+    Cache parsed keyword trees in a thread-safe LRU cache keyed on the
+    whitespace-normalized, pre-processed DAIDE string. Keyword objects are
+    frozen, so cached trees can be shared between calls. Replaces any
+    existing cache.
+
+    :param maxsize: maximum number of trees kept in the cache
+    '''
+    global _parse_cache
+    _parse_cache = LRUCache(maxsize)
+
+
+def disable_parse_cache() -> None:
+    '''
+    Stop caching parsed keyword trees and drop the cache.
+    '''
+    global _parse_cache
+    _parse_cache = None
 
 
-def gen_English(daide: str, sender="I", recipient="You", make_natural=True) -> str:
+def clear_parse_cache() -> None:
+    '''
+    Remove all cached trees and reset the cache counters.
+    '''
+    if _parse_cache is not None:
+        _parse_cache.clear()
+
+
+def parse_cache_info() -> Optional[CacheInfo]:
+    '''
+    Return hits, misses, evictions and size of the parse cache, or None if
+    the cache is disabled.
+    '''
+    if _parse_cache is None:
+        return None
+    return _parse_cache.info()
+
+
+def enable_render_cache(maxsize: int = 1024) -> None:
+    '''
+    Cache the speaker-independent English rendering of DAIDE strings, i.e.
+    the sentence before post_process applies sender/recipient pronouns.
+    Translating one message for several recipients then parses and renders
+    it only once. Replaces any existing cache.
+
+    :param maxsize: maximum number of sentences kept in the cache
+    '''
+    global _render_cache
+    _render_cache = LRUCache(maxsize)
+
+
+def disable_render_cache() -> None:
+    '''
+    Stop caching rendered sentences and drop the cache.
+    '''
+    global _render_cache
+    _render_cache = None
+
+
+def clear_render_cache() -> None:
+    '''
+    Remove all cached sentences and reset the cache counters.
+    '''
+    if _render_cache is not None:
+        _render_cache.clear()
+
+
+def render_cache_info() -> Optional[CacheInfo]:
+    '''
+    Return hits, misses, evictions and size of the render cache, or None if
+    the cache is disabled.
+    '''
+    if _render_cache is None:
+        return None
+    return _render_cache.info()
+
+
+def set_timing_hook(hook: Optional[Callable[[TranslationTiming], None]]) -> None:
+    '''
+    Call hook with a TranslationTiming after every gen_English call, giving
+    the time spent in each stage (pre_process, validate, parse, visit,
+    render, post_process) and the message size. Pass None to turn timing
+    off again; while it is off gen_English does no timing work at all.
+
+    :param hook: callable taking a TranslationTiming, e.g. an
+        instrumentation.TimingHistogram, or None
+    '''
+    global _timing_hook
+    _timing_hook = hook
+
+
+def render_daide(daide: str, parser: Optional[str] = None, max_depth: Optional[int] = _OWN_LIMIT, timings: Optional[Dict[str, float]] = None) -> str:
+    '''
+    Render a pre-processed DAIDE string as an English sentence that does not
+    depend on sender or recipient, e.g. 'propose peace between ENG and TUR '.
+    If the render cache is enabled, sentences are served from it.
+
+    :param daide: DAIDE string, e.g. 'PRP (PCE (ENG TUR))'
+    :param parser: parser engine, one of PARSERS. Defaults to the engine
+        chosen with set_default_parser.
+    :param max_depth: nesting limit for this message, or None for no limit.
+        Defaults to the limit set with set_max_depth.
+    :param timings: if given, the seconds spent in each stage that runs
+        (validate, parse, visit, render) are stored in it by stage name
+    '''
+    cache = _render_cache
+    if cache is None:
+        return _render_daide(daide, parser, max_depth, timings)
+
+    key = _normalize_whitespace(daide)
+    sentence = cache.get(key)
+    if sentence is None:
+        sentence = _render_daide(daide, parser, max_depth, timings)
+        cache.put(key, sentence)
+    elif max_depth is not _OWN_LIMIT:
+        # cached sentences only passed the limit set with set_max_depth
+        daide_validator.check_depth(daide, max_depth)
+    return sentence
+
+
+def _render_daide(daide: str, parser: Optional[str], max_depth: Optional[int], timings: Optional[Dict[str, float]]) -> str:
+    tree = parse_daide(daide, parser, max_depth, timings)
+    if timings is None:
+        return str(tree)
+    start = perf_counter()
+    sentence = str(tree)
+    timings['render'] = perf_counter() - start
+    return sentence
+
+
+def parse_daide(daide: str, parser: Optional[str] = None, max_depth: Optional[int] = _OWN_LIMIT, timings: Optional[Dict[str, float]] = None):
+    '''
+    Parse a pre-processed DAIDE string into keyword objects. If the parse
+    cache is enabled, successfully parsed trees are served from it.
+
+    :param daide: DAIDE string, e.g. 'PRP (PCE (ENG TUR))'
+    :param parser: parser engine, one of PARSERS. Defaults to the engine
+        chosen with set_default_parser.
+    :param max_depth: nesting limit for this message, or None for no limit.
+        Defaults to the limit set with set_max_depth.
+    :param timings: if given, the seconds spent in each stage that runs
+        (validate, parse, visit) are stored in it by stage name
+    '''
+    cache = _parse_cache
+    if cache is None:
+        return _parse_daide(daide, parser, max_depth, timings)
+
+    key = _normalize_whitespace(daide)
+    tree = cache.get(key)
+    if tree is None:
+        tree = _parse_daide(daide, parser, max_depth, timings)
+        cache.put(key, tree)
+    elif max_depth is not _OWN_LIMIT:
+        # cached trees only passed the limit set with set_max_depth
+        daide_validator.check_depth(daide, max_depth)
+    return tree
+
+
+def _parse_daide(daide: str, parser: Optional[str] = None, max_depth: Optional[int] = _OWN_LIMIT, timings: Optional[Dict[str, float]] = None):
+    if parser is None:
+        parser = _default_parser
+    if parser not in PARSERS:
+        raise ValueError(f"unknown parser {parser!r}, expected one of {PARSERS}")
+
+    if timings is None:
+        # fail fast on strings with unknown tokens or unbalanced parentheses
+        daide_validator.validate(daide, max_depth)
+        if parser == 'native':
+            return daide_parser.parse(daide)
+        grammar = get_daide_grammar(level=GRAMMAR_LEVEL)
+        return daide_visitor.visit(grammar.parse(daide))
+
+    start = perf_counter()
+    daide_validator.validate(daide, max_depth)
+    parse_start = perf_counter()
+    timings['validate'] = parse_start - start
+    if parser == 'native':
+        tree = daide_parser.parse(daide)
+        timings['parse'] = perf_counter() - parse_start
+        return tree
+    grammar = get_daide_grammar(level=GRAMMAR_LEVEL)
+    node = grammar.parse(daide)
+    visit_start = perf_counter()
+    timings['parse'] = visit_start - parse_start
+    tree = daide_visitor.visit(node)
+    timings['visit'] = perf_counter() - visit_start
+    return tree
+
+
+# rewrites from dipnet syntax to daidepp syntax, applied in one pass by
+# pre_process. since 'ENG' is used both as a power and a location, the
+# location is substituted with 'ECH'; coasts are written SCS, NCS, ECS, WCS.
+# TODO: CTO province VIA (sea_province sea_province ...), RTO province,
+# DMZ (power power ...) (province province ...), HOW (province)
+PRE_PROCESS_RULES = (
+    RewriteRule('BOT', 'GOB'),
+    RewriteRule('ENG', 'ECH', after='FLT'),
+    RewriteRule('ENG', 'ECH', after='AMY'),
+    RewriteRule('LON', 'ECH', after='CTO'),
+    RewriteRule('/SC', ' SCS', suffix=True),
+    RewriteRule('/NC', ' NCS', suffix=True),
+    RewriteRule('/EC', ' ECS', suffix=True),
+    RewriteRule('/WC', ' WCS', suffix=True),
+)
+_pre_process = compile_rewrite_rules(PRE_PROCESS_RULES)
+
+
+def pre_process(daide: str) -> str:
+    '''
+        change the dipnet syntax to daidepp syntax, see PRE_PROCESS_RULES.
+        Only whole tokens are rewritten, e.g. 'STP/SC' becomes 'STP SCS'
+        and 'FLT ENG' becomes 'FLT ECH'.
+    '''
+    return _pre_process(daide)
+
+
+def gen_English(daide: str, sender="I", recipient="You", make_natural=True, parser: Optional[str] = None, context=None, max_depth: Optional[int] = _OWN_LIMIT) -> str:
     '''
     Generate English from DAIDE. If make_natural is true, first and 
     second person pronouns/possessives will be used instead. We don't
@@ -45,14 +325,30 @@ def gen_English(daide: str, sender="I", recipient="You", make_natural=True) -> s
     :param daide: DAIDE string, e.g. '(ENG FLT LON) BLD'
     :param sender: power sending the message, e.g., 'ENG'
     :param recipient: power to which the message is sent, e.g., 'TUR'
+    :param parser: parser engine, 'parsimonious' or 'native'. Defaults to the
+        engine chosen with set_default_parser.
+    :param context: a conversation.ParseContext to parse with, so that
+        messages quoted from earlier ones in the conversation are not parsed
+        again. The context's parser engine is used, and the parse and render
+        caches are bypassed.
+    :param max_depth: how deeply parentheses may nest in this message, or
+        None for no limit. Defaults to the limit set with set_max_depth.
     '''
 
     if not make_natural and (not sender or not recipient):
         return "ERROR: sender and recipient must be provided if make_natural is False"
+    if parser is not None and parser not in PARSERS:
+        raise ValueError(f"unknown parser {parser!r}, expected one of {PARSERS}")
 
     try:
-        parse_tree = grammar.parse(pre_process(daide))
-        return post_process(str(daide_visitor.visit(parse_tree)), sender, recipient, make_natural)
+        hook = _timing_hook
+        if hook is not None:
+            return _gen_English_timed(daide, sender, recipient, make_natural, parser, hook, context, max_depth)
+        if context is not None:
+            sentence = str(context.parse(pre_process(daide), max_depth))
+        else:
+            sentence = render_daide(pre_process(daide), parser, max_depth)
+        return post_process(sentence, sender, recipient, make_natural)
 
     except ValueError as e:
         return "ERROR value: " + str(e)
@@ -60,63 +356,204 @@ def gen_English(daide: str, sender="I", recipient="You", make_natural=True) -> s
         return "ERROR parsing " + daide
 
 
-def post_process(sentence: str, sender: str, recipient: str, make_natural: bool) -> str:
+def _gen_English_timed(daide: str, sender: str, recipient: str, make_natural: bool, parser: Optional[str], hook: Callable[[TranslationTiming], None], context=None, max_depth: Optional[int] = _OWN_LIMIT) -> str:
     '''
-    Make the sentence more grammatical and readable
-    :param sentence: string, e.g. 'reject propose build fleet LON'
+    gen_English with every stage timed separately. render_daide records the
+    stages it runs, so the ones a cache hit skipped are missing.
     '''
+    if context is not None:
+        parser = context.parser
+    if parser is None:
+        parser = _default_parser
+    stages: Dict[str, float] = {}
+    ok = False
+    start = perf_counter()
+    try:
+        pre_processed = pre_process(daide)
+        stages['pre_process'] = perf_counter() - start
+
+        if context is not None:
+            stage_start = perf_counter()
+            tree = context.parse(pre_processed, max_depth)
+            stages['parse'] = perf_counter() - stage_start
+            stage_start = perf_counter()
+            sentence = str(tree)
+            stages['render'] = perf_counter() - stage_start
+        else:
+            sentence = render_daide(pre_processed, parser, max_depth, stages)
+
+        stage_start = perf_counter()
+        english = post_process(sentence, sender, recipient, make_natural)
+        stages['post_process'] = perf_counter() - stage_start
+        ok = True
+        return english
+    finally:
+        cache_hit = None
+        if ok and context is None:
+            if 'render' not in stages:
+                cache_hit = 'render'
+            elif 'validate' not in stages:
+                cache_hit = 'parse'
+        hook(TranslationTiming(len(daide), parser, stages, perf_counter() - start, ok, cache_hit))
+
+
+# a batch record: a DAIDE string, or a (daide, sender, recipient) tuple
+TranslationRecord = Union[str, Tuple[str, str, str]]
+
+
+def gen_English_record(record: TranslationRecord, make_natural=True, parser: Optional[str] = None, max_depth: Optional[int] = _OWN_LIMIT) -> str:
+    '''
+    gen_English for a single batch record. Errors that gen_English would
+    raise are returned as "ERROR ..." strings so one bad record does not
+    fail the whole batch.
+
+    :param record: DAIDE string, or (daide, sender, recipient) tuple
+    :param make_natural: passed on to gen_English
+    :param parser: passed on to gen_English
+    :param max_depth: passed on to gen_English
+    '''
+    try:
+        # malformed records, e.g. None or a 2-tuple, fail here
+        if isinstance(record, str):
+            daide, sender, recipient = record, "I", "You"
+        else:
+            daide, sender, recipient = record
+        return gen_English(daide, sender, recipient, make_natural, parser, max_depth=max_depth)
+    except Exception as e:
+        return f"ERROR {type(e).__name__}: {e}"
 
-    # if sender or recipient is not provided, use first and second
-    # person (default case).
-    if make_natural:
-        AGENT_SUBJECTIVE = 'I'
-        RECIPIENT_SUBJECTIVE = 'you'
-        AGENT_POSSESSIVE = 'my'
-        RECIPIENT_POSSESSIVE = 'your'
-        AGENT_OBJECTIVE = 'me'
-        RECIPIENT_OBJECTIVE = RECIPIENT_SUBJECTIVE
 
-    else:
-        AGENT_SUBJECTIVE = sender
-        RECIPIENT_SUBJECTIVE = recipient
-        AGENT_POSSESSIVE = sender + "'s"
-        RECIPIENT_POSSESSIVE = recipient + "'s"
-        AGENT_OBJECTIVE = sender
-        RECIPIENT_OBJECTIVE = recipient
+def _gen_English_chunk(records: Sequence[TranslationRecord], make_natural: bool, parser: str, max_depth: Optional[int]) -> List[str]:
+    return [gen_English_record(record, make_natural, parser, max_depth) for record in records]
 
-    output = sentence.replace("in <location>", "")
-    output = output.replace("<country>'s", "")
 
-    # general steps that apply to all types of daide messages
-    output = AGENT_SUBJECTIVE + ' ' + output
+def load_grammar(parser: str) -> None:
+    '''
+    Load the grammar a parser engine needs, so that the first translation
+    does not pay for it. Meant as the initializer of worker processes.
 
-    # remove extra spaces
-    output = " ".join(output.split())
+    :param parser: one of PARSERS
+    '''
+    if parser == 'parsimonious':
+        get_daide_grammar(level=GRAMMAR_LEVEL)
 
-    # add period if needed
-    if not output.endswith('.') or not output.endswith('?'):
-        output += '.'
 
-    # substitute power names with pronouns
-    if make_natural:
-        output = output.replace(' ' + sender + ' ', ' ' + AGENT_OBJECTIVE + ' ')
-        output = output.replace(' ' + recipient + ' ', ' ' + RECIPIENT_OBJECTIVE + ' ')
+def chunked(records: Iterable[TranslationRecord], chunksize: int) -> Iterator[List[TranslationRecord]]:
+    '''
+    Split records into lists of chunksize records, the last one possibly
+    shorter, reading only one chunk ahead.
+
+    :param records: any iterable, e.g. a file
+    :param chunksize: number of records per chunk
+    '''
+    records = iter(records)
+    chunk = list(islice(records, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(records, chunksize))
+
+
+def gen_English_batch(records: Iterable[TranslationRecord], make_natural=True, parser: Optional[str] = None, processes: Optional[int] = None, chunksize: int = 64) -> List[str]:
+    '''
+    Generate English for many DAIDE messages, keeping input order. Each
+    result is what gen_English returns for the record; exceptions that
+    gen_English would raise are returned as "ERROR <type>: <message>".
+
+    :param records: DAIDE strings, or (daide, sender, recipient) tuples
+    :param make_natural: passed on to gen_English
+    :param parser: parser engine, one of PARSERS. Defaults to the engine
+        chosen with set_default_parser.
+    :param processes: number of worker processes. If None or 1, records
+        are translated in this process.
+    :param chunksize: number of records sent to a worker at a time
+    '''
+    if parser is None:
+        parser = _default_parser
+    if parser not in PARSERS:
+        raise ValueError(f"unknown parser {parser!r}, expected one of {PARSERS}")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    if processes is None or processes <= 1:
+        return _gen_English_chunk(list(records), make_natural, parser, _OWN_LIMIT)
+
+    # workers don't share this process's settings, so pass them along
+    results: List[str] = []
+    with ProcessPoolExecutor(max_workers=processes, initializer=load_grammar, initargs=(parser,)) as executor:
+        chunk_results = executor.map(
+            _gen_English_chunk,
+            chunked(records, chunksize),
+            repeat(make_natural),
+            repeat(parser),
+            repeat(daide_validator.max_depth),
+        )
+        for chunk_result in chunk_results:
+            results.extend(chunk_result)
+    return results
+
+
+def post_process(sentence: str, sender: str, recipient: str, make_natural: bool) -> str:
+    '''
+    Make the sentence more grammatical and readable
+    :param sentence: string, e.g. 'reject propose build fleet LON'
+    '''
+    return _compile_post_process(sender, recipient, make_natural)(sentence)
+
+
+_ORDER_PHRASE = 'I propose an order using'
 
-    # case-dependent handling
 
-    # REJ/YES
-    if "reject" in output or "accept" in output:
-        output = output.replace(
-            'propose', RECIPIENT_POSSESSIVE + ' proposal of', 1)
+@lru_cache(maxsize=256)
+def _compile_post_process(sender: str, recipient: str, make_natural: bool) -> Callable[[str], str]:
+    '''
+    Compile the rules of post_process for one sender, recipient and
+    make_natural. Everything that only depends on those (pronouns, search
+    strings, which proposal rephrasing applies) is worked out once, and at
+    translation time each rule is a single str.replace or skipped when it
+    can't apply.
+    '''
+    # if sender or recipient is not provided, use first and second
+    # person (default case).
+    if make_natural:
+        agent_subjective = 'I'
+        recipient_possessive = 'your'
+        # substitute power names with pronouns
+        pronouns = ((' ' + sender + ' ', ' me '), (' ' + recipient + ' ', ' you '))
+    else:
+        agent_subjective = sender
+        recipient_possessive = recipient + "'s"
+        pronouns = ()
+    proposal_of = recipient_possessive + ' proposal of'
 
     # make natural for proposals
-    detect_str = f"I propose an order using {sender}'s"
-    if sender != "I" and make_natural and detect_str in output:
-        output = output.replace(detect_str, f"I will move")
-    elif sender in power_list and make_natural:
-        output = output.replace('I propose an order using', 'I think')
-        output = output.replace(' to ', ' is going to ')
-    return output
+    detect_str = f"{_ORDER_PHRASE} {sender}'s"
+    will_move = sender != "I" and make_natural
+    think = sender in power_list and make_natural
+
+    def apply(sentence: str) -> str:
+        output = sentence
+        if '<' in output:
+            output = output.replace("in <location>", "").replace("<country>'s", "")
+
+        # general steps that apply to all types of daide messages: add the
+        # subject, remove extra spaces and add a period
+        output = " ".join((agent_subjective + ' ' + output).split()) + '.'
+
+        for power, pronoun in pronouns:
+            output = output.replace(power, pronoun)
+
+        # REJ/YES
+        if "reject" in output or "accept" in output:
+            output = output.replace('propose', proposal_of, 1)
+
+        if will_move and detect_str in output:
+            output = output.replace(detect_str, "I will move")
+        elif think:
+            output = output.replace(_ORDER_PHRASE, 'I think')
+            output = output.replace(' to ', ' is going to ')
+        return output
+
+    return apply
 
 
 # remove punctuations
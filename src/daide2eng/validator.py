@@ -0,0 +1,212 @@
+"""
+Linear-time lexical check of DAIDE strings.
+
+Strings that mix other notations into DAIDE, like the AMR fragments in
+`daide2eng_moves_error.json` (`(fear-01 :ARG0 GER ...`), fail the PEG only
+after a full packrat parse. `DAIDEValidator` rejects them up front in linear
+time, by checking that
+
+- there are as many closing as opening parentheses, and
+- every word is made of grammar literals (`PRP`, `ENG`, `<country>`, ...) and
+  numbers, as in `ENG 0.5` or `ENG0.5`.
+
+It also limits how deeply parentheses nest. Both parsers recurse into every
+parenthesized argument, so without a limit a deeply nested message fails with
+a `RecursionError` somewhere inside a parser instead of a clean error.
+
+Only when a check fails is the string scanned token by token, to report the
+offset of the first offending token. The check accepts every string the grammar
+accepts, so it never changes a result, only how fast garbage fails.
+"""
+
+import re
+from typing import Any, FrozenSet, Optional
+
+from parsimonious.exceptions import ParseError
+
+from daide2eng.grammar.grammar_utils import _create_daide_grammar_dict
+
+__all__ = [
+    "MAX_DEPTH",
+    "DAIDELexicalError",
+    "DAIDENestingError",
+    "DAIDEValidator",
+    "daide_validator",
+]
+
+# default limit on nested parentheses, well below the depth at which either
+# parser runs out of stack under Python's default recursion limit
+MAX_DEPTH = 64
+
+_TOKEN_RE = re.compile(r"[()]|[^\s()]+")
+_WORD_RE = re.compile(r"[^\s()]+")
+_PAREN_RE = re.compile(r"[()]")
+# the grammar's float regex, which also matches its integers and years
+_NUMBER_RE = re.compile(r"[-+]?((\d*\.\d+)|(\d+\.?))([Ee][+-]?\d+)?")
+# quoted literals of a rule, skipping regexes like ~"\d{4}"
+_LITERAL_RE = re.compile(r'(?<!~)"([^"]+)"')
+# default of the max_depth arguments below, standing for the validator's own limit
+_OWN_LIMIT: Any = object()
+
+
+class DAIDELexicalError(ParseError):
+    """Raised when a string contains a token or parenthesis no DAIDE string can have.
+
+    Args:
+        text (str): the string that was checked
+        pos (int): offset of the offending token
+        token (str): the offending token
+        reason (str): what is wrong with it
+    """
+
+    def __init__(self, text: str, pos: int, token: str, reason: str) -> None:
+        super().__init__(text, pos)
+        self.token = token
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return "%s %r at offset %s (line %s, column %s)." % (
+            self.reason,
+            self.token,
+            self.pos,
+            self.line(),
+            self.column(),
+        )
+
+
+class DAIDENestingError(DAIDELexicalError):
+    """Raised when parentheses are nested deeper than the validator allows.
+
+    Args:
+        text (str): the string that was checked
+        pos (int): offset of the first parenthesis beyond the limit
+        max_depth (int): the limit
+    """
+
+    def __init__(self, text: str, pos: int, max_depth: int) -> None:
+        super().__init__(
+            text, pos, "(", f"Parentheses nested deeper than {max_depth} levels"
+        )
+        self.max_depth = max_depth
+
+    def __str__(self) -> str:
+        return "%s at offset %s (line %s, column %s)." % (
+            self.reason,
+            self.pos,
+            self.line(),
+            self.column(),
+        )
+
+
+class DAIDEValidator:
+    """Lexical pre-check for strings of a DAIDE grammar level.
+
+    Args:
+        level (int): grammar level whose literals make up the vocabulary
+        max_depth (Optional[int]): maximum nesting depth of parentheses, or
+            None for no limit
+    """
+
+    def __init__(self, level: int = 160, max_depth: Optional[int] = MAX_DEPTH) -> None:
+        self.max_depth = max_depth
+        literals = set()
+        for rule in _create_daide_grammar_dict(level).values():
+            literals.update(_LITERAL_RE.findall(rule))
+        self.vocabulary: FrozenSet[str] = frozenset(literals)
+        self._lengths = sorted({len(word) for word in self.vocabulary}, reverse=True)
+
+    def _is_word(self, token: str) -> bool:
+        """Whether `token` splits into vocabulary words and numbers."""
+        if token in self.vocabulary:
+            return True
+        pos = 0
+        while pos < len(token):
+            for length in self._lengths:
+                if token[pos : pos + length] in self.vocabulary:
+                    pos += length
+                    break
+            else:
+                # words start with a letter or '<', numbers never do
+                match = _NUMBER_RE.match(token, pos)
+                if match is None or match.end() == pos:
+                    return False
+                pos = match.end()
+        return True
+
+    def validate(self, text: str, max_depth: Optional[int] = _OWN_LIMIT) -> None:
+        """Check that `text` could be DAIDE, raising on the first token that cannot be.
+
+        Args:
+            text (str): DAIDE string, after `utils.pre_process`
+            max_depth (Optional[int]): nesting limit for this check, defaults
+                to `self.max_depth`
+
+        Raises:
+            DAIDELexicalError: if `text` has no words, has unbalanced parentheses
+                or contains an unknown word
+            DAIDENestingError: if parentheses nest deeper than `max_depth`
+        """
+        words = _WORD_RE.findall(text)
+        if (
+            words
+            and text.count("(") == text.count(")")
+            and all(
+                self._is_word(word) for word in set(words).difference(self.vocabulary)
+            )
+        ):
+            self.check_depth(text, max_depth)
+            return
+        self._raise_first_error(text)
+
+    def check_depth(self, text: str, max_depth: Optional[int] = _OWN_LIMIT) -> None:
+        """Check only that the parentheses of `text` nest no deeper than `max_depth`.
+
+        Args:
+            text (str): DAIDE string
+            max_depth (Optional[int]): nesting limit for this check, defaults
+                to `self.max_depth`
+
+        Raises:
+            DAIDENestingError: if parentheses nest deeper than `max_depth`
+        """
+        if max_depth is _OWN_LIMIT:
+            max_depth = self.max_depth
+        # only strings with more parentheses than the limit can exceed it
+        if max_depth is None or text.count("(") <= max_depth:
+            return
+        depth = 0
+        for match in _PAREN_RE.finditer(text):
+            if match.group() == "(":
+                depth += 1
+                if depth > max_depth:
+                    raise DAIDENestingError(text, match.start(), max_depth)
+            else:
+                depth -= 1
+
+    def _raise_first_error(self, text: str) -> None:
+        """Find the first problem in `text` that `validate` detected and raise it."""
+        open_positions = []
+        has_words = False
+        for match in _TOKEN_RE.finditer(text):
+            token = match.group()
+            if token == "(":
+                open_positions.append(match.start())
+            elif token == ")":
+                if not open_positions:
+                    raise DAIDELexicalError(
+                        text, match.start(), token, "Unbalanced parenthesis"
+                    )
+                open_positions.pop()
+            elif self._is_word(token):
+                has_words = True
+            else:
+                raise DAIDELexicalError(text, match.start(), token, "Unknown token")
+        if open_positions:
+            raise DAIDELexicalError(
+                text, open_positions[-1], "(", "Unclosed parenthesis"
+            )
+        if not has_words:
+            raise DAIDELexicalError(text, 0, text, "Empty message")
+
+
+daide_validator = DAIDEValidator()
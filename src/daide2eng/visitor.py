@@ -1,6 +1,8 @@
 import logging
-from typing import Any
+import sys
+from typing import Any, Callable, Dict, List, Optional
 
+from parsimonious.exceptions import UndefinedLabel, VisitationError
 from parsimonious.nodes import Node, NodeVisitor
 from typing_extensions import get_args
 
@@ -17,9 +19,98 @@ _prov_no_coast = get_args(ProvinceNoCoast)
 
 
 class DAIDEVisitor(NodeVisitor):
+    # let keyword validation errors reach callers as plain ValueErrors
+    unwrapped_exceptions = (ValueError,)
+
+    # rules whose visit methods only read the node's text, so their subtrees
+    # are not visited
+    text_rules = frozenset(
+        {
+            "power",
+            "prov_no_coast",
+            "prov_sea",
+            "supply_center",
+            "unit_type",
+            "prov_landlock",
+            "prov_land_sea",
+            "coast",
+            "season",
+            "try_tokens",
+            "rof",
+        }
+    )
+
     def __init__(self) -> None:
         super().__init__()
-
+        # rule name -> bound visit method, looked up once instead of per node
+        self._dispatch: Dict[str, Callable[[Node, List[Any]], Any]] = {
+            name[len("visit_") :]: getattr(self, name)
+            for name in dir(self)
+            if name.startswith("visit_")
+        }
+        # None stands for the default generic_visit, which visit inlines
+        self._generic_visit: Optional[Callable[[Node, List[Any]], Any]] = (
+            None
+            if type(self).generic_visit is DAIDEVisitor.generic_visit
+            else self.generic_visit
+        )
+
+    def visit(self, node: Node) -> Any:
+        """Convert a parse tree into keyword objects.
+
+        Calls the same `visit_*` methods, children first, as
+        `NodeVisitor.visit`, and wraps their errors the same way, but walks the
+        tree with an explicit stack instead of recursing, so deeply nested
+        messages don't run into Python's recursion limit. How deeply a message
+        may nest is limited up front by `DAIDEValidator.max_depth`.
+
+        Most nodes are parentheses, whitespace and keyword literals, which
+        `generic_visit` returns as they are. Leaves like these, and the nodes
+        of `text_rules`, are visited in place without a stack frame of their
+        own.
+
+        Args:
+            node (Node): root of a parse tree of the DAIDE grammar
+
+        Returns:
+            Any: the keyword object of the root
+        """
+        dispatch = self._dispatch
+        generic_visit = self._generic_visit
+        text_rules = self.text_rules
+        # frames of (node, iterator over its children, visited children)
+        stack = [(node, iter(node.children), [])]
+        current = node
+        try:
+            while True:
+                current, children, visited_children = stack[-1]
+                for child in children:
+                    name = child.expr.name
+                    if child.children and name not in text_rules:
+                        stack.append((child, iter(child.children), []))
+                        break
+                    current = child
+                    method = dispatch.get(name, generic_visit)
+                    visited_children.append(
+                        child if method is None else method(child, [])
+                    )
+                else:
+                    current, _, visited_children = stack.pop()
+                    method = dispatch.get(current.expr.name, generic_visit)
+                    if method is None:
+                        value = visited_children or current
+                    else:
+                        value = method(current, visited_children)
+                    if not stack:
+                        return value
+                    stack[-1][2].append(value)
+        except (VisitationError, UndefinedLabel):
+            raise
+        except Exception as exc:
+            if isinstance(exc, self.unwrapped_exceptions):
+                raise
+            # show where in the tree the method failed, like NodeVisitor.visit
+            raise VisitationError(exc, type(exc), current)
 
     def visit_message(self, node, visited_children) -> Message:
         return visited_children[0]
@@ -29,19 +120,19 @@ class DAIDEVisitor(NodeVisitor):
 
     def visit_prp(self, node, visited_children) -> PRP:
         _, _, arrangement, _ = visited_children
-        return PRP(arrangement)
+        return PRP._trusted(arrangement)
 
     def visit_ccl(self, node, visited_children) -> CCL:
         _, _, press_message, _ = visited_children
-        return CCL(press_message)
+        return CCL._trusted(press_message)
 
     def visit_fct(self, node, visited_children) -> FCT:
         _, _, arrangement_qry_not, _ = visited_children[0]
-        return FCT(arrangement_qry_not)
+        return FCT._trusted(arrangement_qry_not)
 
     def visit_thk(self, node, visited_children):
         _, _, arrangement_qry_not, _ = visited_children[0]
-        return THK(arrangement_qry_not)
+        return THK._trusted(arrangement_qry_not)
 
     def visit_try(self, node, visited_children) -> TRY:
         _, _, try_token, ws_try_tokens, _ = visited_children
@@ -50,27 +141,27 @@ class DAIDEVisitor(NodeVisitor):
         for ws_try_token in ws_try_tokens:
             _, try_token = ws_try_token
             try_tokens.append(try_token)
-        return TRY(*try_tokens)
+        return TRY._from_parsed(try_tokens)
 
     def visit_ins(self, node, visited_children) -> INS:
         _, _, arrangement, _ = visited_children
-        return INS(arrangement)
+        return INS._trusted(arrangement)
 
     def visit_qry(self, node, visited_children) -> QRY:
         _, _, arrangement, _ = visited_children
-        return QRY(arrangement)
+        return QRY._trusted(arrangement)
 
     def visit_sug(self, node, visited_children) -> SUG:
         _, _, arrangement, _ = visited_children
-        return SUG(arrangement)
+        return SUG._trusted(arrangement)
 
     def visit_wht(self, node, visited_children) -> WHT:
         _, _, unit, _ = visited_children
-        return WHT(unit)
+        return WHT._trusted(unit)
 
     def visit_how(self, node, visited_children) -> HOW:
-        _, _, province_power, _ = visited_children
-        return HOW(province_power)
+        _, _, province_power, _ = visited_children[0]
+        return HOW._trusted(province_power)
 
     def visit_exp(self, node, visited_children) -> EXP:
         _, _, turn, _, _, message, _ = visited_children
@@ -80,11 +171,11 @@ class DAIDEVisitor(NodeVisitor):
         _, _, arrangement, _, _, _, press_message, _, els = visited_children
 
         if isinstance(els, Node) and not els.text:
-            return IFF(arrangement, press_message)
+            return IFF._trusted(arrangement, press_message, None)
 
         else:
             _, _, els_press_message, _ = els[0]
-            return IFF(arrangement, press_message, els_press_message)
+            return IFF._trusted(arrangement, press_message, els_press_message)
 
     def visit_frm(self, node, visited_children) -> FRM:
         (
@@ -105,49 +196,48 @@ class DAIDEVisitor(NodeVisitor):
         for ws_recv_power in ws_recv_powers:
             _, recv_power = ws_recv_power
             recv_powers.append(recv_power)
-        return FRM(frm_power, recv_powers, message)
+        return FRM._from_parsed(frm_power, recv_powers, message)
 
     def visit_reply(self, node, visited_children) -> Reply:
         return visited_children[0]
 
     def visit_yes(self, node, visited_children) -> YES:
         _, _, press_message, _ = visited_children
-        return YES(press_message)
+        return YES._trusted(press_message)
 
     def visit_rej(self, node, visited_children) -> REJ:
         _, _, press_message, _ = visited_children
-        return REJ(press_message)
+        return REJ._trusted(press_message)
 
     def visit_bwx(self, node, visited_children) -> BWX:
         _, _, press_message, _ = visited_children
-        return BWX(press_message)
+        return BWX._trusted(press_message)
 
     def visit_huh(self, node, visited_children) -> HUH:
         _, _, press_message, _ = visited_children
-        return HUH(press_message)
+        return HUH._trusted(press_message)
 
-    def idk_param(self, node, visited_children) -> Union[QRY, WHT, PRP, INS]:
+    def visit_idk_param(self, node, visited_children) -> Union[QRY, WHT, PRP, INS]:
         return visited_children[0]
 
     def visit_idk(self, node, visited_children) -> IDK:
         _, _, idk_param, _ = visited_children
-
-        return IDK(idk_param[0]) if isinstance(idk_param, list) else IDK(idk_param)
+        return IDK._trusted(idk_param)
 
     def visit_sry(self, node, visited_children) -> SRY:
         _, _, exp, _ = visited_children
-        return SRY(exp)
+        return SRY._trusted(exp)
 
-    def why_param(self, node, visited_children) -> Union[FCT, THK, PRP, INS]:
+    def visit_why_param(self, node, visited_children) -> Union[FCT, THK, PRP, INS]:
         return visited_children[0]
 
     def visit_why(self, node, visited_children) -> WHY:
         _, _, why_param, _ = visited_children
-        return WHY(why_param)
+        return WHY._trusted(why_param)
 
     def visit_pob(self, node, visited_children) -> POB:
         _, _, why, _ = visited_children
-        return POB(why)
+        return POB._trusted(why)
 
     def visit_arrangement(self, node, visited_children) -> Arrangement:
         return visited_children[0]
@@ -216,19 +306,19 @@ class DAIDEVisitor(NodeVisitor):
 
     def visit_slo(self, node, visited_children) -> SLO:
         _, _, power, _ = visited_children
-        return SLO(power)
+        return SLO._trusted(power)
 
     def visit_not(self, node, visited_children) -> NOT:
         _, _, arrangement_qry, _ = visited_children[0]
-        return NOT(arrangement_qry)
+        return NOT._trusted(arrangement_qry)
 
     def visit_nar(self, node, visited_children) -> NAR:
         _, _, arrangement, _ = visited_children
-        return NAR(arrangement)
+        return NAR._trusted(arrangement)
 
     def visit_xdo(self, node, visited_children) -> XDO:
         _, _, order, _ = visited_children
-        return XDO(order)
+        return XDO._trusted(order)
 
     def visit_and(self, node, visited_children) -> AND:
         _, _, arrangement, _, par_arrangements = visited_children
@@ -260,7 +350,7 @@ class DAIDEVisitor(NodeVisitor):
         for ws_prov in ws_provinces:
             _, prov = ws_prov
             provinces.append(prov)
-        return DMZ(powers, provinces)
+        return DMZ._from_parsed(powers, provinces)
 
     def visit_scd(self, node, visited_children) -> SCD:
         _, scd_statements = visited_children
@@ -269,14 +359,14 @@ class DAIDEVisitor(NodeVisitor):
         for scd_statement in scd_statements:
             _, power, _, supply_center, ws_supply_centers, _ = scd_statement
 
-            supply_centers = [Location(supply_center)]
+            supply_centers = [get_location(supply_center)]
             for ws_sc in ws_supply_centers:
                 _, sc = ws_sc
-                supply_centers.append(Location(sc))
+                supply_centers.append(get_location(sc))
             power_and_supply_centers.append(
-                PowerAndSupplyCenters(power, *supply_centers)
+                PowerAndSupplyCenters._from_parsed(power, supply_centers)
             )
-        return SCD(*power_and_supply_centers)
+        return SCD._from_parsed(power_and_supply_centers)
 
     def visit_occ(self, node, visited_children) -> OCC:
         _, par_units = visited_children
@@ -285,7 +375,7 @@ class DAIDEVisitor(NodeVisitor):
         for par_unit in par_units:
             _, unit, _ = par_unit
             units.append(unit)
-        return OCC(*units)
+        return OCC._from_parsed(units)
 
     def visit_cho(self, node, visited_children) -> CHO:
         _, _, range, _, par_arrangements = visited_children
@@ -295,20 +385,20 @@ class DAIDEVisitor(NodeVisitor):
         for par_arrangement in par_arrangements:
             _, arrangement, _ = par_arrangement
             arrangements.append(arrangement)
-        return CHO(minimum, maximum, *arrangements)
+        return CHO._from_parsed(minimum, maximum, arrangements)
 
     def visit_for(self, node, visited_children) -> FOR:
         _, _, turn, _, _, arrangement, _ = visited_children[0]
 
         if isinstance(turn, list):
             _, start_turn, _, _, end_turn, _ = turn
-            return FOR(start_turn, end_turn, arrangement)
+            return FOR._trusted(start_turn, end_turn, arrangement)
         else:
-            return FOR(start_turn, None, arrangement)
+            return FOR._trusted(turn, None, arrangement)
 
     def visit_xoy(self, node, visited_children) -> XOY:
         _, _, power_x, _, _, power_y, _ = visited_children
-        return XOY(power_x, power_y)
+        return XOY._trusted(power_x, power_y)
 
     def visit_ydo(self, node, visited_children) -> YDO:
         _, _, power, _, par_units = visited_children
@@ -317,7 +407,7 @@ class DAIDEVisitor(NodeVisitor):
         for par_unit in par_units:
             _, unit, _ = par_unit
             units.append(unit)
-        return YDO(power, *units)
+        return YDO._from_parsed(power, units)
 
     def visit_snd(self, node, visited_children) -> SND:
         (
@@ -334,11 +424,11 @@ class DAIDEVisitor(NodeVisitor):
             _,
         ) = visited_children
 
-        recv_power = [recv_power]
+        recv_powers = [recv_power]
         for ws_recv_power in ws_recv_powers:
             _, recv_power = ws_recv_power
-            recv_power.append(recv_power)
-        return SND(power, recv_power, message)
+            recv_powers.append(recv_power)
+        return SND._from_parsed(power, recv_powers, message)
 
     def visit_fwd(self, node, visited_children) -> FWD:
         _, _, power, ws_powers, _, _, power_1, _, _, power_2, _ = visited_children
@@ -347,7 +437,7 @@ class DAIDEVisitor(NodeVisitor):
         for ws_power in ws_powers:
             _, power = ws_power
             powers.append(power)
-        return FWD(powers, power_1, power_2)
+        return FWD._from_parsed(powers, power_1, power_2)
 
     def visit_bcc(self, node, visited_children) -> BCC:
         _, _, power_1, _, _, power, ws_powers, _, _, power_2, _ = visited_children
@@ -356,18 +446,18 @@ class DAIDEVisitor(NodeVisitor):
         for ws_power in ws_powers:
             _, power = ws_power
             powers.append(power)
-        return BCC(power_1, powers, power_2)
+        return BCC._from_parsed(power_1, powers, power_2)
 
     def visit_order(self, node, visited_children) -> Order:
         return visited_children[0]
 
     def visit_hld(self, node, visited_children) -> HLD:
         _, unit, _, _ = visited_children
-        return HLD(unit)
+        return HLD._trusted(unit)
 
     def visit_mto(self, node, visited_children) -> MTO:
         _, unit, _, _, _, province = visited_children
-        return MTO(unit, province)
+        return MTO._trusted(unit, province)
 
     def visit_sup(self, node, visited_children) -> SUP:
         (
@@ -382,14 +472,14 @@ class DAIDEVisitor(NodeVisitor):
         ) = visited_children
 
         if isinstance(ws_province_no_coast, Node) and not ws_province_no_coast.text:
-            return SUP(supporting_unit, supported_unit)
+            return SUP._trusted(supporting_unit, supported_unit, None)
         else:
             _, _, province_no_coast = ws_mto_prov = ws_province_no_coast[0]
-            return SUP(supporting_unit, supported_unit, province_no_coast)
+            return SUP._trusted(supporting_unit, supported_unit, province_no_coast)
 
     def visit_cvy(self, node, visited_children) -> CVY:
         _, convoying_unit, _, _, _, convoyed_unit, _, _, _, province = visited_children
-        return CVY(convoying_unit, convoyed_unit, province)
+        return CVY._trusted(convoying_unit, convoyed_unit, province)
 
     def visit_move_by_cvy(self, node, visited_children) -> MoveByCVY:
         (
@@ -411,56 +501,56 @@ class DAIDEVisitor(NodeVisitor):
         for ws_province_sea in ws_province_seas:
             _, province_sea = ws_province_sea
             province_seas.append(province_sea)
-        return MoveByCVY(unit, province, *province_seas)
+        return MoveByCVY._trusted(unit, province, tuple(province_seas))
 
     def visit_retreat(self, node, visited_children) -> Retreat:
         return visited_children[0]
 
     def visit_rto(self, node, visited_children) -> RTO:
         _, unit, _, _, _, province = visited_children
-        return RTO(unit, province)
+        return RTO._trusted(unit, province)
 
     def visit_dsb(self, node, visited_children) -> DSB:
         _, unit, _, _ = visited_children
-        return DSB(unit)
+        return DSB._trusted(unit)
 
     def visit_build(self, node, visited_children) -> Build:
         return visited_children[0]
 
     def visit_bld(self, node, visited_children) -> BLD:
         _, unit, _, _ = visited_children
-        return BLD(unit)
+        return BLD._trusted(unit)
 
     def visit_rem(self, node, visited_children) -> REM:
         _, unit, _, _ = visited_children
-        return REM(unit)
+        return REM._trusted(unit)
 
     def visit_wve(self, node, visited_children) -> WVE:
         power, _, _ = visited_children
-        return WVE(power)
+        return WVE._trusted(power)
 
     def visit_power(self, node, visited_children) -> Power:
-        return node.text
+        return sys.intern(node.text)
 
     def visit_prov_no_coast(self, node, visited_children) -> Location:
-        return Location(province=node.text)
+        return get_location(node.text)
 
     def visit_prov_sea(self, node, visited_children) -> ProvinceSea:
-        return node.text
+        return sys.intern(node.text)
 
     def visit_supply_center(self, node, visited_children) -> SupplyCenter:
-        return node.text
+        return sys.intern(node.text)
 
     def visit_unit(self, node, visited_children) -> Unit:
         power, _, unit_type, _, location = visited_children
-        return Unit(power, unit_type, location=location)
+        return get_unit(power, unit_type, location)
 
     def visit_unit_type(self, node, visited_children) -> UnitType:
-        return node.text
+        return sys.intern(node.text)
 
     def visit_province(self, node, visited_children) -> Location:
         if isinstance(visited_children[0], str):
-            return Location(province=visited_children[0])
+            return get_location(visited_children[0])
         elif isinstance(visited_children[0], Location):
             return visited_children[0]
         else:
@@ -469,21 +559,21 @@ class DAIDEVisitor(NodeVisitor):
             )
 
     def visit_prov_landlock(self, node, visited_children) -> Location:
-        return Location(province=node.text)
+        return get_location(node.text)
 
     def visit_prov_land_sea(self, node, visited_children) -> Location:
-        return Location(province=node.text)
+        return get_location(node.text)
 
     def visit_prov_coast(self, node, visited_children) -> Location:
         _, province, _, coast, _ = visited_children[0]
-        return Location(province=province.text, coast=coast.text)
+        return get_location(province.text, coast.text)
 
     def visit_coast(self, node, visited_children) -> ProvinceCoast:
         return node.text
 
     def visit_turn(self, node, visited_children) -> Turn:
         season, _, year = visited_children
-        return Turn(season, int(year.text))
+        return Turn._trusted(season, int(year.text))
 
     def visit_season(self, node, visited_children) -> Season:
         return node.text
@@ -502,29 +592,29 @@ class DAIDEVisitor(NodeVisitor):
 
     def visit_uhy(self, node, visited_children) -> UHY:
         _, _, press_message, _ = visited_children
-        return UHY(press_message)
+        return UHY._trusted(press_message)
 
     def visit_hpy(self, node, visited_children) -> HPY:
         _, _, press_message, _ = visited_children
-        return HPY(press_message)
+        return HPY._trusted(press_message)
 
     def visit_ang(self, node, visited_children) -> ANG:
         _, _, press_message, _ = visited_children
 
-        return ANG(press_message)
+        return ANG._trusted(press_message)
 
     def visit_rof(self, node, visited_children) -> ROF:
-        return ROF()
+        return ROF._trusted()
 
     def visit_float(self, node, visited_children) -> float:
         return float(visited_children[1].text)
 
     def visit_ulb(self, node, visited_children) -> ULB:
         _, _, power, utility, _ = visited_children
-        return ULB(power, utility)
+        return ULB._trusted(power, utility)
 
     def visit_uub(self, node, visited_children) -> UUB:
         _, _, power, utility, _ = visited_children
-        return UUB(power, utility)
+        return UUB._trusted(power, utility)
 
 daide_visitor = DAIDEVisitor()
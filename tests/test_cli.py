@@ -0,0 +1,62 @@
+import io
+import json
+from collections import Counter
+from pathlib import Path
+
+from daide2eng import cli, utils
+
+
+def test_main_keeps_global_settings(monkeypatch, capsys):
+    monkeypatch.setattr(utils, "_default_parser", "native")
+    utils.set_max_depth(8)
+    try:
+        record = {"daide": "PRP (PCE (ENG TUR))", "sender": "ENG", "recipient": "TUR"}
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(record) + "\n"))
+        assert cli.main(["--quiet", "--parser", "parsimonious"]) == 0
+        assert utils._default_parser == "native"
+        assert utils.daide_validator.max_depth == 8
+    finally:
+        utils.set_max_depth()
+    english = json.loads(capsys.readouterr().out)["english"]
+    assert english == "I propose peace between me and TUR."
+
+
+def _input_lines():
+    with open(Path(__file__).resolve().parent.parent / "translation.json") as file:
+        messages = [record["daide"] for record in json.load(file)[:30]]
+    lines = [
+        json.dumps({"daide": message, "sender": "ENG", "recipient": "TUR"})
+        for message in messages
+    ]
+    # a broken JSON record and an untranslatable DAIDE line mid-stream
+    lines[7] = '{"daide": "PRP (PCE (ENG TUR))"'
+    lines[12] = "PRP (PCE (ENG TUR) junk"
+    return lines
+
+
+def _main(tmp_path, capsys, *args):
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(_input_lines()) + "\n", encoding="utf-8")
+    assert cli.main(["--quiet", "--chunksize", "2", *args, str(path)]) == 0
+    return capsys.readouterr().out.splitlines()
+
+
+def test_bad_lines_give_error_lines(tmp_path, capsys):
+    output = _main(tmp_path, capsys)
+    assert len(output) == len(_input_lines())
+    assert json.loads(output[7])["english"].startswith("ERROR invalid record")
+    assert output[12].startswith("ERROR")
+    for index, line in enumerate(output):
+        if index not in (7, 12):
+            assert not json.loads(line)["english"].startswith("ERROR")
+
+
+def test_jobs_keep_input_order(tmp_path, capsys):
+    expected = _main(tmp_path, capsys)
+    assert _main(tmp_path, capsys, "--jobs", "3") == expected
+
+
+def test_unordered_jobs_write_every_line(tmp_path, capsys):
+    expected = _main(tmp_path, capsys)
+    output = _main(tmp_path, capsys, "--jobs", "3", "--unordered")
+    assert Counter(output) == Counter(expected)
@@ -0,0 +1,91 @@
+import pytest
+
+from daide2eng.conversation import ParseContext
+from daide2eng.utils import PARSERS, gen_English, parse_daide, pre_process
+
+PROPOSAL = "PRP (AND (XDO ((ENG FLT NTH) MTO BEL)) (DMZ (ENG FRA) (BEL HOL)))"
+WRAPPED = [
+    f"YES ({PROPOSAL})",
+    f"REJ ({PROPOSAL})",
+    f"BWX ({PROPOSAL})",
+    f"HUH ({PROPOSAL})",
+    f"CCL ({PROPOSAL})",
+    f"FRM (FRA) (ENG TUR) ({PROPOSAL})",
+]
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("message", WRAPPED)
+def test_wrapped_message_matches_parse_daide(message, parser):
+    context = ParseContext(parser=parser)
+    tree = context.parse(message)
+    expected = parse_daide(message, parser=parser)
+    assert repr(tree) == repr(expected)
+    assert str(tree) == str(expected)
+
+
+@pytest.mark.parametrize("message", WRAPPED)
+def test_wrapped_message_renders_as_gen_English(message):
+    context = ParseContext()
+    context.parse(PROPOSAL)
+    assert gen_English(message, "ENG", "TUR", context=context) == gen_English(
+        message, "ENG", "TUR"
+    )
+
+
+@pytest.mark.parametrize("message", WRAPPED)
+def test_quoted_message_is_reused(message):
+    context = ParseContext()
+    proposal = context.parse(PROPOSAL)
+    assert context.info().hits == 0
+    reply = context.parse(message)
+    assert context.info().hits == 1
+    if message.startswith("FRM"):
+        assert reply.message is proposal
+    else:
+        assert reply.press_message is proposal
+
+
+def test_repeated_message_is_remembered():
+    context = ParseContext()
+    first = context.parse(f"YES ({PROPOSAL})")
+    # the reply and the proposal it quotes are both remembered
+    assert context.info().currsize == 2
+    assert context.parse(f"YES ({PROPOSAL})") is first
+    assert context.parse(PROPOSAL) is first.press_message
+    assert context.info().hits == 2
+    context.clear()
+    assert context.info().currsize == 0
+
+
+def test_context_output_matches_gen_English():
+    context = ParseContext()
+    conversation = [PROPOSAL] + WRAPPED + [
+        "YES (PRP (PCE (ENG TUR)))",
+        "PRP (PCE (ENG TUR))",
+        "YES (PRP (PCE (ENG TUR)))",
+        "(ENG FLT ENG) MTO BOT",
+    ]
+    for message in conversation:
+        assert gen_English(message, "ENG", "TUR", context=context) == gen_English(
+            message, "ENG", "TUR"
+        )
+    assert context.info().hits > 0
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "YES (PRP (PCE (ENG)))",
+        "YES (PRP (PCE (ENG ENG)))",
+        "YES (PRP (PCE (ENG TUR))",
+        "FRM (FRA) () (PRP (PCE (ENG TUR)))",
+    ],
+)
+def test_invalid_message_raises_as_parse_daide(message):
+    daide = pre_process(message)
+    with pytest.raises(Exception) as expected:
+        parse_daide(daide)
+    with pytest.raises(type(expected.value)):
+        ParseContext().parse(daide)
+    assert gen_English(message, context=ParseContext()) == gen_English(message)
@@ -0,0 +1,57 @@
+import os
+import pickle
+
+import pytest
+
+from daide2eng.grammar import grammar_cache
+from daide2eng.grammar.grammar_cache import CACHE_DIR_ENV, cached_grammar
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "getuid"), reason="needs POSIX file ownership"
+)
+
+
+def _build(grammar_str):
+    return {"grammar": grammar_str}
+
+
+def _planted(cache_dir, grammar_str):
+    path = grammar_cache._cache_path(str(cache_dir), grammar_str)
+    with open(path, "wb") as cache_file:
+        pickle.dump({"grammar": "planted"}, cache_file)
+    return path
+
+
+def test_loads_private_entry(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    assert cached_grammar("a = 'x'", _build) == {"grammar": "a = 'x'"}
+    assert (cache_dir.stat().st_mode & 0o777) == 0o700
+
+    _planted(cache_dir, "a = 'x'")
+    assert cached_grammar("a = 'x'", _build) == {"grammar": "planted"}
+
+
+def test_ignores_cache_dir_writable_by_others(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    cache_dir.chmod(0o777)
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    _planted(cache_dir, "a = 'x'")
+
+    assert cached_grammar("a = 'x'", _build) == {"grammar": "a = 'x'"}
+
+
+def test_ignores_entry_writable_by_others(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir(mode=0o700)
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    os.chmod(_planted(cache_dir, "a = 'x'"), 0o666)
+
+    assert cached_grammar("a = 'x'", _build) == {"grammar": "a = 'x'"}
+
+
+def test_key_covers_grammar_utils_source(tmp_path, monkeypatch):
+    path = grammar_cache._cache_path(str(tmp_path), "a = 'x'")
+    monkeypatch.setattr(grammar_cache, "_grammar_utils_digest", lambda: "changed")
+    assert grammar_cache._cache_path(str(tmp_path), "a = 'x'") != path
@@ -0,0 +1,15 @@
+from daide2eng import get_daide_grammar
+from daide2eng.utils import GRAMMAR_LEVEL
+
+MESSAGE = "PRP (PCE (ENG TUR))"
+
+
+def test_profile_leaves_shared_grammar_alone():
+    grammar = get_daide_grammar(level=GRAMMAR_LEVEL)
+    classes = {name: type(expr) for name, expr in grammar.items()}
+    with grammar.profile() as profile:
+        assert {name: type(expr) for name, expr in grammar.items()} == classes
+        grammar.parse(MESSAGE)
+        assert profile.ranked() == []
+        profile.grammar.parse(MESSAGE)
+    assert profile.stats["power"].successes == 2
@@ -0,0 +1,27 @@
+import pytest
+
+from daide2eng import utils
+from daide2eng.keywords import disable_hash_consing, enable_hash_consing
+from daide2eng.keywords.press_keywords import PRP, ULB
+
+
+@pytest.fixture
+def hash_consing():
+    enable_hash_consing()
+    yield
+    disable_hash_consing()
+
+
+def test_equal_values_with_different_reprs_stay_apart(hash_consing):
+    assert ULB("ENG", 1.0) is ULB("ENG", 1.0)
+    assert ULB("ENG", 1) is not ULB("ENG", 1.0)
+    assert ULB("ENG", 0.0) is not ULB("ENG", -0.0)
+    assert PRP(ULB("ENG", 0.0)) is not PRP(ULB("ENG", -0.0))
+
+
+@pytest.mark.parametrize("parser", utils.PARSERS)
+def test_translation_keeps_negative_zero(hash_consing, parser):
+    kept = utils.parse_daide("PRP (ULB (ENG 0))", parser)
+    english = utils.gen_English("PRP (ULB (ENG -0))", "ENG", "TUR", parser=parser)
+    assert english.endswith(" is -0.0.")
+    assert repr(kept.arrangement.float_val) == "0.0"
@@ -0,0 +1,36 @@
+import pytest
+
+from daide2eng import utils
+from daide2eng.keywords.base_keywords import Location
+from daide2eng.keywords.press_keywords import DMZ
+
+# each province is followed by its coasts
+EXHAUSTIVE = (
+    "BUL",
+    "(BUL ECS)",
+    "(BUL SCS)",
+    "SPA",
+    "(SPA NCS)",
+    "(SPA SCS)",
+    "STP",
+    "(STP NCS)",
+    "(STP SCS)",
+)
+
+
+def test_location_without_coast_sorts_before_its_coasts():
+    locations = [Location("STP", "SCS"), Location("SPA"), Location("STP")]
+    assert sorted(locations) == [
+        Location("SPA"), Location("STP"), Location("STP", "SCS")
+    ]
+
+
+def test_dmz_of_coastal_provinces():
+    dmz = DMZ(["FRA", "ENG"], [Location("STP"), Location("SPA"), Location("BUL")])
+    assert tuple(map(str, dmz.exhaustive_provinces)) == EXHAUSTIVE
+
+
+@pytest.mark.parametrize("parser", utils.PARSERS)
+def test_parsed_dmz_of_coastal_provinces(parser):
+    dmz = utils.parse_daide("PRP (DMZ (FRA ENG) (STP SPA BUL))", parser).arrangement
+    assert tuple(map(str, dmz.exhaustive_provinces)) == EXHAUSTIVE
@@ -0,0 +1,105 @@
+"""Differential test of the native parser against the grammar and visitor."""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+from parsimonious.exceptions import ParseError
+
+from daide2eng.parser import DAIDEParser
+from daide2eng.utils import parse_daide, pre_process
+
+ROOT = Path(__file__).resolve().parent.parent
+# mutated variants per corpus message
+MUTATIONS = 8
+
+
+def _load_corpus():
+    with open(ROOT / "translation.json") as file:
+        translations = [record["daide"] for record in json.load(file)]
+    with open(ROOT / "daide2eng_moves_error.json") as file:
+        errors = json.load(file)
+    return [pre_process(message) for message in translations + errors]
+
+
+def _tokens(message):
+    return message.replace("(", " ( ").replace(")", " ) ").split()
+
+
+CORPUS = _load_corpus()
+# tokens to insert and substitute, taken from the corpus itself
+VOCABULARY = sorted({token for message in CORPUS for token in _tokens(message)})
+
+
+def _mutate(message, rng):
+    """Delete, duplicate, swap or replace one token of `message`.
+
+    Half of the replacements are tokens of the same message, which keeps
+    more of the mutants valid DAIDE.
+    """
+    tokens = _tokens(message)
+    index = rng.randrange(len(tokens))
+    operation = rng.choice(("delete", "duplicate", "swap", "replace", "reuse"))
+    if operation == "delete":
+        del tokens[index]
+    elif operation == "duplicate":
+        tokens.insert(index, tokens[index])
+    elif operation == "swap" and index + 1 < len(tokens):
+        tokens[index], tokens[index + 1] = tokens[index + 1], tokens[index]
+    elif operation == "reuse":
+        tokens[index] = rng.choice(tokens)
+    else:
+        tokens[index] = rng.choice(VOCABULARY)
+    return " ".join(tokens).replace("( ", "(").replace(" )", ")")
+
+
+def _mutations():
+    rng = random.Random(0)
+    return [
+        _mutate(message, rng)
+        for message in CORPUS
+        if message.strip()
+        for _ in range(MUTATIONS)
+    ]
+
+
+def _outcome(message, parser):
+    try:
+        tree = parse_daide(message, parser=parser)
+    except ParseError:
+        # the engines word syntax errors differently
+        return "ParseError"
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    return repr(tree), str(tree)
+
+
+def _chunks(name, messages, size=200):
+    return [
+        pytest.param(messages[start : start + size], id=f"{name}-{start}")
+        for start in range(0, len(messages), size)
+    ]
+
+
+@pytest.mark.parametrize(
+    "messages", _chunks("corpus", CORPUS) + _chunks("mutations", _mutations())
+)
+def test_native_matches_parsimonious(messages):
+    mismatches = [
+        message
+        for message in messages
+        if _outcome(message, "native") != _outcome(message, "parsimonious")
+    ]
+    assert not mismatches
+
+
+def test_constructor_errors_surface_without_grammar_fallback():
+    # the peace is rejected before the trailing '(DRW)' is reached
+    message = "PRP (PCE (ENG ENG)) (DRW)"
+    with pytest.raises(ValueError, match="at least 2 powers"):
+        DAIDEParser().parse(message)
+    with pytest.raises(ParseError):
+        DAIDEParser(grammar_errors=True).parse(message)
+    with pytest.raises(ValueError, match="at least 2 powers"):
+        DAIDEParser(grammar_errors=True).parse("PRP (PCE (ENG ENG))")
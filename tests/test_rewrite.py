@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from daide2eng.rewrite import RewriteRule, compile_rewrite_rules
+from daide2eng.utils import pre_process
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def chained_pre_process(daide):
+    """pre_process as it was before the rules were compiled into one regex."""
+    return (
+        daide.replace("BOT", "GOB")
+        .replace("FLT ENG", "FLT ECH")
+        .replace("AMY ENG", "AMY ECH")
+        .replace("CTO LON", "CTO ECH")
+        .replace("/SC", " SCS")
+        .replace("/NC", " NCS")
+        .replace("/EC", " ECS")
+        .replace("/WC", " WCS")
+    )
+
+
+def _load_corpus():
+    with open(ROOT / "translation.json") as file:
+        translations = [record["daide"] for record in json.load(file)]
+    with open(ROOT / "daide2eng_moves_error.json") as file:
+        errors = json.load(file)
+    return translations + errors
+
+
+def test_pre_process_matches_chained_replace():
+    corpus = _load_corpus()
+    assert [pre_process(message) for message in corpus] == [
+        chained_pre_process(message) for message in corpus
+    ]
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("(ENG FLT ENG) MTO BOT", "(ENG FLT ECH) MTO GOB"),
+        ("(ENG AMY ENG) CTO LON VIA (NTH)", "(ENG AMY ECH) CTO ECH VIA (NTH)"),
+        ("(RUS FLT STP/SC) MTO (BUL/EC)", "(RUS FLT STP SCS) MTO (BUL ECS)"),
+        ("(ENG FLT  ENG)", "(ENG FLT  ECH)"),
+    ],
+)
+def test_pre_process(message, expected):
+    assert pre_process(message) == expected
+
+
+def test_only_whole_tokens_are_rewritten():
+    rewrite = compile_rewrite_rules([RewriteRule("BOT", "GOB")])
+    assert rewrite("BOTX XBOT (BOT)") == "BOTX XBOT (GOB)"
+
+
+def test_suffix_needs_a_token_to_end():
+    rewrite = compile_rewrite_rules(
+        [RewriteRule("/SC", " SCS", suffix=True), RewriteRule("SC", "X")]
+    )
+    assert rewrite("STP/SC SC /SC") == "STP SCS X /SC"
+
+
+def test_context_rule_takes_precedence():
+    rules = [RewriteRule("ENG", "X"), RewriteRule("ENG", "Y", after="FLT")]
+    assert compile_rewrite_rules(rules)("(ENG FLT ENG) MTO ENG") == "(X FLT Y) MTO X"
+
+
+def test_first_of_overlapping_rules_wins():
+    rewrite = compile_rewrite_rules([RewriteRule("ENG", "X"), RewriteRule("ENG", "Z")])
+    assert rewrite("ENG") == "X"
+    rewrite = compile_rewrite_rules(
+        [
+            RewriteRule("ENG", "Y", after="FLT"),
+            RewriteRule("ENG", "Z", after="FLT"),
+        ]
+    )
+    assert rewrite("FLT ENG") == "FLT Y"
+
+
+def test_replacements_are_not_rewritten_again():
+    rules = [RewriteRule("BOT", "GOB"), RewriteRule("GOB", "X")]
+    assert compile_rewrite_rules(rules)("BOT GOB") == "GOB X"
+
+
+def test_context_token_is_kept():
+    # the token a context rule matches after is part of its match, so other
+    # rules do not rewrite it there
+    rules = [RewriteRule("FLT", "F"), RewriteRule("ENG", "ECH", after="FLT")]
+    assert compile_rewrite_rules(rules)("FLT ENG FLT") == "FLT ECH F"
+
+
+def test_no_rules():
+    assert compile_rewrite_rules([])("FLT ENG") == "FLT ENG"
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+import pytest
+
+from daide2eng import service
+from daide2eng.service import TranslationQueueFull, TranslationService
+
+PEACE = "PRP (PCE (ENG TUR))"
+DRAW = "PRP (DRW)"
+
+
+class GatedTranslator:
+    """Stands in for gen_English; each message blocks until it is released."""
+
+    def __init__(self):
+        self.started = defaultdict(threading.Event)
+        self.released = defaultdict(threading.Event)
+
+    def __call__(self, daide, *args):
+        self.started[daide].set()
+        self.released[daide].wait()
+        return daide
+
+    async def wait_started(self, daide):
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.started[daide].wait
+        )
+
+    def release_all(self):
+        for event in list(self.released.values()):
+            event.set()
+
+
+class FakeClock:
+    """Replaces the event loop's clock, so timeouts expire only when advanced."""
+
+    def __init__(self, loop):
+        self.now = 0.0
+        loop.time = lambda: self.now
+
+    async def advance(self, seconds):
+        # let new tasks start before time moves on
+        await self.settle()
+        self.now += seconds
+        await self.settle()
+
+    async def settle(self):
+        # run ready callbacks, including expired timeouts and the
+        # cancellations they cause
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    gated = GatedTranslator()
+    monkeypatch.setattr(service, "gen_English", gated)
+    yield gated
+    gated.release_all()
+
+
+def run(translator, test):
+    async def main():
+        clock = FakeClock(asyncio.get_running_loop())
+        translations = TranslationService(max_workers=2, max_pending=1)
+        try:
+            await test(translations, clock)
+        finally:
+            translator.release_all()
+            await translations.close()
+
+    asyncio.run(main())
+
+
+def test_timeout_covers_queueing_and_translation(translator):
+    async def test(translations, clock):
+        first = asyncio.ensure_future(translations.translate(PEACE))
+        await translator.wait_started(PEACE)
+        second = asyncio.ensure_future(translations.translate(DRAW, timeout=10))
+        # waits for the only slot
+        await clock.advance(6)
+        assert not second.done()
+
+        translator.released[PEACE].set()
+        assert await first == PEACE
+        await translator.wait_started(DRAW)
+        await clock.advance(3)
+        assert not second.done()
+        # the deadline was set when the request was made, not when it got a slot
+        await clock.advance(1.5)
+        assert second.done()
+        with pytest.raises(asyncio.TimeoutError):
+            await second
+
+    run(translator, test)
+
+
+def test_timeout_does_not_cancel_shared_translation(translator):
+    async def test(translations, clock):
+        patient = asyncio.ensure_future(translations.translate(DRAW))
+        await translator.wait_started(DRAW)
+        impatient = asyncio.ensure_future(translations.translate(DRAW, timeout=1))
+        await clock.advance(2)
+        with pytest.raises(asyncio.TimeoutError):
+            await impatient
+        assert translations.pending == 1
+
+        translator.released[DRAW].set()
+        assert await patient == DRAW
+        assert translations.pending == 0
+
+    run(translator, test)
+
+
+def test_cancelling_a_waiter_keeps_the_translation(translator):
+    async def test(translations, clock):
+        first = asyncio.ensure_future(translations.translate(DRAW))
+        second = asyncio.ensure_future(translations.translate(DRAW))
+        await translator.wait_started(DRAW)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        translator.released[DRAW].set()
+        assert await second == DRAW
+
+    run(translator, test)
+
+
+def test_full_queue_without_blocking(translator):
+    async def test(translations, clock):
+        first = asyncio.ensure_future(translations.translate(PEACE))
+        await translator.wait_started(PEACE)
+        with pytest.raises(TranslationQueueFull):
+            await translations.translate(DRAW, block=False)
+
+        translator.released[PEACE].set()
+        await first
+        translator.released[DRAW].set()
+        assert await translations.translate(DRAW, block=False) == DRAW
+
+    run(translator, test)
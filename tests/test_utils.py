@@ -0,0 +1,75 @@
+import pytest
+
+from daide2eng import utils
+from daide2eng.validator import DAIDENestingError
+
+NESTED = "PRP (AND (PCE (ENG TUR)) (DRW))"
+
+
+@pytest.fixture
+def caches():
+    utils.enable_parse_cache()
+    utils.enable_render_cache()
+    yield
+    utils.disable_parse_cache()
+    utils.disable_render_cache()
+    utils.set_max_depth()
+
+
+def test_set_max_depth_clears_parse_cache(caches):
+    utils.parse_daide(NESTED)
+    utils.set_max_depth(2)
+    assert utils.parse_cache_info().currsize == 0
+    with pytest.raises(DAIDENestingError):
+        utils.parse_daide(NESTED)
+
+
+def test_set_max_depth_clears_render_cache(caches):
+    utils.render_daide(NESTED)
+    utils.set_max_depth(2)
+    assert utils.render_cache_info().currsize == 0
+    with pytest.raises(DAIDENestingError):
+        utils.render_daide(NESTED)
+
+
+def test_max_depth_argument_overrides_limit(caches):
+    utils.set_max_depth(2)
+    assert utils.gen_English(NESTED).startswith("ERROR")
+    assert not utils.gen_English(NESTED, max_depth=3).startswith("ERROR")
+    # a cached tree still has to pass a lower limit
+    with pytest.raises(DAIDENestingError):
+        utils.parse_daide(NESTED, max_depth=2)
+    assert utils.daide_validator.max_depth == 2
+
+
+def test_timing_hook_reports_cache_hits(caches):
+    timings = []
+    utils.set_timing_hook(timings.append)
+    try:
+        for _ in range(2):
+            utils.gen_English(NESTED, "ENG", "TUR")
+        utils.clear_render_cache()
+        utils.gen_English(NESTED, "ENG", "TUR")
+    finally:
+        utils.set_timing_hook(None)
+    assert [timing.cache for timing in timings] == [None, "render", "parse"]
+    assert set(timings[0].stages) == {
+        "pre_process", "validate", "parse", "visit", "render", "post_process"
+    }
+    assert set(timings[1].stages) == {"pre_process", "post_process"}
+    assert set(timings[2].stages) == {"pre_process", "render", "post_process"}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_batch_survives_malformed_records(processes):
+    records = [
+        "PRP (PCE (ENG TUR))",
+        None,
+        ("PRP (DRW)", "ENG"),
+        ("PRP (DRW)", "ENG", "TUR"),
+    ]
+    results = utils.gen_English_batch(records, processes=processes, chunksize=1)
+    assert results[0] == "I propose peace between ENG and TUR."
+    assert results[1].startswith("ERROR TypeError")
+    assert results[2].startswith("ERROR ValueError")
+    assert results[3] == "I propose draw."
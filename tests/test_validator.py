@@ -0,0 +1,110 @@
+import pytest
+
+from daide2eng import utils
+from daide2eng.validator import (
+    MAX_DEPTH,
+    DAIDELexicalError,
+    DAIDENestingError,
+    DAIDEValidator,
+    daide_validator,
+)
+
+
+def nested(depth):
+    """A valid message whose parentheses nest `depth` levels deep."""
+    return "PRP (" + "NOT (" * (depth - 1) + "DRW" + ")" * depth
+
+
+@pytest.fixture
+def max_depth():
+    yield
+    utils.set_max_depth()
+
+
+def test_nested_has_requested_depth():
+    message = nested(4)
+    assert message == "PRP (NOT (NOT (NOT (DRW))))"
+    DAIDEValidator().check_depth(message, max_depth=4)
+    with pytest.raises(DAIDENestingError):
+        DAIDEValidator().check_depth(message, max_depth=3)
+
+
+def test_unknown_token():
+    message = "PRP (fear-01 :ARG0 GER)"
+    with pytest.raises(DAIDELexicalError) as info:
+        DAIDEValidator().validate(message)
+    assert not isinstance(info.value, DAIDENestingError)
+    assert info.value.token == "fear-01"
+    assert info.value.pos == message.index("fear-01")
+
+
+def test_numbers_are_words():
+    validator = DAIDEValidator()
+    validator.validate("PRP (DMZ (ENG0.5 FRA) (BEL))")
+    validator.validate("PRP (CHO (1 2) (PCE (ENG TUR)))")
+
+
+@pytest.mark.parametrize(
+    "message, pos, reason",
+    [
+        ("PRP (PCE (ENG TUR)", 4, "Unclosed parenthesis"),
+        ("PRP (PCE (ENG TUR)))", 19, "Unbalanced parenthesis"),
+        ("PRP (DRW)) )", 9, "Unbalanced parenthesis"),
+        ("( )", 0, "Empty message"),
+    ],
+)
+def test_unbalanced_parentheses(message, pos, reason):
+    with pytest.raises(DAIDELexicalError) as info:
+        DAIDEValidator().validate(message)
+    assert info.value.pos == pos
+    assert info.value.reason == reason
+
+
+def test_default_limit_accepts_max_depth():
+    assert MAX_DEPTH == 64
+    validator = DAIDEValidator()
+    validator.validate(nested(64))
+    with pytest.raises(DAIDENestingError) as info:
+        validator.validate(nested(65))
+    assert info.value.max_depth == 64
+    # the 65th opening parenthesis
+    assert info.value.pos == nested(65).rindex("(")
+
+
+def test_max_depth_argument_overrides_own_limit():
+    validator = DAIDEValidator(max_depth=3)
+    with pytest.raises(DAIDENestingError):
+        validator.check_depth(nested(4))
+    validator.check_depth(nested(4), max_depth=4)
+    validator.check_depth(nested(100), max_depth=None)
+    with pytest.raises(DAIDENestingError):
+        validator.check_depth(nested(3), max_depth=2)
+
+
+def test_own_limit_follows_attribute():
+    validator = DAIDEValidator(max_depth=None)
+    validator.validate(nested(100))
+    validator.max_depth = 10
+    with pytest.raises(DAIDENestingError):
+        validator.validate(nested(11))
+
+
+def test_set_max_depth_updates_shared_validator(max_depth):
+    utils.set_max_depth(65)
+    assert daide_validator.max_depth == 65
+    utils.parse_daide(nested(65))
+    utils.set_max_depth(None)
+    utils.parse_daide(nested(100))
+    utils.set_max_depth()
+    assert daide_validator.max_depth == MAX_DEPTH
+    with pytest.raises(DAIDENestingError):
+        utils.parse_daide(nested(65))
+    # max_depth= overrides the shared limit for one call only
+    utils.parse_daide(nested(65), max_depth=65)
+    assert daide_validator.max_depth == MAX_DEPTH
+
+
+def test_set_max_depth_rejects_non_positive(max_depth):
+    with pytest.raises(ValueError):
+        utils.set_max_depth(0)
+    assert daide_validator.max_depth == MAX_DEPTH
@@ -0,0 +1,104 @@
+import json
+from pathlib import Path
+
+import pytest
+from parsimonious.exceptions import VisitationError
+from parsimonious.nodes import NodeVisitor
+
+from daide2eng import get_daide_grammar
+from daide2eng.keywords.base_keywords import MoveByCVY
+from daide2eng.utils import GRAMMAR_LEVEL, pre_process
+from daide2eng.validator import MAX_DEPTH, DAIDENestingError, DAIDEValidator
+from daide2eng.visitor import DAIDEVisitor, daide_visitor
+
+ROOT = Path(__file__).resolve().parent.parent
+MESSAGE = "PRP (XDO ((ENG AMY LON) CTO BEL VIA (NTH)))"
+
+
+def grammar():
+    return get_daide_grammar(level=GRAMMAR_LEVEL)
+
+
+class RecursiveVisitor(DAIDEVisitor):
+    """The visitor as parsimonious runs it: recursive, visiting every node."""
+
+    visit = NodeVisitor.visit
+
+
+class SealessConvoyVisitor(DAIDEVisitor):
+    def visit_move_by_cvy(self, node, visited_children):
+        move = super().visit_move_by_cvy(node, visited_children)
+        return MoveByCVY(move.unit, move.province)
+
+
+class BrokenConvoyVisitor(DAIDEVisitor):
+    def visit_move_by_cvy(self, node, visited_children):
+        raise TypeError("broken")
+
+
+@pytest.mark.parametrize("visitor_class", [DAIDEVisitor, RecursiveVisitor])
+def test_keyword_errors_are_not_wrapped(visitor_class):
+    with pytest.raises(ValueError, match="at least 2 powers") as info:
+        visitor_class().visit(grammar().parse("PRP (PCE (ENG ENG))"))
+    assert not isinstance(info.value, VisitationError)
+
+
+def test_invalid_construction_raises_value_error():
+    tree = grammar().parse(MESSAGE)
+    with pytest.raises(ValueError, match="at least one sea province") as info:
+        SealessConvoyVisitor().visit(tree)
+    assert type(info.value) is ValueError
+
+
+def test_other_errors_are_wrapped():
+    tree = grammar().parse(MESSAGE)
+    with pytest.raises(VisitationError) as info:
+        BrokenConvoyVisitor().visit(tree)
+    assert info.value.original_class is TypeError
+    # reported at the node that failed, like NodeVisitor.visit does
+    assert "ENG AMY LON" in str(info.value)
+
+
+def test_dispatch_table_covers_visit_methods():
+    names = {name for name in dir(daide_visitor) if name.startswith("visit_")}
+    assert set(daide_visitor._dispatch) == {name[len("visit_") :] for name in names}
+    assert daide_visitor.text_rules <= set(daide_visitor._dispatch)
+
+
+def nested(depth):
+    """A valid message whose parentheses nest `depth` levels deep."""
+    innermost = "AND (DRW) (XDO ((ENG FLT NTH) HLD))"
+    return "PRP (" + "NOT (" * (depth - 4) + innermost + ")" * (depth - 3)
+
+
+def test_nested_has_requested_depth():
+    DAIDEValidator().check_depth(nested(MAX_DEPTH), max_depth=MAX_DEPTH)
+    with pytest.raises(DAIDENestingError):
+        DAIDEValidator().check_depth(nested(MAX_DEPTH), max_depth=MAX_DEPTH - 1)
+
+
+def _corpus():
+    with open(ROOT / "translation.json") as file:
+        return [pre_process(record["daide"]) for record in json.load(file)]
+
+
+@pytest.mark.parametrize("message", [MESSAGE, nested(10), nested(MAX_DEPTH)])
+def test_matches_recursive_visitor_on_nested_messages(message):
+    tree = grammar().parse(message)
+    expected = RecursiveVisitor().visit(tree)
+    actual = daide_visitor.visit(tree)
+    assert repr(actual) == repr(expected)
+    assert str(actual) == str(expected)
+
+
+def test_matches_recursive_visitor_on_corpus():
+    recursive = RecursiveVisitor()
+    mismatches = []
+    for message in _corpus():
+        try:
+            tree = grammar().parse(message)
+        except Exception:
+            continue
+        if repr(daide_visitor.visit(tree)) != repr(recursive.visit(tree)):
+            mismatches.append(message)
+    assert not mismatches